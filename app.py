@@ -1,9 +1,30 @@
 import streamlit as st
-import zipfile
+import pandas as pd
 import io
+import time
+import zipfile
 from datetime import datetime
-import os
 import json
+from functools import partial
+
+from webexcel import config, engine, metrics
+from webexcel.batch import Batch, SeparateOutputs, run_batch
+from webexcel.board import BoardStore
+from webexcel.cache import IndexCache, ResultCache, content_hash
+from webexcel.dedup import Deduplicator
+from webexcel.extract import archive_kind
+from webexcel.filters import EntryFilter, date_range, parse_list
+from webexcel.index import ArchiveIndex
+from webexcel.jobs import CANCELLED, FAILED, QUEUED, Job, estimate_memory, get_runner
+from webexcel.limits import LimitExceeded
+from webexcel.listing import batch_plan_listing, plan_listing
+from webexcel.manifest import Incremental, Manifest
+from webexcel.parts import PART_SIZE_OPTIONS, Part, PartedOutput, part_size_from_label
+from webexcel.policy import POLICY_OPTIONS, policy_from_label
+from webexcel.sources import ServerSource, display_name, list_sources
+from webexcel.rename import ALL_FILES, DEFAULT_TEMPLATE, NAMING_OPTIONS, SORT_OPTIONS, plan_rename, plan_rename_batch
+from webexcel.template import TEMPLATE_FIELDS
+from webexcel.zipio import open_output, open_reader
 
 st.set_page_config(page_title="컴퓨터 정리의 기본", layout="wide", page_icon="📁")
 
@@ -152,30 +173,595 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# 의견게시판·방문자 수 저장소 (서버 전체에서 연결 하나를 공유)
+@st.cache_resource
+def get_board():
+    """의견게시판 저장소 생성"""
+    return BoardStore(config.BOARD_DB_PATH)
+
 # 방문자 카운팅 기능
-def init_visitor_count():
-    """방문자 수 초기화"""
-    if 'visitor_date' not in st.session_state:
-        st.session_state['visitor_date'] = datetime.now().date()
-        st.session_state['visitor_count'] = 1
+def count_visit():
+    """이 세션의 방문을 한 번만 기록 (버튼을 누를 때마다 다시 세지 않음)"""
+    if 'visit_counted' not in st.session_state:
+        get_board().record_visit()
+        st.session_state['visit_counted'] = True
+
+# 페이지 로드 시 방문자 카운팅
+count_visit()
+
+# 의견게시판 한 페이지에 보여줄 의견 수
+POSTS_PAGE_SIZE = 10
+
+# 압축 방식 선택 도움말
+COMPRESSION_HELP = "빠르게: 사진·영상·문서처럼 이미 압축된 파일은 그대로 저장\n\n최소 용량: 시간이 더 걸리지만 가장 작게 압축"
+
+# 결과 나누기 선택 도움말
+PART_SIZE_HELP = "결과가 크면 정한 크기마다 따로 압축을 풀 수 있는 ZIP 조각으로 나눕니다.\n\n완성된 조각은 작업이 끝나기 전에도 바로 받을 수 있습니다"
+
+# 파일명 템플릿 입력란 도움말
+TEMPLATE_HELP = "\n\n".join(f"{{{field}}}: {text}" for field, text in TEMPLATE_FIELDS.items())
+
+# 파일명 미리보기에 보여줄 개수 (앞부분만 계산하므로 파일이 많아도 바로 갱신)
+RENAME_PREVIEW_COUNT = 20
+
+# ZIP 색인 캐시 (서버 전체에서 공유)
+@st.cache_resource
+def get_index_cache():
+    """업로드 색인 캐시 생성"""
+    return IndexCache(config.INDEX_CACHE_MAX_SIZE)
+
+# 결과 ZIP 캐시 (서버 전체에서 공유, 크기를 0으로 설정하면 사용하지 않음)
+@st.cache_resource
+def get_result_cache():
+    """결과 캐시 생성"""
+    if config.RESULT_CACHE_MAX_SIZE <= 0:
+        return None
+    return ResultCache(config.RESULT_CACHE_DIR, config.RESULT_CACHE_MAX_SIZE)
+
+# 입력 방식
+UPLOAD_SOURCE = "📁 파일 업로드"
+BATCH_SOURCE = "📚 여러 ZIP 한 번에"
+SERVER_SOURCE = "🗄️ 서버 폴더"
+
+def choose_source(tab_key):
+    """입력 선택: 업로드한 ZIP, 여러 ZIP(두 개 이상이면 목록), 또는 (설정된 경우) 서버 폴더의 ZIP 파일·폴더"""
+    modes = [UPLOAD_SOURCE, BATCH_SOURCE]
+    if config.SOURCE_ROOTS:
+        modes.append(SERVER_SOURCE)
+    mode = st.radio("입력 방식", modes, horizontal=True, key=f"source_mode_{tab_key}")
+    
+    if mode == UPLOAD_SOURCE:
+        return st.file_uploader("📁 ZIP 파일 업로드", type="zip", key=f"uploader_{tab_key}")
+    if mode == BATCH_SOURCE:
+        uploads = st.file_uploader(
+            "📚 ZIP 파일 여러 개 업로드", type="zip", accept_multiple_files=True, key=f"uploader_many_{tab_key}"
+        )
+        if not uploads:
+            return None
+        return uploads if len(uploads) > 1 else uploads[0]
+    
+    path = st.selectbox(
+        "🗄️ 서버의 ZIP 파일 또는 폴더", list_sources(), index=None,
+        format_func=display_name, key=f"server_path_{tab_key}"
+    )
+    if path is None:
+        return None
+    try:
+        source = ServerSource(path)
+    except OSError as e:
+        st.error(f"❌ 서버 경로를 열 수 없습니다: {str(e)}")
+        return None
+    state_key = f"pack_{tab_key}"
+    if source.ready():
+        forget_job(state_key)
+        return source
+    
+    # 폴더는 작업 스레드에서 임시 ZIP으로 묶음 (내용이 그대로면 다른 세션도 묶어 둔 것을 사용)
+    job = current_job(state_key)
+    if job is not None and job.finished:
+        if show_job_failure(state_key, job):
+            return None
+        # 묶는 동안 폴더 내용이 바뀌었으면 다시 묶음
+        forget_job(state_key)
+        job = None
+    if job is None:
+        job = Job('pack', len(source.files), sum(size for _, _, size, _ in source.files))
+        get_runner().submit(job, source.pack)
+        st.session_state[state_key] = job.id
+    st.caption(f"📦 {source.name} 폴더를 묶는 중입니다")
+    show_job_progress(state_key, source.name)
+    return None
+
+# 여러 입력의 결과
+MERGE_OUTPUT = "하나로 합치기"
+SEPARATE_OUTPUT = "입력마다 따로"
+
+def choose_batch_output(tab_key, source):
+    """여러 입력의 결과를 하나로 합칠지 (입력이 하나면 None)"""
+    if not isinstance(source, list):
+        return None
+    choice = st.radio(
+        f"📚 {len(source)}개 입력의 결과", [MERGE_OUTPUT, SEPARATE_OUTPUT], horizontal=True,
+        key=f"batch_output_{tab_key}",
+        help="합치면 모든 입력의 파일을 겹치지 않는 이름으로 결과 ZIP 하나에 담고, 따로 만들면 입력마다 결과 ZIP을 만듭니다"
+    )
+    return choice == MERGE_OUTPUT
+
+def input_key(uploaded_file):
+    """입력을 구분하는 값 (업로드는 내용 해시, 한 번 계산하면 세션에 기억)"""
+    if isinstance(uploaded_file, list):
+        return "batch:" + ",".join(input_key(upload) for upload in uploaded_file)
+    if isinstance(uploaded_file, ServerSource):
+        # 서버 파일은 내용을 모두 읽어 해시하지 않고 경로·수정 시각으로 구분
+        return uploaded_file.cache_key()
+    upload_hashes = st.session_state.setdefault('upload_hashes', {})
+    if uploaded_file.file_id not in upload_hashes:
+        upload_hashes[uploaded_file.file_id] = content_hash(uploaded_file)
+    return upload_hashes[uploaded_file.file_id]
+
+def load_index(uploaded_file):
+    """업로드 파일의 중앙 디렉터리 색인 (입력이 같으면 재사용)"""
+    if isinstance(uploaded_file, ServerSource):
+        build = lambda: ArchiveIndex.from_zip(zipfile.ZipFile(uploaded_file.open()))
+    else:
+        build = lambda: ArchiveIndex.from_zip(zipfile.ZipFile(uploaded_file))
+    return get_index_cache().get_or_build(input_key(uploaded_file), build)
+
+def load_batch(uploads):
+    """여러 입력 중 열 수 있는 ZIP 목록과 그 색인 목록 (열 수 없는 ZIP은 경고하고 제외)"""
+    readable, indexes = [], []
+    for upload in uploads:
+        try:
+            indexes.append(load_index(upload))
+        except zipfile.BadZipFile:
+            st.warning(f"⚠️ {upload.name}: ZIP 파일을 열 수 없어 제외합니다")
+            continue
+        readable.append(upload)
+    return readable, indexes
+
+# ==================== 백그라운드 작업 ====================
+def job_input(uploaded_file):
+    """작업 스레드가 따로 읽을 수 있도록 같은 내용을 가리키는 새 파일 객체 (여러 입력이면 목록)"""
+    if isinstance(uploaded_file, list):
+        return [job_input(upload) for upload in uploaded_file]
+    if isinstance(uploaded_file, ServerSource):
+        return uploaded_file.open()
+    return io.BytesIO(uploaded_file.getvalue())
+
+def run_and_cache(kind, fn, input_file, output_file, cache=None, cache_key=None, progress=None, stats=None, **kwargs):
+    """작업을 실행하고 결과 요약 반환 (결과 캐시가 있으면 결과 ZIP도 보관)"""
+    result = fn(input_file, output_file, progress=progress, stats=stats, **kwargs)
+    if isinstance(result, Batch):
+        summary = result.summary()
     else:
-        today = datetime.now().date()
-        if st.session_state['visitor_date'] != today:
-            st.session_state['visitor_date'] = today
-            st.session_state['visitor_count'] = 1
+        summary = engine.summarize(kind, result, kwargs.get('dedup'), kwargs.get('incremental'))
+    if isinstance(output_file, (PartedOutput, SeparateOutputs)):
+        summary['parts'] = [part.as_dict() for part in output_file.parts]
+    # 일부 입력이 실패한 결과는 다음번에 다시 처리하도록 보관하지 않음
+    if cache is not None and (not isinstance(result, Batch) or result.complete()):
+        try:
+            with stats.stage('cache'):
+                cache.put(cache_key, output_file, summary)
+        except OSError:
+            # 보관하지 못해도 이번 결과는 그대로 다운로드할 수 있음
+            pass
+    return summary
+
+def start_job(state_key, kind, fn, uploaded_file, options, sizes=(), total_entries=0, info=None, part_size=None,
+              separate=False, **kwargs):
+    """작업을 대기열에 넣고 작업 번호를 세션에 기록
+
+    같은 입력·작업·옵션(options)의 결과가 결과 캐시에 있으면 다시 만들지 않고 바로 보여줍니다.
+    sizes(원본 파일 크기 목록)로 진행률 기준과 필요한 메모리를 정합니다.
+    part_size가 있으면 결과를 그 크기마다 조각으로 나누고, 완성된 조각 목록을 info['parts']에 둡니다.
+    uploaded_file이 여러 입력의 목록이면 fn은 batch.run_batch이며, separate가 True면
+    입력마다 따로 만든 결과를 조각처럼 info['parts']에 둡니다.
+    서버에서 프로파일을 허용했으면(config.PROFILE_ENABLED) 주소 뒤에 ?profile=1 을 붙여
+    운영자 확인용으로 작업을 cProfile로 측정합니다.
+    """
+    forget_job(state_key)
+    info = dict(info or {})
+    cache = get_result_cache()
+    cache_key = ResultCache.make_key(input_key(uploaded_file), kind, options)
+    hit = cache.get(cache_key) if cache is not None else None
+    
+    if hit is not None:
+        zip_paths, summary = hit
+        # 캐시에서 지워져도 받을 수 있도록 미리 열어 둠 (작업을 정리할 때 Job.close()가 닫음)
+        if 'parts' in summary:
+            info['parts'] = [
+                Part(number, path, part['size'], part['entries'], file=open(path, 'rb'), name=part.get('name'))
+                for number, (path, part) in enumerate(zip(zip_paths, summary['parts']), 1)
+            ]
         else:
-            st.session_state['visitor_count'] += 1
+            info['output_file'] = open(zip_paths[0], 'rb')
+        info['cached'] = True
+        job = get_runner().add_done(Job(kind, total_entries, sum(sizes), info), summary)
+    else:
+        if separate:
+            output_file = SeparateOutputs()
+            # 작업 스레드가 입력 하나를 끝낼 때마다 늘어나는 목록
+            info['parts'] = output_file.parts
+        elif part_size:
+            output_file = PartedOutput(part_size)
+            # 작업 스레드가 조각을 봉인할 때마다 늘어나는 목록
+            info['parts'] = output_file.parts
+        else:
+            output_file = open_output()
+        info['output_file'] = output_file
+        parallel = 1
+        if isinstance(uploaded_file, list):
+            # 합칠 때는 모든 입력의 중간 결과가 끝까지 남아 있음
+            parallel = min(len(uploaded_file), config.BATCH_WORKERS) if separate else len(uploaded_file)
+        job = Job(
+            kind, total_entries, sum(sizes), info,
+            memory=estimate_memory(kind, sizes, parallel),
+            profile=config.PROFILE_ENABLED and st.query_params.get('profile') == '1'
+        )
+        get_runner().submit(
+            job, run_and_cache, kind, fn, job_input(uploaded_file), output_file,
+            cache=cache, cache_key=cache_key, **kwargs
+        )
+    st.session_state[state_key] = job.id
+    return job
 
-# 페이지 로드 시 방문자 카운팅
-init_visitor_count()
+def start_batch_job(state_key, kind, uploads, merge, options, part_size=None, **kwargs):
+    """여러 입력을 한 번에 처리하는 작업 시작 (merge가 False면 입력마다 결과를 따로 만듦)
+
+    kwargs는 start_job과 batch.run_batch에 넘기는 인자입니다 (입력마다 다른 값은 input_options).
+    """
+    part_size = part_size if merge else None
+    return start_job(
+        state_key, kind, run_batch, uploads, dict(options, batch=merge, part_size=part_size),
+        part_size=part_size,
+        separate=not merge,
+        operation=kind,
+        names=[upload.name for upload in uploads],
+        merge=merge,
+        **kwargs
+    )
+
+def current_job(state_key):
+    """이 세션에서 시작한 작업 (없거나 만료되었으면 None)"""
+    job_id = st.session_state.get(state_key)
+    return get_runner().get(job_id) if job_id else None
+
+def forget_job(state_key):
+    """작업 결과 정리 (다운로드했거나 처음으로 돌아갈 때)"""
+    job_id = st.session_state.pop(state_key, None)
+    if job_id:
+        get_runner().forget(job_id)
+
+def job_running(job):
+    return job is not None and not job.finished
+
+def format_mb(size):
+    return f"{size / (1024 * 1024):,.1f}MB"
+
+def progress_text(job):
+    """진행 상황 문구 (처리한 파일 수, 읽은 양/기록한 양, 남은 시간)"""
+    text = f"{job.entries_done:,}"
+    if job.total_entries:
+        text += f" / {job.total_entries:,}"
+    text += f"개 처리 · 원본 {format_mb(job.bytes_in)} → 압축 {format_mb(job.bytes_out)}"
+    eta = job.eta()
+    if eta is not None:
+        text += f" · 남은 시간 약 {int(eta) // 60}분 {int(eta) % 60}초"
+    return text
+
+@st.fragment(run_every=1)
+def show_job_progress(state_key, file_name):
+    """실행 중인 작업의 진행률과 취소 버튼, 완성된 결과 조각 (1초마다 갱신)"""
+    job = current_job(state_key)
+    if not job_running(job):
+        # 작업이 끝나면 결과를 보여주도록 전체 화면 다시 그리기
+        st.rerun()
+    
+    if job.status == QUEUED:
+        # 서버가 바쁘면 먼저 온 작업이 끝날 때까지 대기
+        st.info(f"⏳ 다른 작업이 끝나기를 기다리는 중... (대기 순서 {get_runner().position(job)}번째)")
+    st.progress(job.fraction(), text=progress_text(job))
+    
+    if job.cancelling:
+        st.caption("작업을 취소하는 중...")
+    elif st.button("⏹️ 작업 취소", key=f"{state_key}_cancel", use_container_width=True):
+        get_runner().cancel(job)
+    
+    if job.info.get('parts'):
+        st.caption("📦 완성된 조각은 지금 바로 받을 수 있습니다")
+        show_parts(state_key, job, file_name)
+
+def show_job_failure(state_key, job):
+    """실패·취소된 작업 안내 (한 번 보여준 뒤 정리). 성공한 작업이면 False"""
+    if job.status == CANCELLED:
+        st.info("⏹️ 작업을 취소했습니다")
+    elif isinstance(job.error, LimitExceeded):
+        st.error(f"❌ 처리 한도 초과로 중단했습니다: {str(job.error)}")
+    elif job.status == FAILED:
+        st.error(f"❌ 오류 발생: {str(job.error)}")
+    else:
+        return False
+    forget_job(state_key)
+    return True
+
+def show_dedup_report(dedup):
+    """중복 제거 결과 (중복 제거를 켰을 때만, 작업 요약의 'dedup')"""
+    if dedup is None:
+        return
+    removed = dedup['removed']
+    if not removed:
+        st.info("🧹 내용이 같은 중복 파일이 없습니다")
+        return
+    st.info(f"🧹 중복 파일 {len(removed):,}개 제거 ({format_mb(dedup['removed_bytes'])} 절약)")
+    with st.expander("📋 제거된 중복 파일 보기"):
+        for path, kept_name in removed[:100]:
+            st.text(f"{path} = {kept_name}")
+        if len(removed) > 100:
+            st.text(f"... 외 {len(removed) - 100}개")
+
+def show_batch_report(report):
+    """여러 입력을 처리했을 때 입력별 처리 결과와 걸린 시간 (작업 요약의 'batch')"""
+    if report is None:
+        return
+    failed = [item for item in report if item['error']]
+    if failed:
+        st.warning(f"⚠️ {len(failed)}개 입력은 처리하지 못했습니다: {', '.join(item['name'] for item in failed[:5])}")
+    with st.expander(f"📚 입력별 처리 결과 ({len(report)}개)"):
+        st.dataframe(
+            pd.DataFrame({
+                "입력 파일": [item['name'] for item in report],
+                "처리한 파일 수": [item['entries'] for item in report],
+                "걸린 시간(초)": [item['seconds'] for item in report],
+                "결과": [f"❌ {item['error']}" if item['error'] else "✅ 완료" for item in report],
+            }),
+            hide_index=True, width="stretch"
+        )
+
+def plan_batch_rename(indexes, merge, *args, limit=None, entry_filter=None):
+    """여러 입력의 이름 변경 계획 (입력 위치, 원본 항목, 원래 이름, 새 이름) 목록
+
+    합치면 번호와 이름이 전체에서 이어지고, 따로 만들면 입력마다 처음부터 매깁니다.
+    """
+    if merge:
+        return plan_rename_batch(indexes, *args, limit=limit, entry_filter=entry_filter)
+    return [
+        (position,) + row
+        for position, index in enumerate(indexes)
+        for row in plan_rename(index, *args, limit=limit, entry_filter=entry_filter)
+    ]
+
+# 결과 목록 표의 열 이름 (결과 목록 열 → 화면 표시 이름)
+LISTING_COLUMNS = {'original': "원래 경로", 'name': "새 이름", 'size': "크기(바이트)", 'source': "원본 압축파일"}
+LISTING_PAGE_SIZES = [50, 100, 500, 1000]
+
+def listing_frame(state_key, listing):
+    """결과 목록(listing)의 표 (작업마다 한 번만 만들어 세션에 보관)"""
+    job_id = st.session_state.get(state_key)
+    cached = st.session_state.get(f"{state_key}_frame")
+    if cached is not None and cached[0] == job_id:
+        return cached[1]
+    frame = pd.DataFrame({
+        LISTING_COLUMNS['original']: listing['original'],
+        LISTING_COLUMNS['name']: listing['name'],
+        LISTING_COLUMNS['size']: pd.array(listing['size'], dtype='Int64'),
+    })
+    # 모으기·이름 변경처럼 모두 업로드한 ZIP에서 온 경우 원본 압축파일 열은 생략
+    if any(listing['source']):
+        frame[LISTING_COLUMNS['source']] = listing['source']
+    frame.index = pd.RangeIndex(1, len(frame) + 1)
+    st.session_state[f"{state_key}_frame"] = (job_id, frame)
+    # 새 작업의 목록은 첫 페이지부터
+    reset_listing_page(state_key)
+    return frame
+
+def listing_csv(frame):
+    """표를 엑셀에서 바로 열리는 CSV로 변환"""
+    return frame.to_csv(index_label="번호").encode('utf-8-sig')
+
+def reset_listing_page(state_key):
+    st.session_state[f"{state_key}_page"] = 1
+
+def show_listing(state_key, listing, file_name):
+    """결과 목록 표 (검색·페이지 나누기, 현재 페이지만 브라우저로 보냄)"""
+    frame = listing_frame(state_key, listing)
+    
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        query = st.text_input(
+            "🔍 파일명 검색", key=f"{state_key}_query", placeholder="원래 경로·새 이름·원본 압축파일에서 찾기",
+            on_change=partial(reset_listing_page, state_key)
+        )
+    if query:
+        mask = pd.Series(False, index=frame.index)
+        for column in (LISTING_COLUMNS['original'], LISTING_COLUMNS['name'], LISTING_COLUMNS['source']):
+            if column in frame:
+                mask |= frame[column].str.contains(query, case=False, regex=False)
+        frame = frame[mask]
+    
+    with col2:
+        page_size = st.selectbox(
+            "페이지당 개수", LISTING_PAGE_SIZES, index=1, key=f"{state_key}_page_size",
+            on_change=partial(reset_listing_page, state_key)
+        )
+    pages = max(1, -(-len(frame) // page_size))
+    with col3:
+        page = st.number_input(f"페이지 (전체 {pages:,})", min_value=1, max_value=pages, key=f"{state_key}_page")
+    
+    start = (page - 1) * page_size
+    st.dataframe(frame.iloc[start:start + page_size], width="stretch")
+    if len(frame):
+        st.caption(f"{len(frame):,}개 중 {start + 1:,}~{min(start + page_size, len(frame)):,}번째")
+    else:
+        st.caption("검색 결과가 없습니다")
+    
+    st.download_button(
+        "📄 목록 CSV 다운로드 (검색 결과 전체)",
+        data=partial(listing_csv, frame),
+        file_name=f"{file_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+        on_click="ignore",
+        key=f"{state_key}_csv"
+    )
+
+def choose_filter(tab_key):
+    """파일 거르기 옵션 (세 기능 공통, 내용을 풀기 전에 경로·확장자·크기·날짜로 고름)"""
+    with st.expander("🔍 파일 거르기 (경로·확장자·크기·날짜)"):
+        col1, col2 = st.columns(2)
+        with col1:
+            include = st.text_input("포함할 패턴", placeholder="예: *.pdf, 보고서/*", key=f"filter_include_{tab_key}")
+            extensions = st.text_input("이 확장자만", placeholder="예: pdf, jpg", key=f"filter_ext_{tab_key}")
+            min_mb = st.number_input("최소 크기 (MB, 0이면 제한 없음)", min_value=0.0, step=1.0, key=f"filter_min_{tab_key}")
+        with col2:
+            exclude = st.text_input("제외할 패턴", placeholder="예: 임시/*, *.tmp", key=f"filter_exclude_{tab_key}")
+            dates = st.date_input(
+                "수정 날짜 범위", value=(), min_value=datetime(1980, 1, 1), format="YYYY-MM-DD",
+                key=f"filter_dates_{tab_key}"
+            )
+            max_mb = st.number_input("최대 크기 (MB, 0이면 제한 없음)", min_value=0.0, step=1.0, key=f"filter_max_{tab_key}")
+        skip_junk = st.checkbox(
+            "🗑️ __MACOSX/, .DS_Store, Thumbs.db 같은 쓸모없는 파일 제외", value=True, key=f"filter_junk_{tab_key}"
+        )
+        st.caption("패턴은 쉼표로 구분합니다. '/'가 없으면 파일명에, 있으면 ZIP 안의 전체 경로에 맞춥니다.")
+    
+    # 날짜를 하나만 고르면 그날부터
+    start, end = (tuple(dates) + (None, None))[:2]
+    since, until = date_range(start, end)
+    return EntryFilter(
+        include=parse_list(include),
+        exclude=parse_list(exclude),
+        extensions=parse_list(extensions),
+        min_size=int(min_mb * 1024 * 1024) or None,
+        max_size=int(max_mb * 1024 * 1024) or None,
+        since=since,
+        until=until,
+        skip_junk=skip_junk,
+    )
+
+# 매니페스트가 있을 때 결과 ZIP 형식
+FULL_OUTPUT = "전체 결과"
+DELTA_OUTPUT = "바뀐 파일만"
+
+def choose_incremental(tab_key):
+    """매니페스트 옵션 (사용하지 않으면 None)
+
+    결과와 함께 받은 매니페스트를 다음번에 올리면 중앙 디렉터리 정보만 비교해
+    바뀐 파일만 처리하고, 전체 결과를 만들 때도 이전 파일명을 그대로 씁니다.
+    """
+    with st.expander("🔁 지난번 결과와 비교 (매니페스트)"):
+        make = st.checkbox("📝 매니페스트 만들기 (다음번 비교용)", value=False, key=f"manifest_make_{tab_key}")
+        uploaded = st.file_uploader("이전 매니페스트 (.manifest.json)", type="json", key=f"manifest_{tab_key}")
+        delta = st.radio("결과 ZIP", [FULL_OUTPUT, DELTA_OUTPUT], horizontal=True, key=f"delta_{tab_key}")
+    
+    if uploaded is None:
+        return {'previous': None, 'delta': False, 'option': True} if make else None
+    try:
+        previous = Manifest.loads(uploaded.getvalue().decode('utf-8'))
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"❌ 매니페스트를 읽을 수 없습니다: {str(e)}")
+        return None
+    delta = delta == DELTA_OUTPUT
+    # 결과 캐시 키에 쓸 값 (이전 매니페스트 내용과 결과 형식)
+    return {'previous': previous, 'delta': delta, 'option': [content_hash(uploaded), delta]}
+
+def new_incremental(kind, choice):
+    """작업마다 새로 만드는 증분 처리 상태 (매니페스트 옵션을 쓰지 않으면 None)"""
+    if choice is None:
+        return None
+    return Incremental(kind, choice['previous'], choice['delta'])
+
+def show_manifest(state_key, result, file_name):
+    """증분 처리 결과와 매니페스트 다운로드 (매니페스트를 만들었을 때만)"""
+    report = result.get('incremental')
+    if report is not None:
+        text = f"🔁 지난번과 같은 파일 {report['unchanged']:,}개"
+        if report['delta']:
+            text += " (결과에서 제외)"
+        text += f" · 바뀐 파일 {report['changed']:,}개 · 새 파일 {report['added']:,}개"
+        if report['removed']:
+            text += f" · 없어진 파일 {len(report['removed']):,}개"
+        st.info(text)
+        if report['removed']:
+            with st.expander("📋 없어진 파일 보기"):
+                st.dataframe(
+                    pd.DataFrame({LISTING_COLUMNS['original']: report['removed']}),
+                    hide_index=True, width="stretch"
+                )
+    
+    manifest = result.get('manifest')
+    if manifest is not None:
+        st.download_button(
+            "📝 매니페스트 다운로드 (다음번 비교용)",
+            data=partial(json.dumps, manifest, ensure_ascii=False, separators=(',', ':')),
+            file_name=f"{file_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.manifest.json",
+            mime="application/json",
+            on_click="ignore",
+            key=f"{state_key}_manifest",
+            use_container_width=True
+        )
+
+def download_result(job, part=None):
+    """다운로드할 결과 ZIP(나누었으면 조각 part)을 처음부터 읽는 파일 객체 (내용을 메모리에 복사하지 않음)
+
+    결과를 여는 데 걸린 시간과 크기를 지표에 기록합니다.
+    """
+    started = time.perf_counter()
+    if part is None:
+        reader = open_reader(job.info['output_file'])
+        size = reader.seek(0, 2)
+        reader.seek(0)
+    else:
+        reader = part.open()
+        size = part.size
+    metrics.get_registry().observe_stage(job.kind, 'download', time.perf_counter() - started, size, 1)
+    return reader
+
+def show_parts(state_key, job, file_name):
+    """완성된 결과 조각마다 다운로드 버튼 (조각은 여러 개 받으므로 받아도 결과를 정리하지 않음)"""
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    for part in list(job.info['parts']):
+        if part.name is not None:
+            # 입력마다 따로 만든 결과
+            label = f"📦 {part.name} 결과 다운로드 ({format_mb(part.size)}, {part.entries:,}개 파일)"
+            part_file_name = f"{file_name}_{part.name.rsplit('.', 1)[0]}_{stamp}.zip"
+        else:
+            label = f"📦 {part.number}번째 조각 다운로드 ({format_mb(part.size)}, {part.entries:,}개 파일)"
+            part_file_name = f"{file_name}_{stamp}_{part.number:03d}.zip"
+        st.download_button(
+            label=label,
+            data=partial(download_result, job, part),
+            file_name=part_file_name,
+            mime="application/zip",
+            on_click="ignore",
+            key=f"{state_key}_part_{part.number}",
+            use_container_width=True
+        )
+
+def show_download(state_key, job, label, file_name):
+    """결과 다운로드 버튼 (다운로드하면 결과 정리)"""
+    if job.info.get('cached'):
+        st.caption("⚡ 같은 파일·옵션으로 만든 이전 결과를 바로 가져왔습니다")
+    if job.profile_path:
+        st.caption(f"🔬 프로파일 저장됨: {job.profile_path}")
+    if 'parts' in job.info:
+        if any(part.name is not None for part in job.info['parts']):
+            st.caption(f"📦 입력마다 결과 ZIP {len(job.info['parts'])}개를 따로 만들었습니다")
+        else:
+            st.caption(f"📦 결과를 {len(job.info['parts'])}개 조각으로 나누었습니다. 조각마다 따로 압축을 풀 수 있습니다")
+        show_parts(state_key, job, file_name)
+        return
+    st.download_button(
+        label=label,
+        data=partial(download_result, job),
+        file_name=f"{file_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+        mime="application/zip",
+        on_click=partial(forget_job, state_key),
+        use_container_width=True
+    )
 
 # 고정된 헤더 초기화
 if 'show_panel' not in st.session_state:
     st.session_state['show_panel'] = False
 
-if 'posts' not in st.session_state:
-    st.session_state['posts'] = []
-
 st.title("📁 컴퓨터 정리의 기본")
 
 # 왼쪽 사이드바
@@ -192,7 +778,7 @@ with st.sidebar:
     # 방문자 수 (첫 번째 줄)
     st.markdown(f"""
         <div style="background-color: #f0f2f6; padding: 10px 20px; border-radius: 8px; text-align: center; margin-bottom: 5px; margin-top: 5px;">
-            <span style="font-size: 16px;">👥 오늘 방문자: <strong style="font-size: 22px;">{st.session_state['visitor_count']}</strong></span>
+            <span style="font-size: 16px;">👥 오늘 방문자: <strong style="font-size: 22px;">{get_board().visits():,}</strong></span>
         </div>
     """, unsafe_allow_html=True)
     
@@ -230,7 +816,7 @@ with st.sidebar:
     st.markdown("---")
     
     st.markdown('<p style="font-size:20px; font-weight:bold; margin-bottom:5px;">📝 팁</p>', unsafe_allow_html=True)
-    st.markdown('<p style="font-size:16px; margin:2px 0;">• 사용자 폴더를 압축한 후 업로드하세요<br>• 모든 작업은 메모리에서 이루어집니다<br>• 다운로드한 ZIP 파일을 원하는 위치에서 압축 해제하세요</p>', unsafe_allow_html=True)
+    st.markdown('<p style="font-size:16px; margin:2px 0;">• 사용자 폴더를 압축한 후 업로드하세요<br>• 큰 파일은 메모리 대신 서버의 임시 파일에서 처리합니다<br>• 다운로드한 ZIP 파일을 원하는 위치에서 압축 해제하세요</p>', unsafe_allow_html=True)
 
 # 의견남기기 패널
 if st.session_state['show_panel']:
@@ -247,13 +833,10 @@ if st.session_state['show_panel']:
                 if not author_name or not post_content:
                     st.error("❌ 이름과 의견을 입력해주세요")
                 else:
-                    new_post = {
-                        'name': author_name,
-                        'email': author_email if author_email else "비공개",
-                        'content': post_content,
-                        'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    st.session_state['posts'].insert(0, new_post)
+                    post_id = get_board().add_post(author_name, author_email if author_email else "비공개", post_content)
+                    # 이 세션에서 쓴 의견만 지울 수 있음
+                    st.session_state.setdefault('my_posts', set()).add(post_id)
+                    st.session_state['board_page'] = 1
                     st.success("✅ 의견이 등록되었습니다!")
                     st.rerun()
         with col2:
@@ -265,10 +848,21 @@ if st.session_state['show_panel']:
         st.markdown("---")
         st.subheader("📋 등록된 의견")
         
-        if len(st.session_state['posts']) == 0:
+        board = get_board()
+        total_posts = board.count_posts()
+        if total_posts == 0:
             st.info("📝 아직 의견이 없습니다.")
         else:
-            for idx, post in enumerate(st.session_state['posts'][:10]):
+            # 보여줄 페이지의 의견만 읽음
+            pages = max(1, -(-total_posts // POSTS_PAGE_SIZE))
+            if st.session_state.get('board_page', 1) > pages:
+                st.session_state['board_page'] = pages
+            page = 1
+            if pages > 1:
+                page = st.number_input(f"페이지 (전체 {pages:,})", min_value=1, max_value=pages, key="board_page")
+            
+            my_posts = st.session_state.get('my_posts', set())
+            for post in board.posts(page, POSTS_PAGE_SIZE):
                 with st.container(border=True):
                     col1, col2 = st.columns([5, 1])
                     with col1:
@@ -276,12 +870,12 @@ if st.session_state['show_panel']:
                         st.caption(f"📅 {post['date']}")
                         st.write(post['content'][:100] + "..." if len(post['content']) > 100 else post['content'])
                     with col2:
-                        if st.button("🗑️", key=f"panel_delete_{idx}", help="삭제"):
-                            st.session_state['posts'].pop(idx)
+                        if post['id'] in my_posts and st.button("🗑️", key=f"panel_delete_{post['id']}", help="삭제"):
+                            board.delete_post(post['id'])
+                            my_posts.discard(post['id'])
                             st.rerun()
             
-            if len(st.session_state['posts']) > 10:
-                st.info(f"... 외 {len(st.session_state['posts']) - 10}개")
+            st.caption(f"전체 {total_posts:,}개 의견")
 
 tab1, tab2, tab3 = st.tabs(["📂 모든 파일 한 곳에 모으기", "✏️ 파일명 일괄 수정", "📦 압축파일 자동 해제"])
 
@@ -294,67 +888,93 @@ with tab1:
     # 파일 업로드 버튼의 가로폭을 2배로 (3칸 중 2칸 사용)
     col_upload, col_empty = st.columns([2, 1])
     with col_upload:
-        uploaded_zip = st.file_uploader("📁 ZIP 파일 업로드", type="zip", key="uploader_tab1")
+        uploaded_zip = choose_source("tab1")
+        merge_1 = choose_batch_output("tab1", uploaded_zip)
+    
+    # 옵션
+    col_opt1, col_opt2 = st.columns([1, 2])
+    with col_opt1:
+        compression_1 = st.selectbox("🗜️ 압축 방식", POLICY_OPTIONS, key="compression_tab1", help=COMPRESSION_HELP)
+        # 입력마다 따로 만들 때는 나누지 않음
+        parts_1 = st.selectbox("📦 결과 나누기", PART_SIZE_OPTIONS, key="parts_tab1", help=PART_SIZE_HELP,
+                               disabled=merge_1 is False)
+    with col_opt2:
+        dedup_1 = st.checkbox("🧹 내용이 같은 중복 파일 제거", value=False, key="dedup_tab1")
+    filter_1 = choose_filter("tab1")
+    # 매니페스트 비교는 입력이 하나일 때만
+    manifest_1 = choose_incremental("tab1") if merge_1 is None else None
     
-    if uploaded_zip and st.button("🚀 파일 모으기 시작", key="collect_btn", use_container_width=True):
+    job_1 = current_job('job_tab1')
+    
+    # 실행 중에는 버튼을 막아 같은 작업이 두 번 돌지 않게 함
+    if uploaded_zip and st.button("🚀 파일 모으기 시작", key="collect_btn", use_container_width=True, disabled=job_running(job_1)):
         try:
-            with st.spinner("파일을 수집하는 중..."):
-                # 업로드된 ZIP 파일 읽기
-                input_zip = zipfile.ZipFile(uploaded_zip)
-                
-                # 모든 파일 추출 (폴더 제외)
-                all_files = [f for f in input_zip.namelist() if not f.endswith('/')]
-                
-                if not all_files:
-                    st.warning("⚠️ ZIP 파일에 파일이 없습니다")
-                else:
-                    # 결과 ZIP 생성
-                    output_zip_buffer = io.BytesIO()
-                    
-                    with zipfile.ZipFile(output_zip_buffer, 'w', zipfile.ZIP_DEFLATED) as output_zip:
-                        file_counter = {}
-                        
-                        for file_name in all_files:
-                            # 파일명만 추출 (경로 제거)
-                            base_file_name = file_name.split('/')[-1]
-                            
-                            # 중복 처리
-                            if base_file_name in file_counter:
-                                file_counter[base_file_name] += 1
-                                name, ext = os.path.splitext(base_file_name)
-                                final_name = f"{name}_{file_counter[base_file_name]}{ext}"
-                            else:
-                                file_counter[base_file_name] = 0
-                                final_name = base_file_name
-                            
-                            # 파일 읽기 및 새 ZIP에 추가
-                            file_content = input_zip.read(file_name)
-                            output_zip.writestr(final_name, file_content)
-                    
-                    output_zip_buffer.seek(0)
-                    
-                    st.success(f"✅ 총 {len(all_files)}개 파일 수집 완료!")
-                    
-                    st.download_button(
-                        label="📥 압축 파일 다운로드",
-                        data=output_zip_buffer.getvalue(),
-                        file_name=f"모든파일_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                        mime="application/zip",
-                        use_container_width=True
-                    )
-                    
-                    with st.expander("📋 수집된 파일 목록 보기"):
-                        for i, file_name in enumerate(all_files[:100], 1):
-                            st.text(f"{i}. {file_name.split('/')[-1]}")
-                        if len(all_files) > 100:
-                            st.text(f"... 외 {len(all_files) - 100}개")
-                    
-                    # 처음으로 버튼
-                    if st.button("🔄 처음으로", use_container_width=True, key="reset1"):
-                        st.rerun()
+            # 거르기 조건에 맞는 모든 파일 (폴더 제외, 내용은 읽지 않음)
+            if merge_1 is not None:
+                uploads_1, indexes_1 = load_batch(uploaded_zip)
+                all_files = [entry for index in indexes_1 for entry in filter_1.select(index.entries)]
+            else:
+                index_1 = load_index(uploaded_zip)
+                all_files = filter_1.select(index_1.entries)
+            
+            if merge_1 is None and not index_1.entries:
+                st.warning("⚠️ ZIP 파일에 파일이 없습니다")
+            elif not all_files:
+                st.warning("⚠️ 조건에 맞는 파일이 없습니다")
+            elif merge_1 is not None:
+                # 여러 입력을 동시에 처리해 하나로 합치거나 입력마다 따로 만듦
+                policy = policy_from_label(compression_1)
+                job_1 = start_batch_job(
+                    'job_tab1', 'collect', uploads_1, merge_1,
+                    {'compression': policy.name, 'dedup': dedup_1, 'filter': filter_1.options()},
+                    part_size=part_size_from_label(parts_1),
+                    input_options=[{'index': index} for index in indexes_1],
+                    dedup=dedup_1,
+                    policy=policy,
+                    entry_filter=filter_1,
+                    total_entries=len(all_files),
+                    sizes=[entry.size for entry in all_files]
+                )
+            else:
+                policy = policy_from_label(compression_1)
+                incremental = new_incremental('collect', manifest_1)
+                # 지난번과 바뀌지 않아 건너뛸 파일은 진행률에서 제외
+                pending = incremental.pending(all_files) if incremental else all_files
+                job_1 = start_job(
+                    'job_tab1', 'collect', engine.collect, uploaded_zip,
+                    {
+                        'compression': policy.name, 'dedup': dedup_1, 'filter': filter_1.options(),
+                        'manifest': manifest_1 and manifest_1['option'], 'part_size': part_size_from_label(parts_1),
+                    },
+                    part_size=part_size_from_label(parts_1),
+                    policy=policy,
+                    index=index_1,
+                    dedup=Deduplicator() if dedup_1 else None,
+                    incremental=incremental,
+                    entry_filter=filter_1,
+                    total_entries=len(pending),
+                    sizes=[entry.size for entry in pending]
+                )
         
         except Exception as e:
             st.error(f"❌ 오류 발생: {str(e)}")
+    
+    if job_running(job_1):
+        show_job_progress('job_tab1', "모든파일")
+    elif job_1 is not None and not show_job_failure('job_tab1', job_1):
+        listing = job_1.result['listing']
+        st.success(f"✅ 총 {len(listing['name']):,}개 파일 수집 완료!")
+        show_batch_report(job_1.result.get('batch'))
+        show_dedup_report(job_1.result.get('dedup'))
+        
+        show_manifest('job_tab1', job_1.result, "모든파일")
+        show_download('job_tab1', job_1, "📥 압축 파일 다운로드", "모든파일")
+        
+        with st.expander("📋 수집된 파일 목록 보기"):
+            show_listing('job_tab1', listing, "모든파일_목록")
+        
+        # 처음으로 버튼
+        st.button("🔄 처음으로", use_container_width=True, key="reset1", on_click=partial(forget_job, 'job_tab1'))
 
 # ==================== 기능 2: 파일명 일괄 수정 ====================
 with tab2:
@@ -365,284 +985,269 @@ with tab2:
     # 파일 업로드 버튼의 가로폭을 2배로 (3칸 중 2칸 사용)
     col_upload, col_empty = st.columns([2, 1])
     with col_upload:
-        uploaded_zip_2 = st.file_uploader("📁 ZIP 파일 업로드", type="zip", key="uploader_tab2")
+        uploaded_zip_2 = choose_source("tab2")
+        merge_2 = choose_batch_output("tab2", uploaded_zip_2)
+    
+    job_2 = current_job('job_tab2')
     
     if uploaded_zip_2:
-        # ZIP 파일 읽기
-        input_zip_2 = zipfile.ZipFile(uploaded_zip_2)
-        all_files_in_zip = [f for f in input_zip_2.namelist() if not f.endswith('/')]
-        
-        # 확장자 추출
-        extensions = set(['모든 파일'])
-        for file_name in all_files_in_zip:
-            ext = os.path.splitext(file_name)[1].lower()
-            if ext:
-                extensions.add(ext)
+        # ZIP 파일 색인 (중앙 디렉터리 정보만 사용, 같은 파일이면 재사용, 여러 입력이면 입력마다)
+        if merge_2 is not None:
+            uploads_2, indexes_2 = load_batch(uploaded_zip_2)
+        else:
+            uploads_2, indexes_2 = [uploaded_zip_2], [load_index(uploaded_zip_2)]
+        extensions_2 = sorted({ext for index in indexes_2 for ext in index.extensions})
         
-        st.success(f"✅ {len(extensions)-1}개 확장자 발견")
+        st.success(f"✅ {len(extensions_2)}개 확장자 발견")
         
         # 옵션 설정
-        col_opt1, col_opt2, col_opt3 = st.columns([1, 1, 1])
+        col_opt1, col_opt2, col_opt3, col_opt4 = st.columns([1, 1, 1, 1])
         
         with col_opt1:
-            selected_ext = st.selectbox("📄 파일 확장자", sorted(list(extensions)))
+            selected_ext = st.selectbox("📄 파일 확장자", sorted([ALL_FILES] + extensions_2))
         
         with col_opt2:
-            sort_by = st.selectbox(
-                "📊 정렬 기준",
-                ["이름순", "날짜순 (오래된 순)", "날짜순 (최신 순)", "크기순 (작은 순)", "크기순 (큰 순)"]
-            )
+            sort_by = st.selectbox("📊 정렬 기준", SORT_OPTIONS)
         
         with col_opt3:
-            naming_type = st.selectbox(
-                "🔤 파일명 형식",
-                ["숫자 추가", "특정 문자 추가"]
-            )
+            naming_type = st.selectbox("🔤 파일명 형식", NAMING_OPTIONS)
+        
+        with col_opt4:
+            compression_2 = st.selectbox("🗜️ 압축 방식", POLICY_OPTIONS, key="compression_tab2", help=COMPRESSION_HELP)
+            parts_2 = st.selectbox("📦 결과 나누기", PART_SIZE_OPTIONS, key="parts_tab2", help=PART_SIZE_HELP,
+                                   disabled=merge_2 is False)
         
-        # 특정 문자 입력란 (조건부 표시)
+        # 특정 문자·템플릿 입력란 (조건부 표시)
         custom_text = None
+        find_text, replace_text = None, ''
         if naming_type == "특정 문자 추가":
             custom_text = st.text_input("✍️ 추가할 문자", placeholder="예: 여행사진")
+        elif naming_type == "템플릿":
+            custom_text = st.text_input("🧩 파일명 템플릿", value=DEFAULT_TEMPLATE, help=TEMPLATE_HELP)
+            col_find, col_replace = st.columns(2)
+            with col_find:
+                find_text = st.text_input("🔎 찾을 문자 (정규식, 선택)", placeholder=r"예: IMG_(\d+)")
+            with col_replace:
+                replace_text = st.text_input("🔁 바꿀 문자", placeholder=r"예: 사진_\1")
         
-        if st.button("🚀 파일명 변경 시작", key="rename_btn", use_container_width=True):
+        filter_2 = choose_filter("tab2")
+        manifest_2 = choose_incremental("tab2") if merge_2 is None else None
+        
+        # 새 파일명 미리보기 (옵션을 바꿀 때마다 앞부분만 다시 계산)
+        if naming_type != "특정 문자 추가" or custom_text:
+            try:
+                if merge_2 is None:
+                    preview = plan_rename(
+                        indexes_2[0], selected_ext, sort_by, naming_type, custom_text, find_text, replace_text,
+                        limit=RENAME_PREVIEW_COUNT, entry_filter=filter_2
+                    )
+                else:
+                    rows = plan_batch_rename(
+                        indexes_2, merge_2, selected_ext, sort_by, naming_type, custom_text, find_text, replace_text,
+                        limit=RENAME_PREVIEW_COUNT, entry_filter=filter_2
+                    )
+                    preview = [row[1:] for row in rows[:RENAME_PREVIEW_COUNT]]
+            except ValueError as e:
+                st.error(f"❌ {str(e)}")
+            else:
+                st.caption(f"👀 미리보기 (앞 {len(preview)}개)")
+                st.dataframe(
+                    pd.DataFrame(
+                        [(info.filename, new_name) for info, _, new_name in preview],
+                        columns=[LISTING_COLUMNS['original'], LISTING_COLUMNS['name']]
+                    ),
+                    hide_index=True, width="stretch"
+                )
+        
+        if st.button("🚀 파일명 변경 시작", key="rename_btn", use_container_width=True, disabled=job_running(job_2)):
             if naming_type == "특정 문자 추가" and not custom_text:
                 st.error("❌ 추가할 문자를 입력해주세요")
             else:
                 try:
-                    with st.spinner("파일명을 변경하는 중..."):
-                        # 확장자 필터링
-                        filtered_files = []
-                        for file_name in all_files_in_zip:
-                            ext = os.path.splitext(file_name)[1].lower()
-                            if selected_ext == '모든 파일' or ext == selected_ext:
-                                filtered_files.append(file_name)
-                        
-                        if not filtered_files:
-                            st.warning("⚠️ 조건에 맞는 파일이 없습니다")
+                    # 1단계: 파일 내용을 읽지 않고 새 파일명 계획
+                    incremental = new_incremental('rename', manifest_2)
+                    if merge_2 is None:
+                        plan = plan_rename(
+                            indexes_2[0], selected_ext, sort_by, naming_type, custom_text, find_text, replace_text,
+                            incremental=incremental, entry_filter=filter_2
+                        )
+                    else:
+                        # 합치면 번호와 이름이 모든 입력에 걸쳐 이어짐
+                        rows = plan_batch_rename(
+                            indexes_2, merge_2, selected_ext, sort_by, naming_type, custom_text, find_text,
+                            replace_text, entry_filter=filter_2
+                        )
+                        plan = [row[1:] for row in rows]
+                    
+                    if not plan and incremental is not None and incremental.delta:
+                        st.warning("⚠️ 지난번과 바뀐 파일이 없습니다")
+                    elif not plan:
+                        st.warning("⚠️ 조건에 맞는 파일이 없습니다")
+                    else:
+                        # 2단계: 계획대로 한 파일씩 결과 ZIP에 기록 (백그라운드)
+                        policy = policy_from_label(compression_2)
+                        options = {
+                            'compression': policy.name, 'ext': selected_ext,
+                            'sort': sort_by, 'naming': naming_type, 'text': custom_text,
+                            'find': find_text, 'replace': replace_text, 'filter': filter_2.options(),
+                            'manifest': manifest_2 and manifest_2['option'], 'part_size': part_size_from_label(parts_2),
+                        }
+                        if merge_2 is not None:
+                            job_2 = start_batch_job(
+                                'job_tab2', 'rename', uploads_2, merge_2, options,
+                                part_size=part_size_from_label(parts_2),
+                                input_options=[
+                                    {'plan': [row[1:] for row in rows if row[0] == position]}
+                                    for position in range(len(uploads_2))
+                                ],
+                                policy=policy,
+                                total_entries=len(plan),
+                                sizes=[info.file_size for info, _, _ in plan],
+                                info={
+                                    'plan': plan,
+                                    'listing': batch_plan_listing(rows, [upload.name for upload in uploads_2]).as_dict(),
+                                }
+                            )
                         else:
-                            # 파일 정보 추출 (정렬을 위해)
-                            file_info = []
-                            for file_name in filtered_files:
-                                file_content = input_zip_2.read(file_name)
-                                file_size = len(file_content)
-                                # 수정 시간은 ZIP에서 직접 가져오기
-                                file_info.append({
-                                    'name': file_name,
-                                    'content': file_content,
-                                    'size': file_size
-                                })
-                            
-                            # 정렬
-                            if sort_by == "이름순":
-                                file_info.sort(key=lambda x: x['name'].split('/')[-1])
-                            elif sort_by == "크기순 (작은 순)":
-                                file_info.sort(key=lambda x: x['size'])
-                            elif sort_by == "크기순 (큰 순)":
-                                file_info.sort(key=lambda x: x['size'], reverse=True)
-                            
-                            # 결과 ZIP 생성
-                            output_zip_buffer = io.BytesIO()
-                            preview_list = []
-                            
-                            with zipfile.ZipFile(output_zip_buffer, 'w', zipfile.ZIP_DEFLATED) as output_zip:
-                                for idx, file_info_item in enumerate(file_info, 1):
-                                    original_name = file_info_item['name'].split('/')[-1]
-                                    ext = os.path.splitext(original_name)[1]
-                                    
-                                    # 새 파일명 생성
-                                    if naming_type == "숫자 추가":
-                                        new_name = f"{idx:04d}_{original_name}"
-                                    else:  # 특정 문자 추가
-                                        new_name = f"{custom_text}_{original_name}"
-                                    
-                                    # ZIP에 추가
-                                    output_zip.writestr(new_name, file_info_item['content'])
-                                    preview_list.append((original_name, new_name))
-                            
-                            output_zip_buffer.seek(0)
-                            
-                            st.success(f"✅ 총 {len(file_info)}개 파일명 변경 완료!")
-                            
-                            # 다운로드 버튼
-                            st.download_button(
-                                label="📥 변경된 파일 다운로드",
-                                data=output_zip_buffer.getvalue(),
-                                file_name=f"이름변경_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                                mime="application/zip",
-                                use_container_width=True
+                            job_2 = start_job(
+                                'job_tab2', 'rename', engine.rename, uploaded_zip_2, options,
+                                part_size=part_size_from_label(parts_2),
+                                plan=plan,
+                                policy=policy,
+                                incremental=incremental,
+                                total_entries=len(plan),
+                                sizes=[info.file_size for info, _, _ in plan],
+                                info={'plan': plan, 'listing': plan_listing(plan).as_dict()}
                             )
-                            
-                            # 변경 결과 미리보기
-                            with st.expander("📋 변경된 파일명 미리보기"):
-                                for old_name, new_name in preview_list[:50]:
-                                    st.text(f"{old_name} → {new_name}")
-                                
-                                if len(preview_list) > 50:
-                                    st.text(f"... 외 {len(preview_list) - 50}개")
-                            
-                            # 처음으로 버튼
-                            if st.button("🔄 처음으로", use_container_width=True, key="reset2"):
-                                st.rerun()
                 
                 except Exception as e:
                     st.error(f"❌ 오류 발생: {str(e)}")
+    
+    if job_2 is not None and 'plan' in job_2.info:
+        # 변경 결과 미리보기 (작업이 끝나기 전에도 표시)
+        with st.expander("📋 변경된 파일명 미리보기"):
+            show_listing('job_tab2', job_2.info['listing'], "이름변경_목록")
+    
+    if job_running(job_2):
+        show_job_progress('job_tab2', "이름변경")
+    elif job_2 is not None and not show_job_failure('job_tab2', job_2):
+        st.success(f"✅ 총 {len(job_2.info['plan']):,}개 파일명 변경 완료!")
+        show_batch_report(job_2.result.get('batch'))
+        
+        # 다운로드 버튼
+        show_manifest('job_tab2', job_2.result, "이름변경")
+        show_download('job_tab2', job_2, "📥 변경된 파일 다운로드", "이름변경")
+        
+        # 처음으로 버튼
+        st.button("🔄 처음으로", use_container_width=True, key="reset2", on_click=partial(forget_job, 'job_tab2'))
 
 # ==================== 기능 3: 압축파일 자동 해제 ====================
 with tab3:
     st.header("📦 폴더 내 모든 압축파일 자동 해제")
-    st.markdown("ZIP 파일을 업로드하면 내부의 모든 압축파일(.zip, .rar, .7z 등)을 해제하고 원본 압축파일을 제거합니다.")
+    st.markdown("ZIP 파일을 업로드하면 내부의 모든 압축파일(.zip, .tar, .gz, .bz2, .xz)을 해제하고 원본 압축파일을 제거합니다.")
     st.markdown("ZIP 파일로만 가능합니다.")
     
     # 파일 업로드 버튼의 가로폭을 2배로 (3칸 중 2칸 사용)
     col_upload, col_empty = st.columns([2, 1])
     with col_upload:
-        uploaded_zip_3 = st.file_uploader("📁 ZIP 파일 업로드", type="zip", key="uploader_tab3")
+        uploaded_zip_3 = choose_source("tab3")
+        merge_3 = choose_batch_output("tab3", uploaded_zip_3)
+    
+    job_3 = current_job('job_tab3')
     
     if uploaded_zip_3:
         st.info("💡 압축파일 해제 옵션을 선택하고 시작 버튼을 눌러주세요")
         
         # 옵션
-        col_opt1, col_opt2 = st.columns(2)
+        col_opt1, col_opt2, col_opt3 = st.columns(3)
         with col_opt1:
             keep_original = st.checkbox("원본 압축파일 보관", value=False)
+            dedup_3 = st.checkbox("🧹 내용이 같은 중복 파일 제거", value=False, key="dedup_tab3")
         with col_opt2:
             nested_extract = st.checkbox("중첩된 압축파일도 해제", value=True)
+        with col_opt3:
+            compression_3 = st.selectbox("🗜️ 압축 방식", POLICY_OPTIONS, key="compression_tab3", help=COMPRESSION_HELP)
+            parts_3 = st.selectbox("📦 결과 나누기", PART_SIZE_OPTIONS, key="parts_tab3", help=PART_SIZE_HELP,
+                                   disabled=merge_3 is False)
+        filter_3 = choose_filter("tab3")
+        manifest_3 = choose_incremental("tab3") if merge_3 is None else None
         
-        if st.button("🚀 압축파일 해제 시작", key="extract_btn", use_container_width=True):
+        if st.button("🚀 압축파일 해제 시작", key="extract_btn", use_container_width=True, disabled=job_running(job_3)):
             try:
-                with st.spinner("압축파일을 해제하는 중..."):
-                    # 업로드된 ZIP 파일 읽기
-                    input_zip_3 = zipfile.ZipFile(uploaded_zip_3)
-                    all_files = input_zip_3.namelist()
-                    
-                    # 압축파일 확장자 리스트
-                    archive_extensions = {'.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz'}
-                    
-                    # 모든 파일 추출하기
-                    extracted_files = {}
-                    archive_files = []
-                    
-                    for file_path in all_files:
-                        if file_path.endswith('/'):
-                            continue
-                        
-                        file_content = input_zip_3.read(file_path)
-                        file_name = file_path.split('/')[-1]
-                        file_ext = os.path.splitext(file_name)[1].lower()
-                        
-                        if file_ext in archive_extensions:
-                            archive_files.append((file_name, file_content, file_ext))
-                        else:
-                            extracted_files[file_name] = file_content
-                    
-                    # 압축파일 해제
-                    total_extracted = 0
-                    
-                    for archive_name, archive_content, archive_ext in archive_files:
-                        try:
-                            # ZIP 파일만 처리 (다른 형식은 바이너리로 저장)
-                            if archive_ext == '.zip':
-                                archive_buffer = io.BytesIO(archive_content)
-                                try:
-                                    extracted_zip = zipfile.ZipFile(archive_buffer)
-                                    for inner_file in extracted_zip.namelist():
-                                        if not inner_file.endswith('/'):
-                                            inner_content = extracted_zip.read(inner_file)
-                                            inner_file_name = inner_file.split('/')[-1]
-                                            
-                                            # 중복 처리
-                                            if inner_file_name in extracted_files:
-                                                base_name, ext = os.path.splitext(inner_file_name)
-                                                counter = 1
-                                                new_name = f"{base_name}_{counter}{ext}"
-                                                while new_name in extracted_files:
-                                                    counter += 1
-                                                    new_name = f"{base_name}_{counter}{ext}"
-                                                extracted_files[new_name] = inner_content
-                                            else:
-                                                extracted_files[inner_file_name] = inner_content
-                                            
-                                            total_extracted += 1
-                                            
-                                            # 중첩된 압축파일도 해제할지 확인
-                                            if nested_extract:
-                                                inner_ext = os.path.splitext(inner_file_name)[1].lower()
-                                                if inner_ext == '.zip':
-                                                    try:
-                                                        nested_buffer = io.BytesIO(inner_content)
-                                                        nested_zip = zipfile.ZipFile(nested_buffer)
-                                                        for nested_file in nested_zip.namelist():
-                                                            if not nested_file.endswith('/'):
-                                                                nested_content = nested_zip.read(nested_file)
-                                                                nested_file_name = nested_file.split('/')[-1]
-                                                                
-                                                                if nested_file_name in extracted_files:
-                                                                    base_name, ext = os.path.splitext(nested_file_name)
-                                                                    counter = 1
-                                                                    new_name = f"{base_name}_{counter}{ext}"
-                                                                    while new_name in extracted_files:
-                                                                        counter += 1
-                                                                        new_name = f"{base_name}_{counter}{ext}"
-                                                                    extracted_files[new_name] = nested_content
-                                                                else:
-                                                                    extracted_files[nested_file_name] = nested_content
-                                                                
-                                                                total_extracted += 1
-                                                    except:
-                                                        pass
-                                    
-                                    # 원본 압축파일 보관하지 않음 (기본값)
-                                    if not keep_original and archive_name in extracted_files:
-                                        del extracted_files[archive_name]
-                                
-                                except:
-                                    # 손상된 ZIP 파일이면 그냥 저장
-                                    if keep_original:
-                                        extracted_files[archive_name] = archive_content
-                            else:
-                                # ZIP이 아닌 다른 압축파일은 그냥 저장
-                                if keep_original:
-                                    extracted_files[archive_name] = archive_content
-                        except:
-                            if keep_original:
-                                extracted_files[archive_name] = archive_content
-                    
-                    # 원본 압축파일도 해제하지 않을 경우 제거
-                    if not keep_original:
-                        for archive_name, _, _ in archive_files:
-                            if archive_name in extracted_files:
-                                del extracted_files[archive_name]
-                    
-                    # 결과 ZIP 생성
-                    output_zip_buffer = io.BytesIO()
-                    
-                    with zipfile.ZipFile(output_zip_buffer, 'w', zipfile.ZIP_DEFLATED) as output_zip:
-                        for file_name, file_content in extracted_files.items():
-                            output_zip.writestr(file_name, file_content)
-                    
-                    output_zip_buffer.seek(0)
-                    
-                    st.success(f"✅ 압축파일 해제 완료! ({len(archive_files)}개 압축파일 해제, {total_extracted}개 파일 추출)")
-                    
-                    # 다운로드 버튼
-                    st.download_button(
-                        label="📥 처리된 파일 다운로드",
-                        data=output_zip_buffer.getvalue(),
-                        file_name=f"압축해제_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                        mime="application/zip",
-                        use_container_width=True
+                policy = policy_from_label(compression_3)
+                is_container = lambda entry: archive_kind(entry.base) is not None
+                if merge_3 is not None:
+                    # 여러 입력을 동시에 처리해 하나로 합치거나 입력마다 따로 만듦
+                    uploads_3, indexes_3 = load_batch(uploaded_zip_3)
+                    pending = [
+                        entry for index in indexes_3
+                        for entry in filter_3.select(index.entries, is_container=is_container)
+                    ]
+                    job_3 = start_batch_job(
+                        'job_tab3', 'extract', uploads_3, merge_3,
+                        {
+                            'compression': policy.name, 'keep_original': keep_original,
+                            'nested': nested_extract, 'dedup': dedup_3, 'filter': filter_3.options(),
+                        },
+                        part_size=part_size_from_label(parts_3),
+                        input_options=[{'index': index} for index in indexes_3],
+                        keep_original=keep_original,
+                        nested=nested_extract,
+                        dedup=dedup_3,
+                        policy=policy,
+                        entry_filter=filter_3,
+                        sizes=[entry.size for entry in pending]
                     )
+                else:
+                    index_3 = load_index(uploaded_zip_3)
                     
-                    # 결과 미리보기
-                    with st.expander("📋 처리된 파일 목록"):
-                        for i, file_name in enumerate(sorted(extracted_files.keys())[:100], 1):
-                            st.text(f"{i}. {file_name}")
-                        if len(extracted_files) > 100:
-                            st.text(f"... 외 {len(extracted_files) - 100}개")
+                    options = {
+                        'compression': policy.name, 'keep_original': keep_original,
+                        'nested': nested_extract, 'dedup': dedup_3, 'filter': filter_3.options(),
+                        'manifest': manifest_3 and manifest_3['option'], 'part_size': part_size_from_label(parts_3),
+                    }
+                    incremental = new_incremental('extract', manifest_3)
+                    # 압축파일은 안을 풀어 봐야 하므로 제외 조건만 확인
+                    pending = filter_3.select(index_3.entries, is_container=is_container)
+                    if incremental is not None:
+                        pending = incremental.pending(pending)
                     
-                    # 처음으로 버튼
-                    if st.button("🔄 처음으로", use_container_width=True, key="reset3"):
-                        st.rerun()
+                    # 중첩된 압축파일은 자원 한도 안에서 끝까지, 아니면 한 단계만 해제
+                    # (중첩된 압축파일 안의 양은 미리 알 수 없으므로 진행률은 업로드한 ZIP 기준)
+                    job_3 = start_job(
+                        'job_tab3', 'extract', engine.extract, uploaded_zip_3, options,
+                        part_size=part_size_from_label(parts_3),
+                        keep_original=keep_original,
+                        nested=nested_extract,
+                        policy=policy,
+                        index=index_3,
+                        dedup=Deduplicator() if dedup_3 else None,
+                        incremental=incremental,
+                        entry_filter=filter_3,
+                        sizes=[entry.size for entry in pending]
+                    )
             
             except Exception as e:
-                st.error(f"❌ 오류 발생: {str(e)}")
\ No newline at end of file
+                st.error(f"❌ 오류 발생: {str(e)}")
+    
+    if job_running(job_3):
+        show_job_progress('job_tab3', "압축해제")
+    elif job_3 is not None and not show_job_failure('job_tab3', job_3):
+        result = job_3.result
+        st.success(f"✅ 압축파일 해제 완료! ({result['archives']}개 압축파일 해제, {result['extracted']}개 파일 추출)")
+        
+        show_batch_report(result.get('batch'))
+        if result['failed']:
+            st.warning(f"⚠️ 해제하지 못한 압축파일 {len(result['failed'])}개: {', '.join(result['failed'][:5])}")
+        show_dedup_report(result.get('dedup'))
+        
+        # 다운로드 버튼
+        show_manifest('job_tab3', job_3.result, "압축해제")
+        show_download('job_tab3', job_3, "📥 처리된 파일 다운로드", "압축해제")
+        
+        # 결과 미리보기
+        with st.expander("📋 처리된 파일 목록"):
+            show_listing('job_tab3', result['listing'], "압축해제_목록")
+        
+        # 처음으로 버튼
+        st.button("🔄 처음으로", use_container_width=True, key="reset3", on_click=partial(forget_job, 'job_tab3'))
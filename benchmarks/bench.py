@@ -0,0 +1,167 @@
+"""모으기·이름 변경·압축 해제 성능 측정
+
+시나리오별 합성 ZIP(synth.py)으로 각 작업을 따로 실행하고
+걸린 시간, 처리량(MB/s, 파일/s), 최대 메모리(RSS)를 JSON으로 기록합니다.
+측정마다 새 프로세스에서 실행하므로 최대 메모리가 서로 섞이지 않습니다.
+처리량은 입력 ZIP에 기록된 원본 크기 기준이며, 압축 해제의 파일 수는
+중첩된 압축파일에서 풀려 나온 파일까지 포함합니다.
+
+    python benchmarks/bench.py -o result.json --scale 0.1
+    python benchmarks/bench.py -o result.json --scenario tiny --operation rename
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synth  # noqa: E402
+from webexcel import config, engine  # noqa: E402
+from webexcel.index import ArchiveIndex  # noqa: E402
+from webexcel.policy import DEFAULT_POLICY, POLICIES  # noqa: E402
+from webexcel.rename import SORT_OPTIONS  # noqa: E402
+
+OPERATIONS = ['collect', 'rename', 'extract']
+
+
+def peak_rss():
+    """지금까지의 최대 메모리 사용량 (바이트, 측정할 수 없으면 None)"""
+    # 리눅스는 exec 이전 부모 프로세스의 최대값을 이어받는 getrusage 대신 VmHWM 사용
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트 단위
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def reset_peak_rss():
+    """최대 메모리 기록을 현재 사용량으로 되돌림 (리눅스만 지원)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def measure(path, operation, variant, policy):
+    """작업 하나를 실행하고 측정값 반환 (자식 프로세스에서 호출)"""
+    index = ArchiveIndex.from_zip(zipfile.ZipFile(path))
+    input_bytes = sum(entry.size for entry in index.entries)
+    # 색인을 읽는 데 쓴 메모리를 빼고 작업 자체의 최대 메모리만 측정
+    reset_peak_rss()
+    baseline_rss = peak_rss()
+
+    with tempfile.TemporaryFile() as output_file, open(path, 'rb') as input_file:
+        started = time.perf_counter()
+        if operation == 'collect':
+            entries = len(engine.collect(input_file, output_file, policy=policy))
+        elif operation == 'rename':
+            entries = len(engine.rename(input_file, output_file, sort_by=variant, policy=policy))
+        else:
+            extractor = engine.extract(input_file, output_file, policy=policy)
+            entries = len(extractor.names)
+        wall = time.perf_counter() - started
+        output_bytes = output_file.seek(0, 2)
+
+    return {
+        'wall_s': round(wall, 4),
+        'input_bytes': input_bytes,
+        'output_bytes': output_bytes,
+        'entries': entries,
+        'mb_per_s': round(input_bytes / (1024 * 1024) / wall, 2) if wall else None,
+        'entries_per_s': round(entries / wall, 1) if wall else None,
+        'baseline_rss_mb': round(baseline_rss / (1024 * 1024), 1) if baseline_rss else None,
+        'peak_rss_mb': round(peak_rss() / (1024 * 1024), 1) if baseline_rss else None,
+    }
+
+
+def run_isolated(path, operation, variant, policy_name):
+    """새 프로세스에서 measure() 실행"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', path, operation, variant or '', policy_name],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout)
+
+
+def variants(operation):
+    # 이름 변경은 정렬 기준마다 따로 측정
+    return SORT_OPTIONS if operation == 'rename' else [None]
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        path, operation, variant, policy_name = sys.argv[2:6]
+        print(json.dumps(measure(path, operation, variant or None, POLICIES[policy_name])))
+        return
+
+    parser = argparse.ArgumentParser(description="webexcel 성능 측정")
+    parser.add_argument('-o', '--output', required=True, help="결과 JSON 경로")
+    parser.add_argument('--scenario', action='append', choices=list(synth.SCENARIOS), help="측정할 시나리오 (여러 번 지정 가능)")
+    parser.add_argument('--operation', action='append', choices=OPERATIONS, help="측정할 작업 (여러 번 지정 가능)")
+    parser.add_argument('--scale', type=float, default=1.0, help="합성 ZIP 파일 수·크기 배율")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help="같은 측정 반복 횟수")
+    parser.add_argument('--compression', choices=list(POLICIES), default=DEFAULT_POLICY.name)
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'webexcel-bench'), help="합성 ZIP 보관 폴더")
+    args = parser.parse_args()
+
+    results = []
+    for scenario in args.scenario or list(synth.SCENARIOS):
+        path = synth.ensure(scenario, args.workdir, args.scale, args.seed)
+        for operation in args.operation or OPERATIONS:
+            for variant in variants(operation):
+                for attempt in range(args.repeat):
+                    result = {'scenario': scenario, 'operation': operation, 'variant': variant, 'attempt': attempt}
+                    try:
+                        result.update(run_isolated(path, operation, variant, args.compression))
+                    except subprocess.CalledProcessError as e:
+                        result['error'] = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else str(e)
+                    results.append(result)
+                    print(
+                        f"{scenario:<11} {operation:<8} {variant or '':<12} "
+                        + (f"{result['wall_s']:>8.2f}s {result['mb_per_s'] or 0:>8.1f}MB/s "
+                           f"{result['entries_per_s'] or 0:>9.0f}개/s  RSS {result['peak_rss_mb']}MB"
+                           if 'error' not in result else f"오류: {result['error']}"),
+                        file=sys.stderr
+                    )
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scale': args.scale,
+            'seed': args.seed,
+            'compression': args.compression,
+            'config': {
+                'COMPRESS_WORKERS': config.COMPRESS_WORKERS,
+                'SPOOL_MAX_SIZE': config.SPOOL_MAX_SIZE,
+                'PARALLEL_MAX_MEMBER_SIZE': config.PARALLEL_MAX_MEMBER_SIZE,
+            },
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""벤치마크용 합성 압축파일 생성기
+
+같은 시드(seed)와 배율(scale)이면 항상 같은 내용의 ZIP을 만듭니다.
+
+    python benchmarks/synth.py tiny -o tiny.zip --scale 0.1
+"""
+import argparse
+import io
+import os
+import random
+import zipfile
+
+WORDS = (
+    "사진 문서 보고서 회의록 여행 가족 프로젝트 최종 수정본 백업 "
+    "alpha beta gamma delta report invoice draft final copy image data"
+).split()
+
+
+def _text(rng, size):
+    """압축이 잘 되는 텍스트 (단어를 무작위로 이어 붙임)"""
+    parts = []
+    total = 0
+    while total < size:
+        word = rng.choice(WORDS)
+        parts.append(word)
+        total += len(word.encode()) + 1
+    return ' '.join(parts).encode()[:size]
+
+
+def _random(rng, size):
+    """압축되지 않는 내용 (사진·영상과 비슷)"""
+    return rng.randbytes(size)
+
+
+def _count(n, scale):
+    return max(1, int(n * scale))
+
+
+def _write(zf, name, data, rng):
+    # 실제 업로드처럼 이미 압축된 형식은 그대로, 나머지는 압축해서 저장
+    compress_type = zipfile.ZIP_STORED if name.endswith(('.jpg', '.mp4', '.zip')) else zipfile.ZIP_DEFLATED
+    date_time = (2020 + rng.randrange(5), rng.randrange(1, 13), rng.randrange(1, 29), 12, 0, 0)
+    zinfo = zipfile.ZipInfo(name, date_time)
+    zinfo.compress_type = compress_type
+    zf.writestr(zinfo, data)
+
+
+def gen_tiny(zf, rng, scale):
+    """아주 작은 파일 여러 개"""
+    for i in range(_count(20000, scale)):
+        _write(zf, f"폴더{i // 500:03d}/메모{i:06d}.txt", _text(rng, rng.randrange(200, 2048)), rng)
+
+
+def gen_huge(zf, rng, scale):
+    """아주 큰 파일 몇 개 (텍스트와 무작위 내용 섞음)"""
+    size = _count(48 * 1024 * 1024, scale)
+    for i in range(4):
+        if i % 2:
+            data = _random(rng, size)
+            name = f"영상/video{i}.mp4"
+        else:
+            data = _text(rng, size)
+            name = f"로그/log{i}.txt"
+        _write(zf, name, data, rng)
+
+
+def gen_collisions(zf, rng, scale):
+    """여러 폴더에 같은 이름이 반복되는 파일"""
+    names = [f"IMG_{i:04d}.txt" for i in range(100)]
+    for folder in range(_count(100, scale)):
+        for name in names:
+            _write(zf, f"카메라{folder:03d}/{name}", _text(rng, 1024), rng)
+
+
+def _nested_zip(rng, depth, files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        for i in range(files):
+            _write(zf, f"단계{depth}/파일{i:04d}.txt", _text(rng, 4096), rng)
+        if depth > 1:
+            _write(zf, f"단계{depth}/안쪽.zip", _nested_zip(rng, depth - 1, files), rng)
+    return buf.getvalue()
+
+
+def gen_nested(zf, rng, scale):
+    """압축파일 안의 압축파일 (6단계)"""
+    files = _count(300, scale)
+    for i in range(4):
+        _write(zf, f"묶음{i}.zip", _nested_zip(rng, 6, files), rng)
+
+
+def gen_media(zf, rng, scale):
+    """압축되지 않는 사진·영상과 문서가 섞인 폴더"""
+    for i in range(_count(400, scale)):
+        kind = rng.random()
+        if kind < 0.5:
+            _write(zf, f"사진/IMG_{i:05d}.jpg", _random(rng, rng.randrange(100, 600) * 1024), rng)
+        elif kind < 0.6:
+            _write(zf, f"영상/MOV_{i:05d}.mp4", _random(rng, rng.randrange(1, 4) * 1024 * 1024), rng)
+        else:
+            _write(zf, f"문서/문서_{i:05d}.txt", _text(rng, rng.randrange(10, 200) * 1024), rng)
+
+
+SCENARIOS = {
+    'tiny': gen_tiny,
+    'huge': gen_huge,
+    'collisions': gen_collisions,
+    'nested': gen_nested,
+    'media': gen_media,
+}
+
+
+def generate(scenario, path, scale=1.0, seed=0):
+    """시나리오에 맞는 ZIP을 path에 생성"""
+    rng = random.Random(f"{scenario}:{seed}")
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        SCENARIOS[scenario](zf, rng, scale)
+    return path
+
+
+def ensure(scenario, workdir, scale=1.0, seed=0):
+    """같은 조건의 ZIP이 이미 있으면 재사용"""
+    path = os.path.join(workdir, f"{scenario}_x{scale:g}_s{seed}.zip")
+    if not os.path.exists(path):
+        os.makedirs(workdir, exist_ok=True)
+        generate(scenario, path + '.part', scale, seed)
+        os.replace(path + '.part', path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 ZIP 생성")
+    parser.add_argument('scenario', choices=list(SCENARIOS))
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--scale', type=float, default=1.0, help="파일 수·크기 배율")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate(args.scenario, args.output, args.scale, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import gzip
+import io
+
+from tests.zips import make_zip, read_zip
+from webexcel.batch import SeparateOutputs, run_batch
+
+
+def test_merge_allocates_names_across_inputs_and_removes_duplicates():
+    inputs = [make_zip({'x/a.txt': b'same', 'b.txt': b'1'}), make_zip({'a.txt': b'same', 'b.txt': b'2'})]
+    output = io.BytesIO()
+    batch = run_batch(inputs, output, 'collect', names=['A.zip', 'B.zip'], dedup=True)
+
+    assert read_zip(output) == {'a.txt': b'same', 'b.txt': b'1', 'b_1.txt': b'2'}
+    assert batch.removed == [('B.zip/a.txt', 'a.txt')]
+    assert batch.complete()
+
+
+def test_failed_input_is_reported_and_batch_is_incomplete():
+    bomb = make_zip({'z.gz': gzip.compress(bytes(4 * 1024 * 1024))})
+    output = io.BytesIO()
+    batch = run_batch([make_zip({'a.txt': b'a'}), bomb], output, 'extract', names=['A.zip', 'bomb.zip'])
+
+    assert read_zip(output) == {'a.txt': b'a'}
+    reports = batch.summary()['batch']
+    assert reports[0]['error'] is None
+    assert "압축률" in reports[1]['error']
+    assert not batch.complete()
+
+
+def test_separate_outputs_in_input_order():
+    outputs = SeparateOutputs()
+    run_batch([make_zip({'a.txt': b'a'}), make_zip({'b.txt': b'b'})], outputs, 'collect', merge=False,
+              names=['A.zip', 'B.zip'])
+
+    assert [part.name for part in outputs.parts] == ['A.zip', 'B.zip']
+    with outputs.parts[1].open() as f:
+        assert read_zip(f) == {'b.txt': b'b'}
@@ -0,0 +1,52 @@
+import threading
+
+from webexcel.board import BoardStore
+
+
+def test_posts_are_paged_newest_first(tmp_path):
+    store = BoardStore(str(tmp_path / 'board.db'))
+    ids = [store.add_post(f'이름{i}', f'{i}@example.com', f'의견 {i}') for i in range(5)]
+
+    assert store.count_posts() == 5
+    assert [post['id'] for post in store.posts(page=1, page_size=2)] == ids[::-1][:2]
+    assert [post['content'] for post in store.posts(page=3, page_size=2)] == ['의견 0']
+    assert set(store.posts()[0]) == {'id', 'name', 'email', 'content', 'date'}
+
+    store.delete_post(ids[-1])
+    assert store.count_posts() == 4
+    assert store.posts(page_size=1)[0]['id'] == ids[-2]
+
+
+def test_visits_are_batched_and_shared(tmp_path):
+    path = str(tmp_path / 'board.db')
+    store = BoardStore(path, flush_interval=3600)
+    for _ in range(3):
+        store.record_visit('2024-05-01')
+    store.record_visit('2024-05-02')
+
+    # 아직 기록하지 않은 방문도 세고, 다른 연결에는 기록한 뒤에 보임
+    assert store.visits('2024-05-01') == 3
+    other = BoardStore(path)
+    assert other.visits('2024-05-01') == 0
+    store.flush()
+    assert other.visits('2024-05-01') == 3
+    assert other.visits('2024-05-02') == 1
+
+    store.record_visit('2024-05-01')
+    store.flush()
+    assert other.visits('2024-05-01') == 4
+
+
+def test_concurrent_writers(tmp_path):
+    store = BoardStore(str(tmp_path / 'board.db'), flush_interval=0)
+
+    def visit():
+        for _ in range(50):
+            store.record_visit('2024-05-01')
+
+    threads = [threading.Thread(target=visit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.visits('2024-05-01') == 200
@@ -0,0 +1,134 @@
+import io
+import os
+
+from tests.zips import make_zip
+from webexcel import engine
+from webexcel.cache import IndexCache, ResultCache, content_hash
+from webexcel.parts import PartedOutput
+from webexcel.zipio import open_output
+
+
+class Sized:
+    """approx_size만 있는 색인 대용"""
+
+    def __init__(self, size):
+        self.size = size
+
+    def approx_size(self):
+        return self.size
+
+
+def test_content_hash_rewinds_and_ignores_position():
+    fileobj = io.BytesIO(b'same content')
+    fileobj.seek(5)
+    first = content_hash(fileobj)
+    assert fileobj.tell() == 0
+    assert first == content_hash(io.BytesIO(b'same content'))
+    assert first != content_hash(io.BytesIO(b'other content'))
+
+
+def test_same_key_is_built_once():
+    cache = IndexCache(100)
+    built = []
+
+    def build():
+        built.append(1)
+        return Sized(10)
+
+    first = cache.get_or_build('a', build)
+    assert cache.get_or_build('a', build) is first
+    assert len(built) == 1
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = IndexCache(100)
+    a = cache.get_or_build('a', lambda: Sized(40))
+    cache.get_or_build('b', lambda: Sized(40))
+    # a를 다시 사용했으므로 c가 들어오면 b가 빠짐
+    assert cache.get_or_build('a', lambda: Sized(40)) is a
+    cache.get_or_build('c', lambda: Sized(40))
+
+    assert cache.get_or_build('a', lambda: Sized(40)) is a
+    rebuilt = []
+    cache.get_or_build('b', lambda: rebuilt.append(1) or Sized(40))
+    assert rebuilt == [1]
+
+
+def test_newest_item_is_kept_even_if_too_big():
+    cache = IndexCache(100)
+    cache.get_or_build('small', lambda: Sized(10))
+    big = cache.get_or_build('big', lambda: Sized(500))
+
+    assert cache.get_or_build('big', lambda: Sized(500)) is big
+    rebuilt = []
+    cache.get_or_build('small', lambda: rebuilt.append(1) or Sized(10))
+    assert rebuilt == [1]
+
+
+def put(cache, key, data, summary=None):
+    spool = open_output()
+    spool.write(data)
+    cache.put(key, spool, summary or {'key': key})
+
+
+def test_result_key_ignores_option_order():
+    key = ResultCache.make_key('hash', 'collect', {'a': 1, 'b': [1, 2]})
+    assert key == ResultCache.make_key('hash', 'collect', {'b': [1, 2], 'a': 1})
+    assert key != ResultCache.make_key('hash', 'extract', {'a': 1, 'b': [1, 2]})
+    assert key != ResultCache.make_key('other', 'collect', {'a': 1, 'b': [1, 2]})
+    assert key != ResultCache.make_key('hash', 'collect', {'a': 2, 'b': [1, 2]})
+
+
+def test_result_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path), 1000)
+    assert cache.get('k') is None
+    put(cache, 'k', b'result', {'names': ['a.txt']})
+
+    zip_paths, summary = cache.get('k')
+    assert summary == {'names': ['a.txt']}
+    [zip_path] = zip_paths
+    with open(zip_path, 'rb') as f:
+        assert f.read() == b'result'
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.part')] == []
+
+
+def test_least_recently_used_result_is_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), 250)
+    put(cache, 'a', b'a' * 100)
+    put(cache, 'b', b'b' * 100)
+    # a가 더 오래되었지만 다시 사용했으므로 b가 먼저 빠짐
+    os.utime(cache.get('a')[0][0], (1000, 1000))
+    os.utime(cache.get('b')[0][0], (2000, 2000))
+    cache.get('a')
+    put(cache, 'c', b'c' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+
+def test_newest_result_is_kept_even_if_too_big(tmp_path):
+    cache = ResultCache(str(tmp_path), 50)
+    put(cache, 'small', b's' * 10)
+    put(cache, 'big', b'b' * 100)
+    assert cache.get('small') is None
+    assert cache.get('big') is not None
+
+
+def test_parted_result_is_kept_and_evicted_together(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), 10 ** 6)
+    files = {f'file{i}.bin': os.urandom(3000) for i in range(6)}
+    with PartedOutput(8000, path_for=lambda number: str(tmp_path / f'out_{number}.zip')) as output:
+        engine.collect(make_zip(files), output)
+    parts = [{'number': part.number, 'size': part.size} for part in output.parts]
+    cache.put('parted', output, {'parts': parts})
+
+    zip_paths, summary = cache.get('parted')
+    assert len(zip_paths) == len(parts) > 1
+    for part, path in zip(output.parts, zip_paths):
+        with open(part.path, 'rb') as original, open(path, 'rb') as cached:
+            assert original.read() == cached.read()
+
+    cache.max_size = 0
+    put(cache, 'next', b'n')
+    assert cache.get('parted') is None
+    assert sorted(os.listdir(tmp_path / 'cache')) == ['next.json', 'next.zip']
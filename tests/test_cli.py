@@ -0,0 +1,71 @@
+import os
+
+from tests.zips import make_zip, read_zip
+from webexcel import config
+from webexcel.__main__ import main
+
+
+def write_zip(path, files):
+    path.write_bytes(make_zip(files).getvalue())
+    return str(path)
+
+
+def read_result(path):
+    with open(path, 'rb') as f:
+        return read_zip(f)
+
+
+def test_collect_folder(tmp_path):
+    folder = tmp_path / '사진'
+    (folder / '여행').mkdir(parents=True)
+    (folder / 'a.txt').write_bytes(b'a')
+    (folder / '여행' / 'b.jpg').write_bytes(b'b')
+    output = str(tmp_path / 'result.zip')
+
+    assert main(['collect', str(folder), '-o', output]) == 0
+    assert read_result(output) == {'a.txt': b'a', 'b.jpg': b'b'}
+
+
+def test_rename_with_text_and_size_order(tmp_path):
+    source = write_zip(tmp_path / 'in.zip', {'x/small.jpg': b'1', 'big.jpg': b'22', 'c.txt': b'3'})
+    output = str(tmp_path / 'result.zip')
+
+    assert main(['rename', source, '-o', output, '--ext', '.JPG', '--sort', 'size-desc', '--text', '여행']) == 0
+    assert read_result(output) == {'여행_big.jpg': b'22', '여행_small.jpg': b'1'}
+
+
+def test_several_inputs_write_one_result_each(tmp_path):
+    first = write_zip(tmp_path / 'first.zip', {'a.txt': b'a'})
+    second = write_zip(tmp_path / 'second.zip', {'pack.zip': make_zip({'b.txt': b'b'}).getvalue()})
+    out = tmp_path / 'out'
+
+    assert main(['extract', first, second, '-o', str(out)]) == 0
+    assert sorted(os.listdir(out)) == ['first.zip', 'second.zip']
+    assert read_result(out / 'second.zip') == {'b.txt': b'b'}
+
+
+def test_failed_input_leaves_no_partial_result(tmp_path):
+    good = write_zip(tmp_path / 'good.zip', {'a.txt': b'a'})
+    bad = tmp_path / 'bad.zip'
+    bad.write_bytes(b'not a zip')
+    out = tmp_path / 'out'
+
+    assert main(['collect', good, str(bad), '-o', str(out)]) == 1
+    assert os.listdir(out) == ['good.zip']
+
+
+def test_inputs_with_the_same_name_get_numbered_results(tmp_path):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'c').mkdir()
+    inputs = [write_zip(tmp_path / 'a' / 'x.zip', {'a.txt': b'a'}), write_zip(tmp_path / 'b' / 'x.zip', {'b.txt': b'b'}),
+              write_zip(tmp_path / 'c' / 'X.zip', {'c.txt': b'c'})]
+    out = tmp_path / 'out'
+    workers = config.BATCH_WORKERS
+
+    assert main(['collect', *inputs, '-o', str(out), '--jobs', '2']) == 0
+    assert sorted(os.listdir(out)) == ['X-3.zip', 'x-2.zip', 'x.zip']
+    assert read_result(out / 'x.zip') == {'a.txt': b'a'}
+    assert read_result(out / 'x-2.zip') == {'b.txt': b'b'}
+    # --jobs는 서버 전체 설정을 바꾸지 않음
+    assert config.BATCH_WORKERS == workers
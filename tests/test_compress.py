@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+import io
+import time
+import zipfile
+
+import pytest
+
+from tests.zips import make_zip, read_zip
+from webexcel import compress
+from webexcel.compress import ParallelWriter
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """CPU 수와 무관하게 여러 스레드로 압축"""
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(compress, '_executor', executor)
+    yield executor
+    executor.shutdown()
+
+
+def slow_opener(data, delay, finished):
+    """delay초 뒤에 data를 읽게 하는 opener (끝난 순서를 finished에 기록)"""
+    def opener():
+        time.sleep(delay)
+        finished.append(data)
+        return io.BytesIO(data)
+    return opener
+
+
+def test_members_are_written_in_push_order(pool):
+    finished = []
+    output = io.BytesIO()
+    datas = [f'member {i} '.encode() * 100 for i in range(6)]
+    with zipfile.ZipFile(output, 'w') as dst, ParallelWriter(dst, workers=3) as writer:
+        # 앞 항목일수록 늦게 끝나도록
+        for i, data in enumerate(datas):
+            writer.write_from(zipfile.ZipInfo(f'{i}.txt'), slow_opener(data, 0.05 * (len(datas) - i), finished))
+
+    assert finished != datas
+    assert zipfile.ZipFile(output).namelist() == [f'{i}.txt' for i in range(6)]
+    assert read_zip(output) == {f'{i}.txt': data for i, data in enumerate(datas)}
+
+
+def test_copy_and_write_from_share_one_order():
+    src = zipfile.ZipFile(make_zip({'a.txt': b'a' * 1000, 'c.txt': b'c' * 1000}))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst, ParallelWriter(dst, workers=2) as writer:
+        writer.copy(src, src.getinfo('a.txt'), 'first.txt')
+        writer.write_from(zipfile.ZipInfo('second.txt'), slow_opener(b'b' * 1000, 0.1, []))
+        writer.copy(src, src.getinfo('c.txt'), 'third.txt')
+
+    assert zipfile.ZipFile(output).namelist() == ['first.txt', 'second.txt', 'third.txt']
+    assert read_zip(output)['second.txt'] == b'b' * 1000
+
+
+def test_window_bounds_pending_items():
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst, ParallelWriter(dst, workers=2) as writer:
+        for i in range(20):
+            writer.write_from(zipfile.ZipInfo(f'{i}.txt'), lambda: io.BytesIO(b'x' * 100))
+            assert len(writer._pending) <= writer.window
+
+    assert len(zipfile.ZipFile(output).namelist()) == 20
+
+
+def test_bytes_in_flight_are_bounded(pool):
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst, ParallelWriter(dst, workers=4) as writer:
+        writer.max_bytes = 1000
+        for i in range(10):
+            writer.write_fileobj(zipfile.ZipInfo(f'{i}.txt'), io.BytesIO(b'x' * 400), 400)
+            assert writer._pending_bytes <= writer.max_bytes
+        # 한도보다 큰 항목도 혼자서는 처리
+        writer.write_fileobj(zipfile.ZipInfo('big.txt'), io.BytesIO(b'y' * 5000), 5000)
+        assert len(writer._pending) == 1
+
+    assert len(zipfile.ZipFile(output).namelist()) == 11
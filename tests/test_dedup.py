@@ -0,0 +1,38 @@
+import io
+
+from tests.zips import make_zip, read_zip
+from webexcel import engine
+from webexcel.dedup import Deduplicator
+
+
+def test_collect_keeps_first_copy_and_reports_removed():
+    source = make_zip({'a/x.txt': b'same' * 10, 'b/y.txt': b'same' * 10, 'c.txt': b'other'})
+    output = io.BytesIO()
+    dedup = Deduplicator()
+    listing = engine.collect(source, output, dedup=dedup)
+
+    assert read_zip(output) == {'x.txt': b'same' * 10, 'c.txt': b'other'}
+    assert listing.name == ['x.txt', 'c.txt']
+    assert dedup.removed == [('b/y.txt', 'x.txt')]
+    assert dedup.removed_bytes == 40
+
+
+def test_same_size_different_content_is_kept():
+    source = make_zip({'a.txt': b'aaaa', 'b.txt': b'bbbb'})
+    output = io.BytesIO()
+    dedup = Deduplicator()
+    engine.collect(source, output, dedup=dedup)
+
+    assert set(read_zip(output)) == {'a.txt', 'b.txt'}
+    assert dedup.removed == []
+
+
+def test_extract_removes_duplicates_inside_nested_archives():
+    inner = make_zip({'copy.txt': b'payload' * 50}).getvalue()
+    source = make_zip({'orig.txt': b'payload' * 50, 'inner.zip': inner})
+    output = io.BytesIO()
+    dedup = Deduplicator()
+    engine.extract(source, output, dedup=dedup)
+
+    assert read_zip(output) == {'orig.txt': b'payload' * 50}
+    assert dedup.removed == [('copy.txt', 'orig.txt')]
@@ -0,0 +1,108 @@
+import bz2
+import errno
+import gzip
+import io
+import os
+import zipfile
+
+import pytest
+
+from tests.zips import make_zip, read_zip
+from webexcel.compress import ParallelWriter
+from webexcel.extract import Extractor
+
+
+class FullDisk(io.BytesIO):
+    """limit 바이트를 넘게 쓰면 디스크가 가득 찬 것처럼 OSError를 일으키는 출력"""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def write(self, data):
+        if self.tell() + len(data) > self.limit:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        return super().write(data)
+
+
+def extract(source, output=None, **kwargs):
+    """source ZIP을 풀어 (결과 내용, 작업기) 반환"""
+    output = output if output is not None else io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst, ParallelWriter(dst) as writer:
+        extractor = Extractor(writer, **kwargs)
+        extractor.run(zipfile.ZipFile(source))
+    return read_zip(output), extractor
+
+
+def test_nested_archives_are_extracted():
+    inner = make_zip({'in/a.txt': b'a'}).getvalue()
+    source = make_zip({'pack.zip': inner, 'b.txt.gz': gzip.compress(b'b'), 'c.txt.bz2': bz2.compress(b'c')})
+    output, extractor = extract(source)
+
+    assert output == {'a.txt': b'a', 'b.txt': b'b', 'c.txt': b'c'}
+    assert (extractor.archives, extractor.extracted, extractor.failed) == (3, 3, [])
+
+
+def test_same_names_from_different_archives_get_numbers():
+    inner = make_zip({'a.txt': b'inner'}).getvalue()
+    output, _ = extract(make_zip({'a.txt': b'top', 'pack.zip': inner}))
+    assert output == {'a.txt': b'top', 'a_1.txt': b'inner'}
+
+
+def test_depth_limit_and_keep_original():
+    deepest = make_zip({'deep.txt': b'deep'}).getvalue()
+    inner = make_zip({'deeper.zip': deepest, 'x.txt': b'x'}).getvalue()
+
+    output, _ = extract(make_zip({'pack.zip': inner}), max_depth=1)
+    assert output == {'deeper.zip': deepest, 'x.txt': b'x'}
+
+    output, _ = extract(make_zip({'pack.zip': inner}), keep_original=True)
+    assert output == {'pack.zip': inner, 'deeper.zip': deepest, 'deep.txt': b'deep', 'x.txt': b'x'}
+
+
+@pytest.mark.parametrize('name, data', [
+    ('bad.zip', b'PK\x03\x04 not really a zip'),
+    ('bad.gz', b'not gzip data'),
+    ('bad.bz2', b'BZh9 not bzip2 data'),
+    ('bad.bz2', bz2.compress(b'x' * 1000)[:-20]),
+])
+def test_corrupt_nested_archive_is_kept_as_is(name, data):
+    output, extractor = extract(make_zip({name: data, 'ok.txt': b'ok'}))
+
+    assert extractor.failed == [name]
+    assert output == {name: data, 'ok.txt': b'ok'}
+
+
+def test_write_error_inside_nested_archive_is_not_swallowed():
+    inner = make_zip({f'f{i}.bin': os.urandom(100000) for i in range(5)}).getvalue()
+    with pytest.raises(OSError) as raised:
+        extract(make_zip({'pack.zip': inner}), FullDisk(50000))
+    assert raised.value.errno == errno.ENOSPC
+
+
+def corrupt_zip(files, name):
+    """files를 압축하지 않고 저장한 뒤 name 항목의 내용 일부를 망가뜨린 ZIP 내용"""
+    data = bytearray(make_zip(files, zipfile.ZIP_STORED).getvalue())
+    with zipfile.ZipFile(io.BytesIO(bytes(data))) as zf:
+        info = zf.getinfo(name)
+    start = info.header_offset + 30 + len(info.filename.encode()) + len(info.extra)
+    data[start + 1000:start + 1010] = b'\xff' * 10
+    return bytes(data)
+
+
+def test_write_error_is_charged_to_its_own_archive():
+    texts = {f'in{i}.txt': f'inner {i} '.encode() * 1000 for i in range(3)}
+    broken = corrupt_zip({'bad.txt': b'bad ' * 50000, 'good.txt': b'good'}, 'bad.txt')
+    source = make_zip({'broken.zip': broken, 'pack.zip': make_zip(texts).getvalue()})
+    output, extractor = extract(source)
+
+    assert extractor.failed == ['broken.zip']
+    assert output == {'good.txt': b'good', **texts}
+    assert sorted(extractor.listing.name) == sorted(output)
+
+
+def test_corrupt_top_level_member_fails_the_job():
+    texts = {f'in{i}.txt': f'inner {i} '.encode() * 1000 for i in range(3)}
+    files = {'bad.txt': b'bad ' * 50000, 'pack.zip': make_zip(texts).getvalue()}
+    with pytest.raises(zipfile.BadZipFile):
+        extract(io.BytesIO(corrupt_zip(files, 'bad.txt')))
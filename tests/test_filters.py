@@ -0,0 +1,76 @@
+import datetime
+import io
+
+import pytest
+
+from tests.zips import make_zip, read_zip
+from webexcel import engine
+from webexcel.filters import EntryFilter, date_range, is_junk, normalize_extensions, parse_list
+
+
+@pytest.mark.parametrize('path, junk', [
+    ('__MACOSX/사진/._a.jpg', True),
+    ('사진/.DS_Store', True),
+    ('사진/Thumbs.db', True),
+    ('사진/._a.jpg', True),
+    ('사진/a.jpg', False),
+    ('MACOSX/a.jpg', False),
+])
+def test_is_junk(path, junk):
+    assert is_junk(path) is junk
+
+
+def test_parse_and_normalize():
+    assert parse_list("*.pdf, 보고서/*  *.hwp") == ['*.pdf', '보고서/*', '*.hwp']
+    assert normalize_extensions(['PDF', '.jpg', 'pdf', '.']) == ['.jpg', '.pdf']
+
+
+def test_globs_match_name_or_whole_path():
+    entry_filter = EntryFilter(include=['*.PDF', '보고서/*'], exclude=['*초안*'])
+
+    assert entry_filter.match('a/b/report.pdf')
+    assert entry_filter.match('보고서/표.xlsx')
+    assert not entry_filter.match('다른/보고서/표.xlsx')
+    assert not entry_filter.match('a/초안.pdf')
+    assert not entry_filter.match('a/memo.txt')
+
+
+def test_extensions_sizes_and_dates():
+    since, until = date_range(datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))
+    entry_filter = EntryFilter(extensions=['jpg'], min_size=10, max_size=100, since=since, until=until)
+    inside = since + 3600
+
+    assert entry_filter.match('a.JPG', 50, inside)
+    assert not entry_filter.match('a.png', 50, inside)
+    assert not entry_filter.match('a.jpg', 5, inside)
+    assert not entry_filter.match('a.jpg', 500, inside)
+    assert not entry_filter.match('a.jpg', 50, since - 1)
+    assert entry_filter.match('a.jpg', 50, until - 1)
+    assert not entry_filter.match('a.jpg', 50, until)
+    # 크기를 모르는 파일은 크기 조건을 통과
+    assert entry_filter.match('a.jpg', None, inside)
+
+
+def test_containers_only_check_junk_and_exclude():
+    entry_filter = EntryFilter(extensions=['pdf'], exclude=['old*'])
+    assert entry_filter.match('pack.zip', container=True)
+    assert not entry_filter.match('old.zip', container=True)
+    assert not entry_filter.match('__MACOSX/pack.zip', container=True)
+
+
+def test_operations_share_the_filter():
+    inner = make_zip({'in.pdf': b'1', 'in.txt': b'2'}).getvalue()
+    files = {'a.pdf': b'a', 'b.txt': b'b', '__MACOSX/._a.pdf': b'x', 'pack.zip': inner}
+    entry_filter = EntryFilter(extensions=['pdf'])
+
+    output = io.BytesIO()
+    engine.collect(make_zip(files), output, entry_filter=entry_filter)
+    assert read_zip(output) == {'a.pdf': b'a'}
+
+    output = io.BytesIO()
+    engine.extract(make_zip(files), output, entry_filter=entry_filter)
+    assert read_zip(output) == {'a.pdf': b'a', 'in.pdf': b'1'}
+
+    output = io.BytesIO()
+    engine.rename(make_zip(files), output, entry_filter=entry_filter)
+    assert read_zip(output) == {'0001_a.pdf': b'a'}
@@ -0,0 +1,54 @@
+import io
+import struct
+import zipfile
+
+from webexcel.index import ArchiveIndex, entry_mtime
+
+
+def timestamp_extra(mtime):
+    """확장 타임스탬프(0x5455) 추가 필드"""
+    return struct.pack('<HHBi', 0x5455, 5, 1, mtime)
+
+
+def build(entries):
+    """[(경로, DOS 날짜, 확장 타임스탬프 또는 None)]으로 만든 색인"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr(zipfile.ZipInfo('folder/', (2024, 1, 1, 0, 0, 0)), b'')
+        for path, date_time, mtime in entries:
+            info = zipfile.ZipInfo(path, date_time)
+            if mtime is not None:
+                info.extra = timestamp_extra(mtime)
+            zf.writestr(info, path.encode())
+    return ArchiveIndex.from_zip(zipfile.ZipFile(buffer))
+
+
+def test_extended_timestamp_wins_over_dos_date():
+    info = zipfile.ZipInfo('a.jpg', (1990, 1, 1, 0, 0, 0))
+    info.extra = timestamp_extra(1700000000)
+    assert entry_mtime(info) == 1700000000
+
+
+def test_date_order_mixes_both_kinds_of_time():
+    # 2023-11-14 확장 타임스탬프는 2020년과 2024년 DOS 날짜 사이
+    index = build([
+        ('b.jpg', (2024, 5, 1, 0, 0, 0), None),
+        ('a.JPG', (1990, 1, 1, 0, 0, 0), 1700000000),
+        ('c.png', (2020, 5, 1, 0, 0, 0), None),
+    ])
+
+    assert len(index) == 3
+    assert [entry.base for entry in index.order('mtime')] == ['c.png', 'a.JPG', 'b.jpg']
+    assert [entry.base for entry in index.order('mtime', reverse=True)] == ['b.jpg', 'a.JPG', 'c.png']
+
+
+def test_select_by_extension_keeps_order():
+    index = build([
+        ('x/b.jpg', (2024, 1, 1, 0, 0, 0), None),
+        ('a.JPG', (2024, 1, 1, 0, 0, 0), None),
+        ('c.png', (2024, 1, 1, 0, 0, 0), None),
+    ])
+
+    assert index.extensions == ['.jpg', '.png']
+    assert [entry.base for entry in index.select('.jpg', 'base')] == ['a.JPG', 'b.jpg']
+    assert [entry.size for entry in index.select(None, 'size', reverse=True)] == [7, 5, 5]
@@ -0,0 +1,174 @@
+import io
+import threading
+import time
+
+from webexcel import config, metrics
+from webexcel.jobs import CANCELLED, DONE, ENTRY_MEMORY, FAILED, QUEUED, RUNNING, Job, JobRunner, estimate_memory
+
+
+def wait(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.finished:
+        assert time.monotonic() < deadline, "작업이 끝나지 않음"
+        time.sleep(0.01)
+    return job
+
+
+def count(n, progress, **kwargs):
+    for _ in range(n):
+        progress.check()
+        progress.advance(bytes_in=10)
+    return n
+
+
+def blocked(gate, progress, **kwargs):
+    """gate가 열릴 때까지 취소 요청을 확인하며 기다림"""
+    while not gate.wait(0.01):
+        progress.check()
+    return 'done'
+
+
+def test_job_reports_progress_and_result():
+    runner = JobRunner(slots=1)
+    job = wait(runner.submit(Job('collect', total_entries=4, total_bytes=40), count, 4))
+
+    assert (job.status, job.result, job.entries_done, job.bytes_in) == (DONE, 4, 4, 40)
+    assert job.fraction() == 1.0
+    assert runner.get(job.id) is job
+
+
+def test_failed_job_keeps_error():
+    def broken(progress, **kwargs):
+        raise ValueError("잘못된 입력")
+
+    job = wait(JobRunner(slots=1).submit(Job('rename'), broken))
+    assert job.status == FAILED
+    assert str(job.error) == "잘못된 입력"
+
+
+def test_running_job_can_be_cancelled():
+    runner = JobRunner(slots=1)
+    job = runner.submit(Job('extract'), blocked, threading.Event())
+    job.cancel()
+
+    assert wait(job).status == CANCELLED
+    assert job.result is None
+
+
+def test_forget_cancels_and_drops_job():
+    runner = JobRunner(slots=1)
+    job = runner.submit(Job('extract'), blocked, threading.Event())
+    runner.forget(job.id)
+
+    assert runner.get(job.id) is None
+    assert wait(job).status == CANCELLED
+
+
+def test_finished_results_expire():
+    runner = JobRunner(slots=1, result_ttl=0)
+    old = wait(runner.submit(Job('collect'), count, 1))
+    time.sleep(0.01)
+    runner.submit(Job('collect'), count, 1)
+    assert runner.get(old.id) is None
+
+
+def wait_running(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while job.status != RUNNING:
+        assert time.monotonic() < deadline, "작업이 시작되지 않음"
+        time.sleep(0.01)
+
+
+def test_jobs_wait_for_a_free_slot_in_order():
+    runner = JobRunner(slots=1)
+    gate = threading.Event()
+    first = runner.submit(Job('collect'), blocked, gate)
+    second = runner.submit(Job('collect'), count, 1)
+    third = runner.submit(Job('collect'), count, 1)
+    wait_running(first)
+
+    assert (second.status, runner.position(second), runner.position(third)) == (QUEUED, 1, 2)
+    gate.set()
+    assert wait(second).status == DONE and wait(third).status == DONE
+    assert first.finished_at <= second.started_at and second.finished_at <= third.started_at
+
+
+def test_memory_budget_admits_first_in_first_out():
+    runner = JobRunner(slots=3, memory_budget=100)
+    gate = threading.Event()
+    big = runner.submit(Job('extract', memory=60), blocked, gate)
+    wait_running(big)
+    # 빈 슬롯이 있어도 메모리가 모자라면 기다리고, 뒤의 작은 작업도 앞지르지 않음
+    waiting = runner.submit(Job('extract', memory=60), count, 1)
+    small = runner.submit(Job('collect', memory=10), count, 1)
+    time.sleep(0.05)
+    assert (waiting.status, small.status) == (QUEUED, QUEUED)
+    assert runner.position(small) == 2
+
+    gate.set()
+    assert wait(waiting).status == DONE and wait(small).status == DONE
+
+
+def test_job_over_budget_runs_alone():
+    runner = JobRunner(slots=2, memory_budget=100)
+    job = wait(runner.submit(Job('extract', memory=500), count, 1))
+    assert job.status == DONE
+
+
+def test_cancel_removes_queued_job():
+    runner = JobRunner(slots=1)
+    gate = threading.Event()
+    first = runner.submit(Job('collect'), blocked, gate)
+    calls = []
+    queued = runner.submit(Job('collect'), lambda progress, **kwargs: calls.append(1))
+    runner.cancel(queued)
+
+    assert queued.status == CANCELLED and runner.position(queued) == 0
+    gate.set()
+    wait(first)
+    time.sleep(0.05)
+    assert calls == []
+
+
+def test_estimate_counts_in_flight_bytes_up_to_the_limit(monkeypatch):
+    monkeypatch.setattr(config, 'SPOOL_MAX_SIZE', 0)
+    monkeypatch.setattr(config, 'COMPRESS_WORKERS', 100)
+    monkeypatch.setattr(config, 'PARALLEL_MAX_MEMBER_SIZE', 100)
+    monkeypatch.setattr(config, 'PARALLEL_MAX_BYTES', 300)
+
+    assert estimate_memory('collect', [100], 1) == 2 * 100 + ENTRY_MEMORY
+    # 동시에 압축하는 항목은 출력마다 PARALLEL_MAX_BYTES까지만 잡음
+    assert estimate_memory('collect', [100] * 1000, 1) == 2 * 300 + 1000 * ENTRY_MEMORY
+    assert estimate_memory('collect', [100] * 1000, 2) == 2 * 600 + 1000 * ENTRY_MEMORY
+    # 중첩 압축파일 안의 항목은 크기를 모르므로 한도만큼
+    assert estimate_memory('extract', [100], 1) == 2 * 300 + ENTRY_MEMORY
+
+
+def test_forgotten_and_expired_results_are_closed():
+    runner = JobRunner(slots=1, result_ttl=0)
+    done = wait(runner.submit(Job('collect', info={'output_file': io.BytesIO()}), count, 1))
+    time.sleep(0.01)
+    # 다른 작업을 넣을 때 만료된 결과 정리
+    gate = threading.Event()
+    running = runner.submit(Job('collect', info={'output_file': io.BytesIO()}), blocked, gate)
+    assert done.info['output_file'].closed
+
+    wait_running(running)
+    runner.forget(running.id)
+    deadline = time.monotonic() + 5
+    while not running.info['output_file'].closed:
+        assert time.monotonic() < deadline, "끝난 작업의 결과가 닫히지 않음"
+        time.sleep(0.01)
+
+
+def test_cache_hit_is_not_a_finished_run(monkeypatch):
+    registry = metrics.MetricsRegistry()
+    monkeypatch.setattr(metrics, 'get_registry', lambda: registry)
+    runner = JobRunner(slots=1)
+    job = runner.add_done(Job('collect', info={'output_file': io.BytesIO(b'cached')}), {'listing': {}})
+    assert job.status == DONE
+    assert 'webexcel_cache_hits_total{operation="collect"} 1' in registry.render()
+    assert 'webexcel_job_duration_seconds_count' not in registry.render()
+
+    runner.forget(job.id)
+    assert job.info['output_file'].closed
@@ -0,0 +1,56 @@
+import gzip
+import io
+
+import pytest
+
+from tests.zips import make_zip, read_zip
+from webexcel import config, engine
+from webexcel.limits import LimitExceeded, ResourceGovernor
+
+
+def test_high_ratio_nested_member_aborts():
+    # 압축률이 매우 높은 gz (0으로 채운 4MB)
+    with pytest.raises(LimitExceeded, match="압축률"):
+        engine.extract(make_zip({'bomb.gz': gzip.compress(bytes(4 * 1024 * 1024))}), io.BytesIO())
+
+
+def test_nested_total_size_aborts(monkeypatch):
+    monkeypatch.setattr(config, 'EXTRACT_MAX_TOTAL_SIZE', 1024 * 1024)
+    inner = make_zip({f'zeros{i}.bin': bytes(600 * 1024) for i in range(2)}).getvalue()
+    with pytest.raises(LimitExceeded, match="전체 크기"):
+        engine.extract(make_zip({'bomb.zip': inner}), io.BytesIO())
+
+
+def test_top_level_members_are_copied_without_limits():
+    output = io.BytesIO()
+    engine.extract(make_zip({'zeros.bin': bytes(4 * 1024 * 1024)}), output)
+    assert read_zip(output) == {'zeros.bin': bytes(4 * 1024 * 1024)}
+
+
+def test_entry_count_limit():
+    governor = ResourceGovernor(max_entries=2)
+    governor.check_entry('a')
+    governor.check_entry('b')
+    with pytest.raises(LimitExceeded):
+        governor.check_entry('c')
+    # 한 번 넘으면 다른 스레드도 바로 중단
+    with pytest.raises(LimitExceeded):
+        governor.check()
+
+
+def test_declared_and_inflated_size_limits():
+    governor = ResourceGovernor(max_total_size=100)
+    with pytest.raises(LimitExceeded):
+        governor.check_entry('big', declared_size=101)
+
+    governor = ResourceGovernor(max_total_size=1000)
+    reader = governor.reader(io.BytesIO(b'x' * 200), 'lying', declared_size=10)
+    with pytest.raises(LimitExceeded, match="선언된 크기"):
+        reader.read()
+
+
+def test_depth_limit():
+    governor = ResourceGovernor(max_depth=2)
+    governor.check_depth('a.zip', 2)
+    with pytest.raises(LimitExceeded, match="깊이"):
+        governor.check_depth('b.zip', 3)
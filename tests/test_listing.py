@@ -0,0 +1,47 @@
+import io
+import zipfile
+
+from tests.zips import make_zip
+from webexcel import engine
+from webexcel.index import ArchiveIndex
+from webexcel.listing import Listing, plan_listing
+from webexcel.rename import ALL_FILES, plan_rename
+
+
+def test_columns():
+    listing = Listing()
+    listing.add('a/x.txt', 'x.txt', 3)
+    listing.add('y.gz', 'y', None, 'pack.zip')
+
+    assert len(listing) == 2
+    assert listing.as_dict() == {
+        'original': ['a/x.txt', 'y.gz'], 'name': ['x.txt', 'y'], 'size': [3, None], 'source': ['', 'pack.zip'],
+    }
+
+
+def test_collect_lists_original_paths():
+    listing = engine.collect(make_zip({'a/x.txt': b'1', 'b/x.txt': b'22'}), io.BytesIO())
+    assert listing.as_dict() == {
+        'original': ['a/x.txt', 'b/x.txt'], 'name': ['x.txt', 'x_1.txt'], 'size': [1, 2], 'source': ['', ''],
+    }
+
+
+def test_extract_lists_nested_archive_chain():
+    deep = make_zip({'d/deep.txt': b'deep'}).getvalue()
+    inner = make_zip({'in.txt': b'i', 'inner.zip': deep}).getvalue()
+    extractor = engine.extract(make_zip({'top.txt': b't', 'pack.zip': inner, 'x/top.txt': b'tt'}), io.BytesIO())
+
+    assert extractor.listing.as_dict() == {
+        'original': ['top.txt', 'in.txt', 'd/deep.txt', 'x/top.txt'],
+        'name': ['top.txt', 'in.txt', 'deep.txt', 'top_1.txt'],
+        'size': [1, 1, 4, 2],
+        'source': ['', 'pack.zip', 'pack.zip/inner.zip', ''],
+    }
+
+
+def test_rename_plan_listing():
+    index = ArchiveIndex.from_zip(zipfile.ZipFile(make_zip({'b/2.jpg': b'22', 'a/1.jpg': b'1'})))
+    listing = plan_listing(plan_rename(index, ALL_FILES, "이름순", "숫자 추가"))
+    assert listing.original == ['a/1.jpg', 'b/2.jpg']
+    assert listing.name == ['0001_1.jpg', '0002_2.jpg']
+    assert listing.size == [1, 2]
@@ -0,0 +1,124 @@
+import gzip
+import io
+import time
+import zipfile
+
+import pytest
+
+from tests.zips import read_zip
+from webexcel import engine
+from webexcel.filters import EntryFilter
+from webexcel.manifest import Incremental, Manifest, signature
+
+
+def make_source(files, date_time=(2024, 1, 1, 0, 0, 0)):
+    """수정 시각을 고정한 ZIP ({경로: 내용})"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for path, data in files.items():
+            zf.writestr(zipfile.ZipInfo(path, date_time), data)
+    buffer.seek(0)
+    return buffer
+
+
+def run(operation, files, previous=None, delta=False, **kwargs):
+    """작업을 실행하고 (결과 내용, 새 매니페스트, 증분 처리 요약) 반환"""
+    if previous is not None:
+        previous = Manifest.loads(previous.dumps())
+    incremental = Incremental(operation, previous, delta)
+    output = io.BytesIO()
+    getattr(engine, operation)(make_source(files), output, incremental=incremental, **kwargs)
+    return read_zip(output), incremental.manifest, incremental.summary()
+
+
+def test_full_run_keeps_previous_names():
+    _, first, _ = run('collect', {'a/x.txt': b'1', 'b/x.txt': b'2'})
+    # 새 파일이 먼저 와도 이전 파일명은 이전 항목이 그대로 씀
+    output, _, summary = run('collect', {'new/x.txt': b'0', 'a/x.txt': b'1', 'b/x.txt': b'2'}, first)
+
+    assert output['x.txt'] == b'1' and output['x_1.txt'] == b'2' and output['x_2.txt'] == b'0'
+    assert (summary['unchanged'], summary['changed'], summary['added']) == (2, 0, 1)
+
+
+def test_delta_writes_only_changed_and_added():
+    _, first, _ = run('collect', {'a.txt': b'1', 'b.txt': b'2', 'gone.txt': b'3'})
+    output, second, summary = run('collect', {'a.txt': b'1', 'b.txt': b'changed', 'c.txt': b'4'}, first, delta=True)
+
+    assert output == {'b.txt': b'changed', 'c.txt': b'4'}
+    assert summary['removed'] == ['gone.txt']
+    assert (summary['unchanged'], summary['changed'], summary['added']) == (1, 1, 1)
+    # 건너뛴 항목도 다음번 비교를 위해 매니페스트에 남음
+    assert set(second.sources) == {'a.txt', 'b.txt', 'c.txt'}
+    assert list(second.names()).count('a.txt') == 1
+
+
+def test_extract_delta_uses_inner_paths():
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, 'w') as zf:
+        zf.writestr(zipfile.ZipInfo('doc.txt', (2024, 1, 1, 0, 0, 0)), b'inner')
+    files = {'pack.zip': inner.getvalue(), 'doc.txt': b'top'}
+    _, first, _ = run('extract', files)
+    assert first.sources['pack.zip'][3] == {'doc.txt': 'doc.txt'}
+    assert first.sources['doc.txt'][3] == {'': 'doc_1.txt'}
+
+    output, _, summary = run('extract', dict(files, **{'doc.txt': b'top changed'}), first, delta=True)
+    assert summary['unchanged'] == 1
+    assert output == {'doc_1.txt': b'top changed'}
+
+
+def test_manifest_round_trip_and_operation_check():
+    _, manifest, _ = run('rename', {'a.jpg': b'1'})
+    restored = Manifest.loads(manifest.dumps())
+    assert restored.sources == {path: tuple(value) for path, value in manifest.sources.items()}
+    try:
+        Incremental('collect', restored)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("다른 작업의 매니페스트를 받아들임")
+
+
+@pytest.mark.parametrize('operation', ['collect', 'rename', 'extract'])
+def test_filtered_entries_are_not_removed(operation):
+    files = {'a/x.txt': b'1', 'b/x.txt.gz': gzip.compress(b'2', mtime=0), 'c/x.txt': b'3', 'd.bin': b'4'}
+    _, first, _ = run(operation, files)
+
+    # 거르기로 빠진 파일은 없어진 파일이 아니며 이전 기록이 그대로 남음
+    exclude = EntryFilter(exclude=['*.gz', '*.bin'])
+    changed = dict(files, **{'c/x.txt': b'changed'})
+    _, second, summary = run(operation, changed, first, delta=True, entry_filter=exclude)
+    assert summary['removed'] == []
+    assert (summary['unchanged'], summary['changed'], summary['added']) == (1, 1, 0)
+    assert second.sources['b/x.txt.gz'] == first.sources['b/x.txt.gz']
+    assert second.sources['d.bin'] == first.sources['d.bin']
+
+    # 거르기 없이 다시 처리해도 새 파일로 보지 않고 처음 이름을 그대로 씀
+    _, third, summary = run(operation, changed, second)
+    assert summary['added'] == 0 and summary['removed'] == []
+    assert {path: source[3] for path, source in third.sources.items()} == \
+        {path: source[3] for path, source in first.sources.items()}
+
+
+def test_filtered_files_inside_nested_archive_keep_names():
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, 'w') as zf:
+        for name in ('x.txt', 'y.log'):
+            zf.writestr(zipfile.ZipInfo(name, (2024, 1, 1, 0, 0, 0)), name.encode())
+    files = {'x.txt': b'top', 'pack.zip': inner.getvalue()}
+    _, first, _ = run('extract', files)
+
+    _, second, _ = run('extract', files, first, entry_filter=EntryFilter(exclude=['*.log']))
+    assert second.sources['pack.zip'][3] == first.sources['pack.zip'][3]
+
+
+def test_signature_does_not_depend_on_time_zone(monkeypatch):
+    info = zipfile.ZipInfo('a.txt', (2024, 1, 1, 0, 0, 0))
+    info.CRC = 0
+    signatures = []
+    for zone in ('UTC', 'Asia/Seoul', 'America/New_York'):
+        monkeypatch.setenv('TZ', zone)
+        time.tzset()
+        signatures.append(signature(info))
+    monkeypatch.undo()
+    time.tzset()
+    assert len(set(signatures)) == 1
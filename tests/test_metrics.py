@@ -0,0 +1,55 @@
+import io
+
+from tests.zips import make_zip
+from webexcel import engine
+from webexcel.metrics import MetricsRegistry, StageStats
+
+
+def test_stage_stats_add_up():
+    stats = StageStats()
+    stats.add('compress', 0.5, nbytes=100, entries=1)
+    with stats.stage('compress', nbytes=50, entries=2):
+        pass
+    values = stats.as_dict()['compress']
+
+    assert values['bytes'] == 150 and values['entries'] == 3
+    assert values['seconds'] >= 0.5
+
+
+def test_engine_fills_stages():
+    stats = StageStats()
+    engine.collect(make_zip({'a.txt': b'a' * 1000, 'b/c.txt': b'c'}), io.BytesIO(), stats=stats)
+    assert stats.as_dict()
+
+
+def test_render_histogram_and_stage_totals(tmp_path):
+    registry = MetricsRegistry()
+    stats = StageStats()
+    stats.add('write', 0.25, nbytes=1000, entries=4)
+    registry.observe_job('collect', 'done', 3.0, 0.5, stats)
+    registry.observe_job('collect', 'failed', 0.05, 0.0, StageStats())
+    text = registry.render()
+
+    assert 'webexcel_jobs_total{operation="collect",status="done"} 1' in text
+    assert 'webexcel_jobs_total{operation="collect",status="failed"} 1' in text
+    assert 'webexcel_job_duration_seconds_bucket{le="0.1",operation="collect"} 1' in text
+    assert 'webexcel_job_duration_seconds_bucket{le="5",operation="collect"} 2' in text
+    assert 'webexcel_job_duration_seconds_count{operation="collect"} 2' in text
+    assert 'webexcel_job_queue_wait_seconds_total{operation="collect"} 0.500000' in text
+    assert 'webexcel_stage_bytes_total{operation="collect",stage="write"} 1000' in text
+
+    path = str(tmp_path / 'webexcel.prom')
+    registry.write_file(path)
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == text
+
+
+def test_cache_hits_have_their_own_counter():
+    registry = MetricsRegistry()
+    registry.observe_cache_hit('collect')
+    registry.observe_cache_hit('collect')
+    text = registry.render()
+
+    assert 'webexcel_cache_hits_total{operation="collect"} 2' in text
+    assert 'webexcel_jobs_total{' not in text
+    assert 'webexcel_job_duration_seconds_count' not in text
@@ -0,0 +1,20 @@
+from webexcel.names import NameAllocator
+
+
+def test_same_name_gets_numbers():
+    names = NameAllocator()
+    assert [names.allocate('a.txt') for _ in range(3)] == ['a.txt', 'a_1.txt', 'a_2.txt']
+
+
+def test_skips_names_already_taken():
+    names = NameAllocator()
+    assert names.allocate('a_1.txt') == 'a_1.txt'
+    assert names.allocate('a.txt') == 'a.txt'
+    assert names.allocate('a.txt') == 'a_2.txt'
+
+
+def test_reserved_names_are_not_allocated():
+    names = NameAllocator()
+    names.reserve('photo.jpg')
+    assert names.allocate('photo.jpg') == 'photo_1.jpg'
+    assert 'photo.jpg' in names and len(names) == 2
@@ -0,0 +1,47 @@
+import os
+import zipfile
+
+from tests.zips import make_zip
+from webexcel import engine
+from webexcel.parts import PartedOutput, part_path
+
+
+def test_parts_are_valid_zips_within_size():
+    files = {f'dir{i}/file{i}.bin': os.urandom(3000) for i in range(20)}
+    with PartedOutput(10000) as output:
+        engine.collect(make_zip(files), output)
+
+    assert len(output.parts) > 1
+    names = []
+    for number, part in enumerate(output.parts, 1):
+        assert part.number == number
+        assert os.path.getsize(part.path) == part.size
+        with zipfile.ZipFile(part.path) as zf:
+            assert zf.testzip() is None
+            assert len(zf.infolist()) == part.entries
+            names += zf.namelist()
+        if part.entries > 1:
+            assert part.size <= 10000
+        with part.open() as f:
+            assert zipfile.ZipFile(f).namelist() == zf.namelist()
+    assert sorted(names) == sorted(path.rsplit('/', 1)[-1] for path in files)
+
+
+def test_oversized_member_gets_its_own_part():
+    files = {'small.txt': b'a', 'big.bin': os.urandom(5000), 'tail.txt': b'b'}
+    with PartedOutput(2000) as output:
+        engine.collect(make_zip(files), output)
+
+    assert [part.entries for part in output.parts] == [1, 1, 1]
+    assert output.parts[1].size > 2000
+
+
+def test_empty_result_still_has_one_part():
+    with PartedOutput(1000) as output:
+        engine.collect(make_zip({}), output)
+    assert len(output.parts) == 1
+    assert zipfile.ZipFile(output.parts[0].path).namelist() == []
+
+
+def test_part_path():
+    assert part_path('out/결과.zip', 2) == 'out/결과_002.zip'
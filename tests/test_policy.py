@@ -0,0 +1,48 @@
+import io
+import os
+import zipfile
+
+from tests.zips import read_zip
+from webexcel.compress import ParallelWriter
+from webexcel.policy import DEFAULT_POLICY, POLICIES, POLICY_OPTIONS, policy_from_label
+
+TEXT = b'hello world ' * 1000
+NOISE = os.urandom(100000)
+
+
+def test_presets():
+    fast, balanced, smallest = POLICIES['fast'], POLICIES['balanced'], POLICIES['smallest']
+    assert DEFAULT_POLICY is balanced
+    assert [policy_from_label(label) for label in POLICY_OPTIONS] == [balanced, fast, smallest]
+
+    # 이미 압축된 형식
+    assert fast.choose('.jpg', TEXT) == (zipfile.ZIP_STORED, None)
+    assert balanced.choose('.jpg', TEXT) == (zipfile.ZIP_STORED, None)
+    assert smallest.choose('.jpg', TEXT) == (zipfile.ZIP_DEFLATED, 9)
+    # 줄지 않는 내용은 표본을 보는 정책만 그대로 저장
+    assert fast.choose('.bin', NOISE) == (zipfile.ZIP_DEFLATED, 1)
+    assert balanced.choose('.bin', NOISE) == (zipfile.ZIP_STORED, None)
+    assert smallest.choose('.bin', NOISE) == (zipfile.ZIP_STORED, None)
+    assert balanced.choose('.txt', TEXT) == (zipfile.ZIP_DEFLATED, 6)
+
+
+def test_only_smallest_recompresses_fast_deflate():
+    info = zipfile.ZipInfo('a.txt')
+    info.flag_bits = 0b100
+    assert POLICIES['balanced'].keeps_deflated(info)
+    assert not POLICIES['smallest'].keeps_deflated(info)
+    info.flag_bits = 0
+    assert POLICIES['smallest'].keeps_deflated(info)
+
+
+def test_writer_applies_policy_per_entry():
+    output = io.BytesIO()
+    files = {'photo.jpg': TEXT, 'notes.txt': TEXT, 'noise.bin': NOISE}
+    with zipfile.ZipFile(output, 'w') as dst, ParallelWriter(dst, policy=POLICIES['balanced']) as writer:
+        for name, data in files.items():
+            writer.write_from(zipfile.ZipInfo(name), lambda data=data: io.BytesIO(data))
+
+    assert read_zip(output) == files
+    types = {info.filename: info.compress_type for info in zipfile.ZipFile(output).infolist()}
+    assert types == {'photo.jpg': zipfile.ZIP_STORED, 'notes.txt': zipfile.ZIP_DEFLATED,
+                     'noise.bin': zipfile.ZIP_STORED}
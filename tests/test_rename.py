@@ -0,0 +1,43 @@
+import io
+import zipfile
+
+from tests.zips import make_zip
+from webexcel.index import ArchiveIndex
+from webexcel.rename import ALL_FILES, plan_rename
+
+
+def index():
+    return ArchiveIndex.from_zip(zipfile.ZipFile(make_zip({'b/2.jpg': b'22', 'a/1.jpg': b'1', 'c.txt': b'333'})))
+
+
+def test_numbers_follow_name_order():
+    plan = plan_rename(index(), ALL_FILES, "이름순", "숫자 추가")
+
+    assert [(original, new_name) for _, original, new_name in plan] == [
+        ('1.jpg', '0001_1.jpg'), ('2.jpg', '0002_2.jpg'), ('c.txt', '0003_c.txt'),
+    ]
+    assert [info.filename for info, _, _ in plan] == ['a/1.jpg', 'b/2.jpg', 'c.txt']
+
+
+def test_extension_filter_and_size_order():
+    plan = plan_rename(index(), '.jpg', "크기순 (큰 순)", "특정 문자 추가", "여행")
+    assert [new_name for _, _, new_name in plan] == ['여행_2.jpg', '여행_1.jpg']
+
+
+def test_date_order():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr(zipfile.ZipInfo('new.jpg', (2024, 5, 1, 0, 0, 0)), b'1')
+        zf.writestr(zipfile.ZipInfo('old.jpg', (2020, 5, 1, 0, 0, 0)), b'2')
+    dated = ArchiveIndex.from_zip(zipfile.ZipFile(buffer))
+
+    plan = plan_rename(dated, ALL_FILES, "날짜순 (오래된 순)", "숫자 추가")
+    assert [new_name for _, _, new_name in plan] == ['0001_old.jpg', '0002_new.jpg']
+    plan = plan_rename(dated, ALL_FILES, "날짜순 (최신 순)", "숫자 추가")
+    assert [new_name for _, _, new_name in plan] == ['0001_new.jpg', '0002_old.jpg']
+
+
+def test_same_new_name_gets_numbers():
+    index = ArchiveIndex.from_zip(zipfile.ZipFile(make_zip({'a/x.jpg': b'1', 'b/x.jpg': b'2', 'x_1.jpg': b'3'})))
+    plan = plan_rename(index, ALL_FILES, "크기순 (작은 순)", "특정 문자 추가", "여행")
+    assert [new_name for _, _, new_name in plan] == ['여행_x.jpg', '여행_x_1.jpg', '여행_x_1_1.jpg']
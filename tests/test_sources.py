@@ -0,0 +1,112 @@
+import os
+import zipfile
+
+import pytest
+
+from tests.zips import make_zip
+from webexcel import config
+from webexcel.sources import ServerSource, display_name, list_sources, resolve_source
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """허용된 서버 폴더 (바로 옆에 허용되지 않은 폴더가 있음)"""
+    allowed = tmp_path / 'data'
+    (allowed / '부서' / '.숨김').mkdir(parents=True)
+    (allowed / '부서' / 'a.zip').write_bytes(make_zip({'a.txt': b'a'}).getvalue())
+    (allowed / '부서' / 'memo.txt').write_bytes(b'memo')
+    (allowed / '부서' / '.숨김' / 'b.zip').write_bytes(b'')
+    (tmp_path / 'data2').mkdir()
+    (tmp_path / 'data2' / 'secret.zip').write_bytes(make_zip({'secret.txt': b's'}).getvalue())
+    real = os.path.realpath(allowed)
+    monkeypatch.setattr(config, 'SOURCE_ROOTS', [real])
+    return real
+
+
+def test_path_inside_root_is_resolved(root):
+    assert resolve_source(os.path.join(root, '부서', 'a.zip')) == os.path.join(root, '부서', 'a.zip')
+    with pytest.raises(FileNotFoundError):
+        resolve_source(os.path.join(root, 'missing.zip'))
+
+
+@pytest.mark.parametrize('relative', [
+    os.path.join('..', 'data2', 'secret.zip'),
+    os.path.join('부서', '..', '..', 'data2', 'secret.zip'),
+])
+def test_parent_references_cannot_leave_root(root, relative):
+    with pytest.raises(PermissionError):
+        resolve_source(os.path.join(root, relative))
+
+
+def test_sibling_with_same_prefix_is_not_inside(root):
+    with pytest.raises(PermissionError):
+        resolve_source(root + '2')
+
+
+def test_symlink_pointing_outside_is_rejected(root):
+    os.symlink(os.path.join(root + '2', 'secret.zip'), os.path.join(root, 'link.zip'))
+    os.symlink(root + '2', os.path.join(root, 'linkdir'))
+    os.symlink(os.path.join(root, '부서', 'a.zip'), os.path.join(root, 'inside.zip'))
+
+    with pytest.raises(PermissionError):
+        resolve_source(os.path.join(root, 'link.zip'))
+    with pytest.raises(PermissionError):
+        resolve_source(os.path.join(root, 'linkdir', 'secret.zip'))
+    assert resolve_source(os.path.join(root, 'inside.zip')) == os.path.join(root, '부서', 'a.zip')
+
+
+def test_list_sources_and_display_name(root):
+    found = list_sources()
+    assert found == [os.path.join(root, '부서'), os.path.join(root, '부서', 'a.zip')]
+    assert list_sources(limit=1) == found[:1]
+    assert display_name(found[1]) == os.path.join('data', '부서', 'a.zip')
+
+
+def test_server_zip_key_follows_changes(root):
+    path = os.path.join(root, '부서', 'a.zip')
+    source = ServerSource(path)
+    key = source.cache_key()
+    with source.open() as f:
+        assert zipfile.ZipFile(f).read('a.txt') == b'a'
+
+    with open(path, 'wb') as f:
+        f.write(make_zip({'a.txt': b'changed'}).getvalue())
+    os.utime(path, ns=(1, 1))
+    assert ServerSource(path).cache_key() != key
+
+
+def test_folder_is_packed_once_for_every_session(root):
+    folder = os.path.join(root, '부서')
+    first = ServerSource(folder)
+    assert not first.ready()
+    with pytest.raises(FileNotFoundError):
+        first.open()
+
+    first.pack()
+    # 다른 세션이 같은 폴더를 고르면 다시 묶지 않고 같은 키로 재사용
+    second = ServerSource(folder)
+    assert second.ready() and second.cache_key() == first.cache_key()
+    with second.open() as f:
+        assert zipfile.ZipFile(f).namelist() == ['a.zip', 'memo.txt', '.숨김/b.zip']
+
+    path = os.path.join(folder, 'memo.txt')
+    with open(path, 'wb') as f:
+        f.write(b'changed memo')
+    changed = ServerSource(folder)
+    assert changed.cache_key() != first.cache_key() and not changed.ready()
+
+
+def test_folder_links_are_not_followed(root):
+    folder = os.path.join(root, '부서')
+    os.symlink(os.path.join(root + '2', 'secret.zip'), os.path.join(folder, 'link.zip'))
+    os.symlink(root + '2', os.path.join(folder, 'linkdir'))
+    source = ServerSource(folder)
+    source.pack()
+
+    with source.open() as f:
+        assert zipfile.ZipFile(f).namelist() == ['a.zip', 'memo.txt', '.숨김/b.zip']
+
+
+def test_folder_outside_root_is_rejected(root):
+    with pytest.raises(PermissionError):
+        ServerSource(os.path.join(root, '부서', '..', '..', 'data2'))
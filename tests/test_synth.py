@@ -0,0 +1,30 @@
+import os
+import zipfile
+
+import pytest
+
+from benchmarks import synth
+
+
+def listing(path):
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        return [(info.filename, info.date_time, info.CRC) for info in zf.infolist()]
+
+
+@pytest.mark.parametrize('scenario', sorted(synth.SCENARIOS))
+def test_same_seed_gives_same_archive(tmp_path, scenario):
+    first = listing(synth.generate(scenario, tmp_path / 'a.zip', scale=0.01))
+    second = listing(synth.generate(scenario, tmp_path / 'b.zip', scale=0.01))
+    other = listing(synth.generate(scenario, tmp_path / 'c.zip', scale=0.01, seed=1))
+
+    assert first and first == second
+    assert first != other
+
+
+def test_ensure_reuses_existing_file(tmp_path):
+    path = synth.ensure('collisions', tmp_path, scale=0.01)
+    mtime = os.stat(path).st_mtime_ns
+    assert synth.ensure('collisions', tmp_path, scale=0.01) == path
+    assert os.stat(path).st_mtime_ns == mtime
+    assert not list(tmp_path.glob('*.part'))
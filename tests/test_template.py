@@ -0,0 +1,80 @@
+import io
+import zipfile
+
+import pytest
+
+from webexcel.index import ArchiveIndex
+from webexcel.rename import ALL_FILES, plan_rename
+from webexcel.template import NameTemplate, literal_template
+
+
+def build(paths):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for path in paths:
+            zf.writestr(zipfile.ZipInfo(path, (2024, 3, 5, 12, 0, 0)), path.encode())
+    return ArchiveIndex.from_zip(zipfile.ZipFile(buffer))
+
+
+def test_fields_and_format_specs():
+    entries = build(['여행/IMG_1.JPG', '.hidden', 'a.tar.gz']).entries
+    template = NameTemplate('{date:%Y%m%d}_{n:03}_{parent}_{stem}{ext}_{size}')
+
+    assert template.apply(entries) == [
+        '20240305_001_여행_IMG_1.JPG_16',
+        '20240305_002__.hidden_7',
+        '20240305_003__a.tar.gz_8',
+    ]
+    assert NameTemplate('{n}-{name}').apply(entries[:1], start=7) == ['7-IMG_1.JPG']
+
+
+def test_regex_replace_with_groups():
+    entries = build(['IMG_0001.jpg', 'IMG_0002.jpg']).entries
+    template = NameTemplate('{name}', find=r'IMG_(\d+)', replace=r'photo-\1')
+    assert template.apply(entries) == ['photo-0001.jpg', 'photo-0002.jpg']
+
+
+@pytest.mark.parametrize('template, find, replace, message', [
+    ('{unknown}', None, '', "템플릿 오류"),
+    ('{name', None, '', "템플릿 오류"),
+    ('{name}', '(unclosed', '', "정규식 오류"),
+    ('{name}', 'a', r'\2', "정규식 오류"),
+    ('{name}', '(?P<x>a)', r'\g<y>', "정규식 오류"),
+])
+def test_invalid_template_or_regex(template, find, replace, message):
+    with pytest.raises(ValueError, match=message):
+        NameTemplate(template, find, replace)
+
+
+def test_format_errors_and_empty_names_are_reported():
+    entries = build(['a.txt']).entries
+    with pytest.raises(ValueError, match="템플릿 오류"):
+        NameTemplate('{stem:05d}').apply(entries)
+    with pytest.raises(ValueError, match="비어"):
+        NameTemplate('{name}', find='.*', replace='').apply(entries)
+
+
+@pytest.mark.parametrize('template, find, replace', [
+    ('사진/{name}', None, ''),
+    ('..', None, ''),
+    ('{name}', r'^', '../'),
+    ('{name}', r'\.txt$', r'\\x'),
+])
+def test_names_that_become_paths_are_rejected(template, find, replace):
+    entries = build(['a.txt']).entries
+    with pytest.raises(ValueError, match="폴더 경로"):
+        NameTemplate(template, find, replace).apply(entries)
+
+
+def test_literal_text_is_not_a_field():
+    entries = build(['a.txt']).entries
+    assert NameTemplate(literal_template('{n}') + '_{name}').apply(entries) == ['{n}_a.txt']
+
+
+def test_preview_matches_full_plan():
+    index = build([f'dir{i}/same.txt' for i in range(10)])
+    full = plan_rename(index, ALL_FILES, "이름순", "템플릿", "{stem}{ext}")
+    preview = plan_rename(index, ALL_FILES, "이름순", "템플릿", "{stem}{ext}", limit=4)
+
+    assert preview == full[:4]
+    assert [new_name for _, _, new_name in full][:3] == ['same.txt', 'same_1.txt', 'same_2.txt']
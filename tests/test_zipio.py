@@ -0,0 +1,106 @@
+import io
+import struct
+import zipfile
+
+from tests.zips import make_zip, read_zip
+from webexcel.index import entry_mtime
+from webexcel.zipio import copy_passthrough, open_output, open_reader
+
+
+class Unseekable(io.RawIOBase):
+    """앞으로만 쓸 수 있는 출력 (zipfile이 데이터 디스크립터를 쓰게 함)"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+def test_passthrough_keeps_data_and_crc():
+    src = zipfile.ZipFile(make_zip({'폴더/사진.jpg': b'jpeg' * 1000, 'a.txt': b'hello'}))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst:
+        for info in src.infolist():
+            copy_passthrough(src, info, dst, 'new_' + info.filename.rsplit('/', 1)[-1])
+
+    assert read_zip(output) == {'new_사진.jpg': b'jpeg' * 1000, 'new_a.txt': b'hello'}
+    copied = {info.filename: info for info in zipfile.ZipFile(output).infolist()}
+    originals = {info.filename.rsplit('/', 1)[-1]: info for info in src.infolist()}
+    for name, info in copied.items():
+        original = originals[name[len('new_'):]]
+        assert info.CRC == original.CRC
+        assert info.compress_type == original.compress_type
+        assert info.compress_size == original.compress_size
+
+
+def test_passthrough_utf8_name_flag():
+    src = zipfile.ZipFile(make_zip({'a.txt': b'x'}))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst:
+        copy_passthrough(src, src.infolist()[0], dst, '한글.txt')
+        copy_passthrough(src, src.infolist()[0], dst, 'ascii.txt')
+
+    infos = {info.filename: info for info in zipfile.ZipFile(output).infolist()}
+    assert infos['한글.txt'].flag_bits & 0x800
+    assert not infos['ascii.txt'].flag_bits & 0x800
+
+
+def test_passthrough_drops_data_descriptor():
+    stream = Unseekable()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as zf:
+        with zf.open('streamed.txt', 'w') as f:
+            f.write(b'streamed data' * 100)
+    src = zipfile.ZipFile(io.BytesIO(stream.buffer.getvalue()))
+    assert src.infolist()[0].flag_bits & 0x08
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst:
+        copy_passthrough(src, src.infolist()[0], dst, 'copied.txt')
+
+    assert read_zip(output) == {'copied.txt': b'streamed data' * 100}
+    assert not zipfile.ZipFile(output).infolist()[0].flag_bits & 0x08
+
+
+def test_passthrough_keeps_extra_fields_except_zip64():
+    # 확장 타임스탬프(0x5455)와 ZIP64(0x0001) 필드가 있는 항목
+    timestamp = struct.pack('<HHBi', 0x5455, 5, 1, 1700000000)
+    zip64 = struct.pack('<HHQ', 0x0001, 8, 5)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        info = zipfile.ZipInfo('a.txt', (2024, 1, 1, 0, 0, 0))
+        info.extra = zip64 + timestamp
+        zf.writestr(info, b'hello')
+    src = zipfile.ZipFile(buffer)
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w') as dst:
+        copy_passthrough(src, src.infolist()[0], dst, 'b.txt')
+
+    assert read_zip(output) == {'b.txt': b'hello'}
+    copied = zipfile.ZipFile(output).infolist()[0]
+    assert copied.extra == timestamp
+    assert entry_mtime(copied) == 1700000000
+
+
+def test_open_reader_rewinds_and_outlives_the_spool(tmp_path):
+    spool = open_output(max_size=10)
+    spool.write(b'in memory')
+    in_memory = open_reader(spool)
+    spool.write(b' and rolled to disk')
+    assert spool._rolled
+    rolled = open_reader(spool)
+    spool.close()
+    assert in_memory.read() == b'in memory'
+    assert rolled.read() == b'in memory and rolled to disk'
+
+    path = tmp_path / 'result.zip'
+    path.write_bytes(b'cached')
+    with open(path, 'rb') as f:
+        f.read()
+        reader = open_reader(f)
+    assert reader.read() == b'cached'
+    reader.close()
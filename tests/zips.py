@@ -0,0 +1,21 @@
+"""테스트용 ZIP 만들기"""
+import io
+import zipfile
+
+
+def make_zip(files, compression=zipfile.ZIP_DEFLATED):
+    """{경로: 내용}으로 ZIP을 만들어 처음부터 읽을 수 있는 파일 객체로 반환"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as zf:
+        for path, data in files.items():
+            zf.writestr(path, data)
+    buffer.seek(0)
+    return buffer
+
+
+def read_zip(fileobj):
+    """ZIP 전체를 {경로: 내용}으로 읽기 (CRC가 틀리면 zipfile이 BadZipFile을 일으킴)"""
+    fileobj.seek(0)
+    with zipfile.ZipFile(fileobj) as zf:
+        assert zf.testzip() is None
+        return {info.filename: zf.read(info) for info in zf.infolist()}
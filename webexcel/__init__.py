@@ -0,0 +1 @@
+"""컴퓨터 정리의 기본 - ZIP 처리 모듈"""
@@ -0,0 +1,373 @@
+"""명령줄 실행
+
+    python -m webexcel collect 입력.zip -o 결과.zip
+    python -m webexcel rename 사진폴더 -o 결과.zip --ext .jpg --sort date --text 여행
+    python -m webexcel rename 스캔.zip -o 결과.zip --sort date --template "{date:%Y%m%d}_{n:05}{ext}"
+    python -m webexcel extract a.zip b.zip c.zip -o 결과폴더/
+    python -m webexcel collect 주간폴더 -o 결과.zip --incremental --delta
+    python -m webexcel extract 덤프.zip -o 결과.zip --only-ext pdf --since 2024-01-01
+    python -m webexcel collect 사진.zip -o 결과.zip --part-size 500
+    python -m webexcel collect 1월.zip 2월.zip 3월.zip -o 1분기.zip --merge --dedup
+
+입력은 ZIP 파일이나 폴더이며, 여러 개를 주면 -o는 폴더가 되고
+입력마다 같은 이름의 결과 ZIP을 만듭니다 (--jobs개씩 동시에 처리).
+이름이 겹치는 입력(a/x.zip, b/x.zip)의 결과는 x.zip, x-2.zip처럼 번호를 붙입니다.
+--merge를 주면 여러 입력을 동시에 처리해 -o 결과 ZIP 하나에 겹치지 않는 이름으로 합칩니다.
+--manifest는 결과 ZIP 옆에 매니페스트(결과.zip.manifest.json)를 남기고,
+--incremental은 지난번 매니페스트와 비교해 이전 파일명을 이어 쓰며
+--delta를 함께 주면 바뀐 파일만 결과 ZIP에 넣습니다.
+--part-size를 주면 결과를 그 크기(MB)마다 따로 열 수 있는 조각(결과_001.zip, 결과_002.zip, ...)으로 나눕니다.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import cProfile
+import datetime
+import logging
+import os
+import sys
+import time
+
+from webexcel import config, engine, metrics
+from webexcel.batch import run_batch
+from webexcel.dedup import Deduplicator
+from webexcel.filters import EntryFilter, date_range, parse_list
+from webexcel.limits import LimitExceeded
+from webexcel.manifest import MANIFEST_SUFFIX, Incremental, Manifest
+from webexcel.parts import PartedOutput, part_path
+from webexcel.policy import DEFAULT_POLICY, POLICIES
+from webexcel.rename import ALL_FILES, NAMING_OPTIONS
+
+# 명령줄 정렬 이름 → 화면 정렬 기준
+SORT_NAMES = {
+    'name': "이름순",
+    'date': "날짜순 (오래된 순)",
+    'date-desc': "날짜순 (최신 순)",
+    'size': "크기순 (작은 순)",
+    'size-desc': "크기순 (큰 순)",
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m webexcel', description="컴퓨터 정리의 기본 - ZIP 처리")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name, help_text):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('inputs', nargs='+', help="ZIP 파일 또는 폴더")
+        command.add_argument('-o', '--output', required=True, help="결과 ZIP (입력이 여러 개면 결과 폴더)")
+        command.add_argument('--compression', choices=list(POLICIES), default=DEFAULT_POLICY.name, help="압축 방식")
+        command.add_argument('-v', '--verbose', action='store_true', help="입력마다 단계별 측정값을 JSON 로그로 출력")
+        command.add_argument('--profile', metavar='PATH', help="cProfile 결과를 저장할 파일")
+        command.add_argument('--manifest', action='store_true', help="결과 ZIP 옆에 매니페스트 저장")
+        command.add_argument('--incremental', action='store_true',
+                             help="지난번 매니페스트 기준으로 이전 파일명을 이어 씀 (매니페스트도 갱신)")
+        command.add_argument('--delta', action='store_true', help="--incremental과 함께: 바뀐 파일만 결과에 넣음")
+        command.add_argument('--include', action='append', default=[], metavar='GLOB',
+                             help="이 패턴에 맞는 파일만 (여러 번 사용 가능, 예: '*.pdf', '보고서/*')")
+        command.add_argument('--exclude', action='append', default=[], metavar='GLOB', help="이 패턴에 맞는 파일은 제외")
+        command.add_argument('--only-ext', default='', metavar='EXTS', help="이 확장자만 (쉼표로 구분, 예: pdf,jpg)")
+        command.add_argument('--min-size', type=float, metavar='MB', help="이보다 작은 파일 제외")
+        command.add_argument('--max-size', type=float, metavar='MB', help="이보다 큰 파일 제외")
+        command.add_argument('--since', type=datetime.date.fromisoformat, metavar='YYYY-MM-DD',
+                             help="이 날짜 이전에 수정된 파일 제외")
+        command.add_argument('--until', type=datetime.date.fromisoformat, metavar='YYYY-MM-DD',
+                             help="이 날짜 이후에 수정된 파일 제외")
+        command.add_argument('--keep-junk', action='store_true', help="__MACOSX/, .DS_Store, Thumbs.db도 처리")
+        command.add_argument('--part-size', type=float, metavar='MB',
+                             help="결과를 이 크기마다 따로 열 수 있는 ZIP 조각으로 나눔 (결과_001.zip, ...)")
+        command.add_argument('--merge', action='store_true',
+                             help="입력이 여러 개일 때 결과를 -o 결과 ZIP 하나로 합침 (파일명은 겹치지 않게)")
+        command.add_argument('-j', '--jobs', type=int, default=config.BATCH_WORKERS, metavar='N',
+                             help=f"입력 여러 개를 동시에 처리할 수 (기본 {config.BATCH_WORKERS})")
+        return command
+
+    collect = add_command('collect', "모든 파일 한 곳에 모으기")
+    collect.add_argument('--dedup', action='store_true', help="내용이 같은 중복 파일 제거")
+
+    rename = add_command('rename', "파일명 일괄 수정")
+    rename.add_argument('--ext', default=None, help="대상 확장자 (예: .jpg, 없으면 모든 파일)")
+    rename.add_argument('--sort', choices=list(SORT_NAMES), default='name', help="정렬 기준")
+    rename.add_argument('--text', default=None, help="앞에 붙일 문자 (없으면 번호)")
+    rename.add_argument('--template', default=None,
+                        help="파일명 템플릿 (예: {date:%%Y%%m%%d}_{n:05}{ext}, 항목: n name stem ext parent size date)")
+    rename.add_argument('--find', default=None, help="새 이름에서 찾을 정규식")
+    rename.add_argument('--replace', default='', help="찾은 부분을 바꿀 문자 (\\1 등 그룹 참조 가능)")
+
+    extract = add_command('extract', "압축파일 자동 해제")
+    extract.add_argument('--keep-original', action='store_true', help="원본 압축파일 보관")
+    extract.add_argument('--no-nested', action='store_true', help="중첩된 압축파일은 풀지 않음")
+    extract.add_argument('--dedup', action='store_true', help="내용이 같은 중복 파일 제거")
+    return parser
+
+
+def _naming_type(args):
+    if args.template:
+        return NAMING_OPTIONS[2]
+    return NAMING_OPTIONS[1] if args.text else NAMING_OPTIONS[0]
+
+
+def build_filter(args):
+    """거르기 옵션으로 EntryFilter 생성"""
+    since, until = date_range(args.since, args.until)
+    return EntryFilter(
+        include=args.include,
+        exclude=args.exclude,
+        extensions=parse_list(args.only_ext),
+        min_size=int(args.min_size * 1024 * 1024) if args.min_size is not None else None,
+        max_size=int(args.max_size * 1024 * 1024) if args.max_size is not None else None,
+        since=since,
+        until=until,
+        skip_junk=not args.keep_junk,
+    )
+
+
+def operation_options(args):
+    """명령줄 옵션에 해당하는 작업 인자 (중복 제거·매니페스트 제외)"""
+    options = {'policy': POLICIES[args.compression], 'entry_filter': build_filter(args)}
+    if args.command == 'rename':
+        options.update(
+            selected_ext=args.ext.lower() if args.ext else ALL_FILES,
+            sort_by=SORT_NAMES[args.sort],
+            naming_type=_naming_type(args),
+            custom_text=args.template or args.text,
+            find=args.find,
+            replace=args.replace,
+        )
+    elif args.command == 'extract':
+        options.update(keep_original=args.keep_original, nested=not args.no_nested)
+    return options
+
+
+def run_one(args, input_file, output_file, stats, incremental=None):
+    """입력 하나 처리 후 결과 요약 문구 반환"""
+    dedup = Deduplicator() if getattr(args, 'dedup', False) else None
+    options = operation_options(args)
+    if args.command == 'collect':
+        collected = engine.collect(input_file, output_file, stats=stats, dedup=dedup, incremental=incremental,
+                                   **options)
+        return f"{len(collected)}개 파일 수집" + _dedup_summary(dedup)
+    if args.command == 'rename':
+        plan = engine.rename(input_file, output_file, stats=stats, incremental=incremental, **options)
+        return f"{len(plan)}개 파일명 변경"
+    extractor = engine.extract(input_file, output_file, stats=stats, dedup=dedup, incremental=incremental,
+                               **options)
+    return _extract_summary(extractor.archives, extractor.extracted, extractor.failed) + _dedup_summary(dedup)
+
+
+def _extract_summary(archives, extracted, failed):
+    summary = f"{archives}개 압축파일 해제, {extracted}개 파일 추출"
+    if failed:
+        summary += f", 해제 실패 {len(failed)}개"
+    return summary
+
+
+def _dedup_summary(dedup):
+    if dedup is None:
+        return ""
+    return _removed_summary(dedup.removed, dedup.removed_bytes)
+
+
+def _removed_summary(removed, removed_bytes):
+    return f", 중복 {len(removed)}개 제거 ({removed_bytes / (1024 * 1024):,.1f}MB)"
+
+
+def _batch_summary(args, summary):
+    """합친 결과 요약 문구 (batch.Batch.summary()로)"""
+    if args.command == 'collect':
+        text = f"{len(summary['listing']['name'])}개 파일 수집"
+    elif args.command == 'rename':
+        text = f"{len(summary['listing']['name'])}개 파일명 변경"
+    else:
+        text = _extract_summary(summary['archives'], summary['extracted'], summary['failed'])
+    if 'dedup' in summary:
+        text += _removed_summary(summary['dedup']['removed'], summary['dedup']['removed_bytes'])
+    return text
+
+
+def _incremental_summary(incremental):
+    if incremental is None or incremental.previous is None:
+        return ""
+    summary = incremental.summary()
+    return (f" [변경 없음 {summary['unchanged']}개{'(건너뜀)' if summary['delta'] else ''}, "
+            f"변경 {summary['changed']}개, 추가 {summary['added']}개, 삭제 {len(summary['removed'])}개]")
+
+
+def load_incremental(args, manifest_path):
+    """매니페스트 옵션에 맞는 Incremental (옵션이 없으면 None)"""
+    if not (args.manifest or args.incremental):
+        return None
+    previous = None
+    if args.incremental and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = Manifest.loads(f.read())
+    return Incremental(args.command, previous, delta=args.delta)
+
+
+def output_paths(args):
+    """입력마다 결과 ZIP 경로 (여러 개면 결과 폴더 안에 입력 이름으로, 겹치는 이름은 x-2.zip처럼 번호를 붙임)"""
+    if len(args.inputs) == 1:
+        return [args.output]
+    paths = []
+    used = set()
+    for input_path in args.inputs:
+        stem = os.path.splitext(os.path.basename(os.path.normpath(input_path)))[0]
+        name = stem + '.zip'
+        number = 1
+        # 대소문자만 다른 이름도 같은 파일이 되는 파일 시스템이 있으므로 함께 비교
+        while name.lower() in used:
+            number += 1
+            name = f"{stem}-{number}.zip"
+        used.add(name.lower())
+        paths.append(os.path.join(args.output, name))
+    return paths
+
+
+def open_output(args, path):
+    """결과를 기록할 출력 (끝까지 기록하기 전에는 이름 뒤에 .part를 붙임)"""
+    if args.part_size is None:
+        return open(path + '.part', 'wb')
+    return PartedOutput(int(args.part_size * 1024 * 1024),
+                        path_for=lambda number: part_path(path, number) + '.part')
+
+
+def result_paths(args, path, output):
+    """결과 ZIP 경로 목록 (조각으로 나누었으면 기록한 조각마다)"""
+    if args.part_size is None:
+        return [path]
+    return [part_path(path, part.number) for part in output.parts]
+
+
+def publish_output(args, path, output):
+    """끝까지 기록된 결과만 최종 이름으로 옮김"""
+    for final_path in result_paths(args, path, output):
+        os.replace(final_path + '.part', final_path)
+
+
+def discard_output(args, path, output):
+    """최종 이름으로 옮기지 못한 (기록하다 만) 결과 삭제"""
+    if output is None:
+        return
+    for final_path in result_paths(args, path, output):
+        if os.path.exists(final_path + '.part'):
+            os.remove(final_path + '.part')
+
+
+def run_input(args, input_path, path):
+    """입력 하나를 처리해 결과 ZIP(path) 기록 (성공하면 True)"""
+    stats = metrics.StageStats()
+    status = 'failed'
+    started = time.perf_counter()
+    manifest_path = path + MANIFEST_SUFFIX
+    output = None
+    try:
+        incremental = load_incremental(args, manifest_path)
+        with engine.open_input(input_path) as input_file, open_output(args, path) as output:
+            summary = run_one(args, input_file, output, stats, incremental)
+        summary += _incremental_summary(incremental)
+        publish_output(args, path, output)
+        if args.part_size is not None:
+            summary += f" ({len(output.parts)}개 조각)"
+        if incremental is not None:
+            with open(manifest_path + '.part', 'w', encoding='utf-8') as f:
+                f.write(incremental.manifest.dumps())
+            os.replace(manifest_path + '.part', manifest_path)
+        status = 'done'
+    except LimitExceeded as e:
+        print(f"{input_path}: 처리 한도 초과로 중단 - {e}", file=sys.stderr)
+    except Exception as e:
+        print(f"{input_path}: 오류 - {e}", file=sys.stderr)
+    else:
+        print(f"{input_path} → {path}: {summary} ({time.perf_counter() - started:.1f}초)")
+    finally:
+        discard_output(args, path, output)
+        metrics.record_job(args.command, status, time.perf_counter() - started, 0.0, stats, input=input_path)
+    return status == 'done'
+
+
+def run_merged(args):
+    """모든 입력을 동시에 처리해 결과 ZIP 하나로 합치고 실패한 입력 수 반환"""
+    path = args.output
+    stats = metrics.StageStats()
+    status = 'failed'
+    started = time.perf_counter()
+    output = None
+    try:
+        with contextlib.ExitStack() as stack:
+            input_files = [stack.enter_context(engine.open_input(input_path)) for input_path in args.inputs]
+            with open_output(args, path) as output:
+                batch = run_batch(input_files, output, args.command, names=args.inputs, merge=True,
+                                  dedup=getattr(args, 'dedup', False), stats=stats, workers=args.jobs,
+                                  **operation_options(args))
+        publish_output(args, path, output)
+        status = 'done'
+    except LimitExceeded as e:
+        print(f"처리 한도 초과로 중단 - {e}", file=sys.stderr)
+        return len(args.inputs)
+    except Exception as e:
+        print(f"오류 - {e}", file=sys.stderr)
+        return len(args.inputs)
+    finally:
+        discard_output(args, path, output)
+        metrics.record_job(args.command, status, time.perf_counter() - started, 0.0, stats,
+                           input=list(args.inputs))
+
+    # 입력별 처리 결과와 걸린 시간
+    for item in batch.items:
+        if item.error is not None:
+            print(f"  {item.name}: 오류 - {item.error}", file=sys.stderr)
+        else:
+            print(f"  {item.name}: {item.report()['entries']}개 파일 ({item.seconds:.1f}초)")
+    summary = _batch_summary(args, batch.summary())
+    if args.part_size is not None:
+        summary += f" ({len(output.parts)}개 조각)"
+    failures = sum(1 for item in batch.items if item.error is not None)
+    print(f"{len(args.inputs) - failures}개 입력 → {path}: {summary} ({time.perf_counter() - started:.1f}초)")
+    return failures
+
+
+def run_all(args):
+    """모든 입력을 처리하고 실패한 입력 수 반환"""
+    if args.merge and len(args.inputs) > 1:
+        return run_merged(args)
+    paths = output_paths(args)
+    if args.jobs == 1 or len(args.inputs) == 1:
+        results = [run_input(args, input_path, path) for input_path, path in zip(args.inputs, paths)]
+    else:
+        # 명령줄은 프로세스 하나가 작업 하나이므로 --jobs개 스레드를 따로 만듦
+        with ThreadPoolExecutor(max_workers=args.jobs, thread_name_prefix='webexcel-batch') as executor:
+            results = list(executor.map(lambda input_path, path: run_input(args, input_path, path), args.inputs,
+                                        paths))
+    return results.count(False)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.delta and not args.incremental:
+        parser.error("--delta는 --incremental과 함께 사용해야 합니다")
+    if args.part_size is not None and args.part_size <= 0:
+        parser.error("--part-size는 0보다 커야 합니다")
+    if args.jobs < 1:
+        parser.error("--jobs는 1 이상이어야 합니다")
+    if args.merge and (args.manifest or args.incremental):
+        parser.error("--merge는 --manifest, --incremental과 함께 사용할 수 없습니다")
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if args.profile:
+        # cProfile은 실행한 스레드만 측정하므로 입력을 하나씩 처리
+        args.jobs = 1
+    if len(args.inputs) > 1 and not args.merge:
+        os.makedirs(args.output, exist_ok=True)
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        failures = profiler.runcall(run_all, args)
+        profiler.dump_stats(args.profile)
+    else:
+        failures = run_all(args)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""여러 압축파일 한 번에 처리
+
+입력 여러 개를 서버 전체에서 함께 쓰는 스레드 풀(BATCH_WORKERS)에서 동시에 처리합니다.
+입력마다 결과 ZIP을 따로 만들거나(SeparateOutputs), 입력마다 만든 중간 결과를
+압축 데이터 그대로 옮겨 담아 하나로 합칩니다. 합칠 때는 전체에서 겹치지 않는 파일명을
+붙이고, 중복 제거를 켜면 입력 사이의 중복 파일도 한 번만 남깁니다.
+입력 하나가 실패해도 (손상된 ZIP, 처리 한도 초과 등) 나머지는 계속 처리합니다.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import os
+import tempfile
+import threading
+import time
+import zipfile
+
+from webexcel import config, engine
+from webexcel.compress import ParallelWriter
+from webexcel.dedup import Deduplicator, zip_key
+from webexcel.index import ArchiveIndex
+from webexcel.listing import Listing
+from webexcel.names import NameAllocator
+from webexcel.parts import Part, open_result_zip
+from webexcel.rename import plan_rename_batch
+from webexcel.zipio import open_output
+
+OPERATIONS = {
+    'collect': engine.collect,
+    'rename': engine.rename,
+    'extract': engine.extract,
+}
+
+# 여러 입력의 이름 변경 계획을 한꺼번에 세울 때 넘기는 옵션
+_RENAME_PLAN_OPTIONS = ('selected_ext', 'sort_by', 'naming_type', 'custom_text', 'find', 'replace', 'entry_filter')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """서버 전체에서 공유하는 여러 입력 처리용 스레드 풀"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.BATCH_WORKERS,
+                thread_name_prefix='webexcel-batch'
+            )
+        return _executor
+
+
+def _source_label(name, source):
+    """합친 결과 목록의 원본 압축파일 열 (입력 이름, 입력 안의 압축파일이면 입력 이름/경로)"""
+    return f"{name}/{source}" if source else name
+
+
+class SeparateOutputs:
+    """입력마다 따로 만드는 결과 ZIP 묶음
+
+    입력 하나가 끝날 때마다 그 결과를 조각(Part)처럼 parts에 추가하므로
+    다른 입력을 처리하는 동안에도 끝난 결과를 바로 내려받을 수 있습니다.
+    결과는 path_for(입력 번호)가 돌려주는 경로에 기록하며, 없으면 임시 폴더에 기록합니다.
+    """
+
+    def __init__(self, path_for=None):
+        self.parts = []
+        if path_for is None:
+            # 이 객체가 사라지면 임시 폴더도 함께 지워짐
+            self._directory = tempfile.TemporaryDirectory(prefix='webexcel-batch-')
+            path_for = lambda number: os.path.join(self._directory.name, f'{number:03d}.zip')
+        self.path_for = path_for
+        self._lock = threading.Lock()
+
+    def write(self, number, name, run):
+        """run(파일 객체)로 number번째 입력의 결과를 기록해 parts에 추가하고 run의 반환값 반환"""
+        path = self.path_for(number)
+        with open(path, 'w+b') as f:
+            result = run(f)
+            size = f.tell()
+            f.seek(0)
+            entries = len(zipfile.ZipFile(f).filelist)
+        with self._lock:
+            self.parts.append(Part(number, path, size, entries, name=name))
+        return result
+
+    def sort(self):
+        """입력 순서대로 정렬 (끝난 순서로 쌓이므로)"""
+        with self._lock:
+            self.parts.sort(key=lambda part: part.number)
+
+
+class BatchItem:
+    """입력 하나의 처리 상태와 결과 요약"""
+
+    def __init__(self, number, name, input_file, options):
+        self.number = number
+        self.name = name
+        self.input_file = input_file
+        self.options = options
+        self.output = None
+        self.summary = None
+        self.error = None
+        self.seconds = 0.0
+
+    def report(self):
+        """입력별 보고 (입력 이름, 처리한 파일 수, 걸린 시간, 오류)"""
+        return {
+            'name': self.name,
+            'entries': len(self.summary['listing']['name']) if self.summary is not None else 0,
+            'seconds': round(self.seconds, 3),
+            'error': str(self.error) if self.error is not None else None,
+        }
+
+
+class Batch:
+    """여러 입력을 동시에 처리하는 작업기
+
+    merge가 True면 입력마다 임시 파일에 중간 결과를 만든 뒤 output_file 하나로 합치고,
+    아니면 output_file(SeparateOutputs)에 입력마다 결과를 따로 만듭니다.
+    dedup이 True면 입력마다 중복 파일을 제거하고, 합칠 때는 입력 사이의 중복도 제거합니다.
+    workers를 주면 공유 스레드 풀 대신 이 작업만의 스레드 workers개로 입력을 처리합니다.
+    """
+
+    def __init__(self, operation, merge=True, dedup=False, workers=None):
+        self.operation = operation
+        self.fn = OPERATIONS[operation]
+        self.merge = merge
+        self.dedup = dedup
+        self.workers = workers
+        self.items = []
+        self.listing = Listing()
+        self.removed = []
+        self.removed_bytes = 0
+        self.failed = []
+
+    def run(self, input_files, output_file, names=None, input_options=None, progress=None, stats=None,
+            **options):
+        """input_files를 모두 처리하고 자신을 반환
+
+        names는 입력 이름 목록, input_options는 입력마다 따로 넘길 옵션(색인, 이름 변경 계획 등)입니다.
+        입력이 없으면 ValueError, 모든 입력이 실패하면 첫 입력의 오류를 다시 일으킵니다.
+        """
+        if not input_files:
+            raise ValueError("처리할 입력이 없습니다")
+        names = names or [f"입력{number}" for number in range(1, len(input_files) + 1)]
+        input_options = input_options or [{} for _ in input_files]
+        self.items = [
+            BatchItem(number, name, input_file, dict(item_options))
+            for number, (input_file, name, item_options) in enumerate(zip(input_files, names, input_options), 1)
+        ]
+        if self.operation == 'rename' and self.merge and not any('plan' in item.options for item in self.items):
+            self._plan_renames(options)
+
+        with self._executor() as executor:
+            futures = [
+                executor.submit(self._run_item, item, output_file, progress, stats, options)
+                for item in self.items
+                if item.error is None
+            ]
+            for future in futures:
+                future.result()
+        # 취소되었으면 입력별 오류 대신 취소로 끝냄
+        if progress is not None:
+            progress.check()
+
+        done = [item for item in self.items if item.error is None]
+        if not done:
+            raise self.items[0].error
+        try:
+            if self.merge:
+                self._merge(done, output_file, progress, stats)
+            else:
+                output_file.sort()
+                self._collect_reports(done)
+        finally:
+            for item in self.items:
+                if item.output is not None:
+                    item.output.close()
+        return self
+
+    def _executor(self):
+        """입력을 처리할 스레드 풀 (with 문으로 사용, 공유 스레드 풀은 닫지 않음)"""
+        if self.workers is None:
+            return contextlib.nullcontext(get_executor())
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='webexcel-batch')
+
+    def _plan_renames(self, options):
+        """합칠 때는 번호와 이름이 전체에서 이어지도록 모든 입력을 한꺼번에 계획"""
+        indexed = []
+        for item in self.items:
+            index = item.options.get('index')
+            try:
+                if index is None:
+                    index = ArchiveIndex.from_zip(zipfile.ZipFile(item.input_file))
+            except Exception as e:
+                # 열 수 없는 입력은 그 입력만 실패로 기록
+                item.error = e
+                continue
+            indexed.append((item, index))
+        rows = plan_rename_batch([index for _, index in indexed],
+                                 **{key: options[key] for key in _RENAME_PLAN_OPTIONS if key in options})
+        for position, (item, _) in enumerate(indexed):
+            item.options['plan'] = [row[1:] for row in rows if row[0] == position]
+
+    def _run_item(self, item, output_file, progress, stats, options):
+        started = time.perf_counter()
+        dedup = Deduplicator() if self.dedup else None
+        kwargs = dict(options, **item.options)
+        if dedup is not None:
+            kwargs['dedup'] = dedup
+        run = lambda output: self.fn(item.input_file, output, progress=progress, stats=stats, **kwargs)
+        try:
+            if self.merge:
+                item.output = open_output()
+                result = run(item.output)
+            else:
+                result = output_file.write(item.number, item.name, run)
+            item.summary = engine.summarize(self.operation, result, dedup)
+        except Exception as e:
+            item.error = e
+        finally:
+            item.seconds = time.perf_counter() - started
+
+    def _merge(self, items, output_file, progress, stats):
+        """입력마다 만든 중간 결과를 압축 데이터 그대로 하나로 합침"""
+        names = NameAllocator()
+        dedup = Deduplicator() if self.dedup else None
+        # 입력 사이의 중복은 남긴 파일의 중간 결과를 다시 읽어 비교하므로 중간 결과는 끝까지 열어 둠
+        with open_result_zip(output_file) as output_zip, ParallelWriter(output_zip, stats=stats) as writer:
+            for item in items:
+                listing = item.summary['listing']
+                originals = dict(zip(listing['name'], listing['original']))
+                # 중간 결과 이름 → 합친 결과 이름 (입력 사이 중복으로 건너뛰면 남긴 파일 이름)
+                renamed = {}
+                written = set()
+                src = zipfile.ZipFile(item.output)
+                for info in src.infolist():
+                    if progress is not None:
+                        progress.check()
+                    if info.is_dir():
+                        continue
+                    key = zip_key(info)
+                    opener = lambda info=info, src=src: src.open(info)
+                    if dedup is not None:
+                        path = f"{item.name}/{originals.get(info.filename, info.filename)}"
+                        kept_name = dedup.find(key, opener, path)
+                        if kept_name is not None:
+                            renamed[info.filename] = kept_name
+                            continue
+                    final_name = names.allocate(info.filename)
+                    writer.copy_raw(src, info, final_name)
+                    renamed[info.filename] = final_name
+                    written.add(info.filename)
+                    if dedup is not None:
+                        dedup.add(key, final_name, opener)
+                self._add_report(item, renamed, written)
+        if dedup is not None:
+            self.removed.extend(dedup.removed)
+            self.removed_bytes += dedup.removed_bytes
+
+    def _collect_reports(self, items):
+        for item in items:
+            self._add_report(item)
+
+    def _add_report(self, item, renamed=None, written=None):
+        """입력 하나의 결과 목록·중복 제거·해제 실패를 전체 보고에 더함 (renamed: 합친 결과 이름)"""
+        listing = item.summary['listing']
+        for original, name, size, source in zip(listing['original'], listing['name'], listing['size'],
+                                                listing['source']):
+            if written is not None and name not in written:
+                continue
+            self.listing.add(original, renamed[name] if renamed is not None else name, size,
+                             _source_label(item.name, source))
+        dedup = item.summary.get('dedup')
+        if dedup is not None:
+            for path, kept_name in dedup['removed']:
+                if renamed is not None:
+                    kept_name = renamed.get(kept_name, kept_name)
+                self.removed.append((f"{item.name}/{path}", kept_name))
+            self.removed_bytes += dedup['removed_bytes']
+        self.failed.extend(f"{item.name}/{path}" for path in item.summary.get('failed', ()))
+
+    def complete(self):
+        """모든 입력을 오류 없이 처리했는지"""
+        return all(item.error is None for item in self.items)
+
+    def summary(self):
+        """작업 결과 요약 (engine.summarize와 같은 형태에 입력별 보고 'batch' 추가)"""
+        summary = {
+            'listing': self.listing.as_dict(),
+            'batch': [item.report() for item in self.items],
+        }
+        if self.operation == 'extract':
+            done = [item.summary for item in self.items if item.summary is not None]
+            summary['archives'] = sum(item['archives'] for item in done)
+            summary['extracted'] = sum(item['extracted'] for item in done)
+            summary['failed'] = self.failed
+        if self.dedup:
+            summary['dedup'] = {'removed': self.removed, 'removed_bytes': self.removed_bytes}
+        return summary
+
+
+def run_batch(input_files, output_file, operation, names=None, input_options=None, merge=True, dedup=False,
+              progress=None, stats=None, workers=None, **options):
+    """여러 입력을 동시에 처리하고 작업기(Batch) 반환 (결과 요약은 Batch.summary())
+
+    merge가 True면 output_file은 파일 객체나 PartedOutput, 아니면 SeparateOutputs입니다.
+    workers를 주면 공유 스레드 풀 대신 입력을 workers개씩 동시에 처리합니다.
+    나머지 options(policy, entry_filter, 이름 변경 옵션 등)는 모든 입력에 똑같이 넘깁니다.
+    """
+    return Batch(operation, merge=merge, dedup=dedup, workers=workers).run(
+        input_files, output_file, names=names, input_options=input_options, progress=progress, stats=stats,
+        **options
+    )
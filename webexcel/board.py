@@ -0,0 +1,116 @@
+"""의견게시판과 방문자 수 저장소
+
+세션이 끝나도 남고 모든 사용자가 함께 보도록 의견과 날짜별 방문자 수를
+SQLite 파일 하나에 저장합니다. WAL 모드를 써서 쓰는 중에도 읽기가 막히지 않고,
+방문 기록은 모아 두었다가 일정 시간마다 한 번에 기록합니다.
+"""
+import atexit
+import datetime
+import sqlite3
+import threading
+import time
+
+# 모아 둔 방문 기록을 데이터베이스에 기록하는 간격 (초)
+VISIT_FLUSH_INTERVAL = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS visits (
+    day TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+
+def today():
+    """방문자 수를 세는 날짜 (서버 지역 시간 기준, 예: '2024-05-01')"""
+    return datetime.date.today().isoformat()
+
+
+class BoardStore:
+    """의견과 방문자 수를 저장하는 SQLite 저장소
+
+    서버 전체에서 연결 하나를 함께 쓰고 (Streamlit 세션마다 스레드가 다르므로
+    잠금으로 한 번에 하나씩 사용), 방문 기록은 메모리에 모았다가
+    VISIT_FLUSH_INTERVAL마다 또는 서버가 끝날 때 한 번에 기록합니다.
+    """
+
+    def __init__(self, path, flush_interval=VISIT_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        self._pending_visits = {}
+        self._flushed_at = time.monotonic()
+        atexit.register(self.flush)
+
+    def record_visit(self, day=None):
+        """방문 한 번 기록 (모아 두었다가 한꺼번에 기록)"""
+        day = day or today()
+        with self._lock:
+            self._pending_visits[day] = self._pending_visits.get(day, 0) + 1
+            if time.monotonic() - self._flushed_at >= self.flush_interval:
+                self._flush_visits()
+
+    def visits(self, day=None):
+        """day의 방문자 수 (아직 기록하지 않은 방문 포함)"""
+        day = day or today()
+        with self._lock:
+            row = self._conn.execute("SELECT count FROM visits WHERE day = ?", (day,)).fetchone()
+            return (row['count'] if row else 0) + self._pending_visits.get(day, 0)
+
+    def flush(self):
+        """모아 둔 방문 기록을 지금 기록"""
+        with self._lock:
+            self._flush_visits()
+
+    def _flush_visits(self):
+        # 잠금을 잡은 상태에서 호출
+        if self._pending_visits:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO visits (day, count) VALUES (?, ?) "
+                    "ON CONFLICT(day) DO UPDATE SET count = count + excluded.count",
+                    list(self._pending_visits.items())
+                )
+            self._pending_visits.clear()
+        self._flushed_at = time.monotonic()
+
+    def add_post(self, name, email, content):
+        """의견 등록 후 의견 번호 반환"""
+        created_at = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO posts (name, email, content, created_at) VALUES (?, ?, ?, ?)",
+                (name, email, content, created_at)
+            )
+            return cursor.lastrowid
+
+    def delete_post(self, post_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+
+    def count_posts(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def posts(self, page=1, page_size=10):
+        """최신 의견부터 page번째 페이지(1부터)의 의견 목록 (해당 페이지만 읽음)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, email, content, created_at AS date FROM posts "
+                "ORDER BY id DESC LIMIT ? OFFSET ?",
+                (page_size, (page - 1) * page_size)
+            ).fetchall()
+        return [dict(row) for row in rows]
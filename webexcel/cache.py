@@ -0,0 +1,162 @@
+"""업로드 색인 캐시와 결과 캐시
+
+같은 내용의 업로드는 내용 해시가 같으므로, 한 번 만든 중앙 디렉터리
+색인을 여러 번의 재실행과 여러 탭에서 함께 사용합니다.
+같은 입력·작업·옵션의 결과 ZIP은 디스크에 보관해 다시 만들지 않습니다.
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from webexcel.zipio import CHUNK_SIZE, open_reader
+
+# 결과 ZIP 형식이 바뀌면 올려서 예전 결과를 쓰지 않도록 함
+RESULT_CACHE_VERSION = 2
+
+
+def content_hash(fileobj):
+    """파일 내용의 해시값 (읽은 뒤 위치는 처음으로 되돌림)"""
+    digest = hashlib.blake2b(digest_size=20)
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+class IndexCache:
+    """메모리 사용량 기준으로 오래된 항목부터 버리는 LRU 캐시"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """key에 해당하는 색인 반환 (없으면 build()로 만들어 저장)"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key][0]
+
+        index = build()
+        size = index.approx_size()
+
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = (index, size)
+                self._size += size
+                self._evict()
+        return index
+
+    def _evict(self):
+        # 가장 최근 항목 하나는 한도를 넘어도 유지
+        while self._size > self.max_size and len(self._items) > 1:
+            _, (_, size) = self._items.popitem(last=False)
+            self._size -= size
+
+
+class ResultCache:
+    """작업 결과 ZIP을 디스크에 보관하는 LRU 캐시
+
+    (입력 해시, 작업, 옵션)으로 키를 만들고, 결과 ZIP과 화면 표시에 필요한
+    요약(JSON)을 함께 저장합니다. 조각으로 나눈 결과는 요약의 'parts'에 조각 목록이 있고
+    조각마다 ZIP 하나로 저장합니다. 전체 크기가 max_size를 넘으면 가장 오래
+    사용하지 않은 결과부터 지웁니다 (사용할 때마다 수정 시각을 갱신).
+    여러 프로세스가 같은 폴더를 써도 되도록 파일은 모두 통째로 교체합니다.
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(input_key, operation, options):
+        """입력 해시·작업·옵션으로 캐시 키 생성 (옵션 순서와 무관)"""
+        text = json.dumps([RESULT_CACHE_VERSION, input_key, operation, options], sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(text.encode(), digest_size=20).hexdigest()
+
+    def _meta_path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _zip_paths(self, key, summary):
+        """결과 ZIP 경로 목록 (조각으로 나눈 결과는 조각마다 key.001.zip, key.002.zip, ...)"""
+        base = os.path.join(self.directory, key)
+        if 'parts' not in summary:
+            return [base + '.zip']
+        return [f'{base}.{number:03d}.zip' for number in range(1, len(summary['parts']) + 1)]
+
+    def get(self, key):
+        """(결과 ZIP 경로 목록, 요약) 반환 (없으면 None)"""
+        meta_path = self._meta_path(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                summary = json.load(f)
+            zip_paths = self._zip_paths(key, summary)
+            for path in zip_paths:
+                os.utime(path)
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        return zip_paths, summary
+
+    def put(self, key, output, summary):
+        """결과(임시 파일, 또는 PartedOutput·SeparateOutputs처럼 조각 목록이 있는 출력)와 요약을 보관
+
+        조각으로 나눈 결과는 요약의 'parts'에 조각마다 정보가 있어야 합니다.
+        """
+        meta_path = self._meta_path(key)
+        zip_paths = self._zip_paths(key, summary)
+        suffix = f'.{os.getpid()}.{threading.get_ident()}.part'
+        if 'parts' in summary:
+            # 봉인한 조각은 화면에서 내려받는 중일 수 있으므로 경로로 따로 열어 복사
+            for part, path in zip(output.parts, zip_paths, strict=True):
+                shutil.copyfile(part.path, path + suffix)
+        else:
+            with open_reader(output) as reader, open(zip_paths[0] + suffix, 'wb') as f:
+                shutil.copyfileobj(reader, f, CHUNK_SIZE)
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False)
+        # 요약이 있으면 ZIP도 있도록 ZIP을 먼저 교체
+        for path in zip_paths:
+            os.replace(path + suffix, path)
+        os.replace(meta_path + suffix, meta_path)
+        with self._lock:
+            self._evict(keep=key)
+
+    def _evict(self, keep):
+        # 결과 하나의 ZIP(조각)들을 키별로 묶어 가장 최근 사용 시각과 전체 크기로 비교
+        results = {}
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.zip'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                key = entry.name.split('.', 1)[0]
+                mtime, size, paths = results.get(key, (0.0, 0, []))
+                results[key] = (max(mtime, stat.st_mtime), size + stat.st_size, paths + [entry.path])
+                total += stat.st_size
+        # 방금 넣은 결과는 한도를 넘어도 유지
+        for key, (_, size, paths) in sorted(results.items(), key=lambda item: item[1][0]):
+            if total <= self.max_size:
+                break
+            if key == keep:
+                continue
+            # 요약을 먼저 지워 ZIP이 일부만 남은 결과를 쓰지 않도록 함
+            for old_path in [self._meta_path(key)] + paths:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+            total -= size
@@ -0,0 +1,50 @@
+"""모든 파일 한 곳에 모으기
+
+폴더 구조를 없애고 모든 파일을 출력 ZIP 맨 위에 모읍니다.
+"""
+import zipfile
+
+from webexcel.compress import ParallelWriter
+from webexcel.dedup import zip_key
+from webexcel.listing import Listing
+from webexcel.names import NameAllocator
+from webexcel.parts import open_result_zip
+
+
+def collect_zip(input_file, entries, output_file, policy=None, progress=None, stats=None, dedup=None,
+                incremental=None):
+    """색인 항목(entries)을 폴더 없이 output_file에 모으고 결과 목록(Listing) 반환
+
+    dedup(Deduplicator)이 있으면 내용이 같은 파일은 처음 것만 기록합니다.
+    incremental(Incremental)이 있으면 매니페스트를 만들고 이전 매니페스트 기준으로 증분 처리합니다.
+    """
+    input_zip = zipfile.ZipFile(input_file)
+    names = NameAllocator()
+    if incremental is not None:
+        incremental.reserve(names)
+    collected = Listing()
+    with open_result_zip(output_file) as output_zip, \
+            ParallelWriter(output_zip, policy=policy, progress=progress, stats=stats) as writer:
+        for entry in entries:
+            if incremental is not None and not incremental.include(entry.info):
+                continue
+            if dedup is not None:
+                key = zip_key(entry.info)
+                open_content = lambda info=entry.info: input_zip.open(info)
+                with writer.stats.stage('dedup', entries=1):
+                    if dedup.find(key, open_content, entry.info.filename) is not None:
+                        continue
+
+            # 파일명만 사용 (경로 제거, 중복이면 번호 추가)
+            with writer.stats.stage('names', entries=1):
+                if incremental is None:
+                    final_name = names.allocate(entry.base)
+                else:
+                    final_name = incremental.name(names, entry.info.filename, '', entry.base)
+
+            # 압축된 데이터 그대로 새 ZIP에 추가 (이름만 변경)
+            writer.copy(input_zip, entry.info, final_name)
+            collected.add(entry.info.filename, final_name, entry.size)
+            if dedup is not None:
+                dedup.add(key, final_name, open_content)
+    return collected
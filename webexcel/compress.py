@@ -0,0 +1,271 @@
+"""병렬 압축 기록기
+
+항목별 압축은 서로 독립적이므로 스레드 풀에서 동시에 압축하고
+(zlib은 압축 중 GIL을 놓아줌), 결과는 추가한 순서대로 출력 ZIP에 기록합니다.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import io
+import os
+import threading
+import time
+import zipfile
+import zlib
+
+from webexcel import config
+from webexcel.metrics import StageStats
+from webexcel.parts import PartedOutput
+from webexcel.policy import DEFAULT_POLICY, SAMPLE_SIZE
+from webexcel.zipio import CHUNK_SIZE, can_passthrough, clone_info, copy_passthrough, write_raw
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """서버 전체에서 공유하는 압축용 스레드 풀"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.COMPRESS_WORKERS,
+                thread_name_prefix='webexcel-compress'
+            )
+        return _executor
+
+
+def _ext(arcname):
+    return os.path.splitext(arcname)[1].lower()
+
+
+def _read_head(fileobj):
+    """압축 방식을 정할 앞부분 읽기"""
+    return fileobj.read(max(CHUNK_SIZE, SAMPLE_SIZE))
+
+
+def compress_stream(fileobj, policy, ext, head=None, stats=None):
+    """파일 내용을 읽어 정책대로 압축
+
+    (압축 방식, CRC, 원본 크기, 압축된 조각 목록)을 반환합니다.
+    stats가 있으면 읽기(압축 풀기 포함)와 압축에 걸린 시간을 따로 더합니다.
+    """
+    clock = time.perf_counter
+    read_time = 0.0
+    compress_time = 0.0
+    if head is None:
+        started = clock()
+        head = _read_head(fileobj)
+        read_time += clock() - started
+    compress_type, level = policy.choose(ext, head)
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    else:
+        compressor = None
+
+    crc = 0
+    size = 0
+    chunks = []
+    chunk = head
+    while chunk:
+        started = clock()
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        chunks.append(compressor.compress(chunk) if compressor else chunk)
+        read_started = clock()
+        compress_time += read_started - started
+        chunk = fileobj.read(CHUNK_SIZE)
+        read_time += clock() - read_started
+    if compressor:
+        started = clock()
+        chunks.append(compressor.flush())
+        compress_time += clock() - started
+    if stats is not None:
+        stats.add('read', read_time, size, 1)
+        stats.add('compress', compress_time, size, 1)
+    return compress_type, crc, size, chunks
+
+
+def _compress_opened(opener, policy, ext, stats=None):
+    with opener() as fileobj:
+        return compress_stream(fileobj, policy, ext, stats=stats)
+
+
+class ParallelWriter:
+    """여러 스레드로 압축하고 추가한 순서대로 기록하는 출력 ZIP 기록기
+
+    동시에 처리 중인 항목 수(window)와 그 원본 크기의 합(max_bytes), 병렬 압축할
+    항목 크기를 제한해 메모리 사용량이 압축파일 크기와 무관하게 유지됩니다.
+    항목마다 압축 정책(policy)에 따라 그대로 저장할지 압축할지 정합니다.
+    progress가 있으면 항목을 기록할 때마다 progress.advance(원본 크기, 압축 크기)를
+    호출하고, 항목을 추가할 때마다 progress.check()로 취소 여부를 확인합니다.
+    단계별 시간과 바이트 수는 stats(StageStats)에 더합니다.
+    항목을 추가할 때 done을 주면 그 항목을 실제로 기록한 뒤에 done()을 호출합니다.
+    dst에 PartedOutput을 주면 항목마다 크기 한도 안의 조각에 나누어 기록합니다.
+    """
+
+    def __init__(self, dst, workers=None, policy=None, progress=None, stats=None):
+        self.dst = dst
+        self.policy = policy or DEFAULT_POLICY
+        self.progress = progress
+        self.stats = stats if stats is not None else StageStats()
+        self.workers = workers or config.COMPRESS_WORKERS
+        self.window = self.workers * 2
+        self.max_bytes = config.PARALLEL_MAX_BYTES
+        self._pending = deque()
+        # 대기 중인 항목이 메모리에 들고 있는 원본 크기의 합
+        self._pending_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._discard()
+
+    def copy(self, src, info, arcname, opener=None, done=None):
+        """ZIP 멤버 복사 (가능하면 압축 데이터 그대로, 아니면 정책대로 다시 압축)
+
+        다시 압축할 때는 opener()가 있으면 그것으로 내용을 읽습니다.
+        그대로 복사했으면 True를 반환합니다.
+        """
+        if self._keeps(src, info):
+            self._push(lambda: self._copy_raw(src, info, arcname), done=done)
+            return True
+        zinfo = clone_info(info, arcname)
+        self.write_from(zinfo, opener or (lambda: src.open(info)), done)
+        return False
+
+    def copy_raw(self, src, info, arcname):
+        """이미 정책대로 기록한 ZIP 멤버를 압축 데이터 그대로 복사 (중간 결과 합치기용)"""
+        if not can_passthrough(info):
+            return self.copy(src, info, arcname)
+        self._push(lambda: self._copy_raw(src, info, arcname))
+        return True
+
+    def _keeps(self, src, info):
+        """원본 압축 데이터를 그대로 쓸지 결정"""
+        if not can_passthrough(info):
+            return False
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            return self.policy.keeps_deflated(info)
+        # 압축하지 않고 저장된 항목은 표본을 보고 압축할지 결정
+        ext = _ext(info.filename)
+        if self.policy.choose(ext)[0] == zipfile.ZIP_STORED:
+            return True
+        with src.open(info) as fileobj:
+            sample = fileobj.read(SAMPLE_SIZE)
+        return self.policy.choose(ext, sample)[0] == zipfile.ZIP_STORED
+
+    def write_from(self, zinfo, opener, done=None):
+        """opener()가 여는 파일 내용을 zinfo 이름으로 정책대로 압축해 추가
+
+        크기가 큰 항목은 메모리를 아끼기 위해 순서가 왔을 때 직접 압축합니다.
+        """
+        if zinfo.file_size > config.PARALLEL_MAX_MEMBER_SIZE:
+            self._push(lambda: self._write_stream(zinfo, opener), done=done)
+            return
+        self._reserve(zinfo.file_size)
+        future = get_executor().submit(_compress_opened, opener, self.policy, _ext(zinfo.filename), self.stats)
+        self._push(lambda: self._write_result(zinfo, self._wait(future)), future, zinfo.file_size, done)
+
+    def write_fileobj(self, zinfo, fileobj, size=None, done=None):
+        """열려 있는 파일 객체의 내용을 지금 바로 읽어 추가
+
+        tar처럼 앞에서부터 한 번만 읽을 수 있는 원본에 사용합니다.
+        작은 항목은 읽어 둔 뒤 병렬로 압축하고, 크거나 크기를 모르는 항목은
+        대기 중인 항목을 기록한 다음 바로 스트리밍으로 압축합니다.
+        """
+        if size is not None and size <= config.PARALLEL_MAX_MEMBER_SIZE:
+            # 읽기 전에 자리를 만들어 읽어 둔 내용도 한도 안에 둠
+            self._reserve(size)
+            with self.stats.stage('read'):
+                data = fileobj.read()
+            zinfo.file_size = len(data)
+            self.write_from(zinfo, lambda: io.BytesIO(data), done)
+            return
+        self.flush()
+        self._push(lambda: self._write_stream(zinfo, lambda: contextlib.nullcontext(fileobj), force_zip64=size is None),
+                   done=done)
+        self._finish_next()
+
+    def flush(self):
+        """대기 중인 항목을 모두 기록"""
+        while self._pending:
+            self._finish_next()
+
+    def _reserve(self, size):
+        """size 바이트를 더 읽어 둘 수 있을 때까지 앞 항목 기록"""
+        while self._pending and self._pending_bytes + size > self.max_bytes:
+            self._finish_next()
+
+    def _push(self, finish, future=None, size=0, done=None):
+        if self.progress is not None:
+            self.progress.check()
+        self._pending.append((finish, future, size, done))
+        self._pending_bytes += size
+        while len(self._pending) > self.window:
+            self._finish_next()
+
+    def _finish_next(self):
+        finish, _, size, done = self._pending.popleft()
+        self._pending_bytes -= size
+        zinfo = finish()
+        if done is not None:
+            done()
+        if self.progress is not None:
+            self.progress.advance(zinfo.file_size, zinfo.compress_size)
+
+    def _discard(self):
+        while self._pending:
+            _, future, _, _ = self._pending.popleft()
+            if future is not None:
+                future.cancel()
+        self._pending_bytes = 0
+
+    def _target(self, size, arcname):
+        """항목을 기록할 출력 ZIP (나누어 기록하면 항목이 들어갈 조각)"""
+        if isinstance(self.dst, PartedOutput):
+            return self.dst.zip_for(size, arcname)
+        return self.dst
+
+    def _wait(self, future):
+        # 기록할 차례인데 압축이 아직 끝나지 않아 기다린 시간
+        with self.stats.stage('wait'):
+            return future.result()
+
+    def _copy_raw(self, src, info, arcname):
+        with self.stats.stage('copy', info.compress_size, 1):
+            return copy_passthrough(src, info, self._target(info.compress_size, arcname), arcname)
+
+    def _write_stream(self, zinfo, opener, force_zip64=False):
+        clock = time.perf_counter
+        read_time = 0.0
+        started = clock()
+        with opener() as fsrc:
+            head = _read_head(fsrc)
+            read_time += clock() - started
+            zinfo.compress_type, level = self.policy.choose(_ext(zinfo.filename), head)
+            zinfo._compresslevel = level
+            dst = self._target(zinfo.file_size, zinfo.filename)
+            with dst.open(zinfo, 'w', force_zip64=force_zip64) as fdst:
+                chunk = head
+                while chunk:
+                    fdst.write(chunk)
+                    read_started = clock()
+                    chunk = fsrc.read(CHUNK_SIZE)
+                    read_time += clock() - read_started
+        # 압축과 기록은 zipfile 안에서 함께 일어나므로 하나로 셈
+        total = clock() - started
+        self.stats.add('read', read_time, zinfo.file_size, 1)
+        self.stats.add('compress', total - read_time, zinfo.file_size, 1)
+        return zinfo
+
+    def _write_result(self, zinfo, result):
+        zinfo.compress_type, zinfo.CRC, zinfo.file_size, chunks = result
+        zinfo.compress_size = sum(len(chunk) for chunk in chunks)
+        with self.stats.stage('write', zinfo.compress_size, 1):
+            write_raw(self._target(zinfo.compress_size, zinfo.filename), zinfo, chunks)
+        return zinfo
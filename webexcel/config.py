@@ -0,0 +1,88 @@
+"""설정값
+
+배포 환경에 맞게 환경 변수로 조정할 수 있습니다.
+"""
+import os
+import tempfile
+
+
+def _env_int(name, default):
+    """환경 변수를 정수로 읽기 (없거나 잘못되면 기본값)"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+# 결과 ZIP을 메모리에 둘 최대 크기 (넘으면 디스크 임시 파일로 전환)
+SPOOL_MAX_SIZE = _env_int("WEBEXCEL_SPOOL_MAX_MB", 64) * 1024 * 1024
+
+# 업로드별 ZIP 색인을 보관할 메모리 한도
+INDEX_CACHE_MAX_SIZE = _env_int("WEBEXCEL_INDEX_CACHE_MB", 256) * 1024 * 1024
+
+# 작업 결과 ZIP을 보관할 디스크 한도 (0이면 결과 캐시 사용 안 함)
+RESULT_CACHE_MAX_SIZE = _env_int("WEBEXCEL_RESULT_CACHE_MB", 2048) * 1024 * 1024
+
+# 작업 결과 ZIP을 보관할 폴더
+RESULT_CACHE_DIR = os.environ.get("WEBEXCEL_RESULT_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "webexcel-results")
+
+# 출력 ZIP 압축에 사용할 스레드 수
+COMPRESS_WORKERS = max(1, _env_int("WEBEXCEL_COMPRESS_WORKERS", os.cpu_count() or 1))
+
+# 병렬로 압축할 항목의 최대 크기 (더 큰 항목은 순서대로 직접 압축)
+PARALLEL_MAX_MEMBER_SIZE = _env_int("WEBEXCEL_PARALLEL_MAX_MEMBER_MB", 32) * 1024 * 1024
+
+# 출력 ZIP 하나에서 동시에 압축 중인 항목 원본 크기의 합계 한도 (항목 하나는 한도를 넘어도 처리)
+PARALLEL_MAX_BYTES = _env_int("WEBEXCEL_PARALLEL_MAX_MB", 128) * 1024 * 1024
+
+# 압축파일 안의 압축파일을 풀 최대 깊이 (업로드한 ZIP 안의 압축파일이 1단계)
+EXTRACT_MAX_DEPTH = max(1, _env_int("WEBEXCEL_EXTRACT_MAX_DEPTH", 8))
+
+# 압축 해제 작업 하나가 풀어낼 수 있는 전체 크기
+EXTRACT_MAX_TOTAL_SIZE = _env_int("WEBEXCEL_EXTRACT_MAX_MB", 4096) * 1024 * 1024
+
+# 압축 해제 작업 하나가 처리할 수 있는 파일 수
+EXTRACT_MAX_ENTRIES = _env_int("WEBEXCEL_EXTRACT_MAX_ENTRIES", 500000)
+
+# 항목 하나의 최대 압축률 (풀린 크기 / 압축된 크기)
+EXTRACT_MAX_RATIO = _env_int("WEBEXCEL_EXTRACT_MAX_RATIO", 200)
+
+# 여러 압축파일을 한 번에 처리할 때 동시에 처리할 입력 수 (서버 전체 합계)
+BATCH_WORKERS = max(1, _env_int("WEBEXCEL_BATCH_WORKERS", 4))
+
+# 동시에 실행할 백그라운드 작업 수 (넘는 작업은 대기열에서 기다림)
+JOB_WORKERS = max(1, _env_int("WEBEXCEL_JOB_WORKERS", 2))
+
+# 동시에 실행 중인 작업들이 쓸 수 있는 예상 메모리 합계
+JOB_MEMORY_BUDGET = _env_int("WEBEXCEL_JOB_MEMORY_MB", 1024) * 1024 * 1024
+
+# 끝난 작업 결과를 다운로드할 때까지 보관할 시간 (초)
+JOB_RESULT_TTL = _env_int("WEBEXCEL_JOB_RESULT_MINUTES", 60) * 60
+
+# Prometheus 지표를 내보낼 로컬 포트 (0이면 사용 안 함)
+METRICS_PORT = _env_int("WEBEXCEL_METRICS_PORT", 0)
+
+# 작업이 끝날 때마다 Prometheus 지표를 기록할 파일 (비어 있으면 사용 안 함)
+METRICS_FILE = os.environ.get("WEBEXCEL_METRICS_FILE", "")
+
+# 웹 화면에서 주소 뒤에 ?profile=1 을 붙여 작업을 프로파일(cProfile)로 측정할 수 있게 할지 (1이면 허용)
+PROFILE_ENABLED = _env_int("WEBEXCEL_PROFILE_ENABLED", 0) > 0
+
+# 프로파일(cProfile) 결과를 저장할 폴더
+PROFILE_DIR = os.environ.get("WEBEXCEL_PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "webexcel-profiles")
+
+# 업로드 대신 직접 처리할 수 있는 서버 폴더 목록 (os.pathsep로 구분, 비어 있으면 사용 안 함)
+SOURCE_ROOTS = [
+    os.path.realpath(path)
+    for path in os.environ.get("WEBEXCEL_SOURCE_DIRS", "").split(os.pathsep)
+    if path.strip()
+]
+
+# 서버 폴더에서 보여줄 최대 항목 수
+SOURCE_LIST_LIMIT = _env_int("WEBEXCEL_SOURCE_LIST_LIMIT", 1000)
+
+# 의견게시판과 방문자 수를 저장할 SQLite 파일
+BOARD_DB_PATH = os.environ.get("WEBEXCEL_BOARD_DB") or os.path.join(tempfile.gettempdir(), "webexcel-board.sqlite3")
@@ -0,0 +1,110 @@
+"""중복 파일 제거
+
+내용이 똑같은 파일은 처음 한 번만 기록하고 나머지는 건너뜁니다.
+ZIP 중앙 디렉터리에 이미 있는 CRC32와 크기가 같은 파일만 후보로 보고,
+후보끼리만 내용을 끝까지 읽어 강한 해시(blake2b)로 확인합니다.
+CRC를 미리 알 수 없는 tar·gz 안의 파일은 검사하지 않고 그대로 기록합니다.
+"""
+import hashlib
+import zipfile
+import zlib
+
+from webexcel.zipio import CHUNK_SIZE
+
+# 닫혔거나 손상된 원본을 읽을 때 나는 오류 (이때는 비교하지 않고 그대로 기록)
+_UNREADABLE_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, ValueError, OSError)
+
+
+def zip_key(info):
+    """ZIP 항목의 후보 비교용 (CRC32, 크기) (암호화된 항목은 비교하지 않으므로 None)"""
+    if info.flag_bits & 0x1:
+        return None
+    return (info.CRC, info.file_size)
+
+
+def _digest(opener):
+    """내용의 강한 해시 (읽을 수 없으면 None)"""
+    digest = hashlib.blake2b(digest_size=32)
+    try:
+        with opener() as fileobj:
+            while True:
+                chunk = fileobj.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+    except _UNREADABLE_ERRORS:
+        return None
+    return digest.digest()
+
+
+class _Payload:
+    """이미 기록한 내용 하나"""
+    __slots__ = ('arcname', 'opener', 'digest')
+
+    def __init__(self, arcname, opener, digest):
+        self.arcname = arcname
+        self.opener = opener
+        self.digest = digest
+
+    def get_digest(self):
+        if self.digest is None and self.opener is not None:
+            self.digest = _digest(self.opener)
+            # 해시를 구했거나 읽을 수 없었으면 원본은 더 필요 없음
+            self.opener = None
+        return self.digest
+
+
+class Deduplicator:
+    """내용이 같은 파일을 한 번만 기록하도록 걸러내는 검사기
+
+    find()로 이미 기록한 같은 내용이 있는지 확인하고, 없으면 기록한 뒤 add()로 알립니다.
+    중첩된 압축파일처럼 곧 닫히는 원본은 release()로 닫기 전에 해시를 계산해 둡니다.
+    """
+
+    def __init__(self):
+        self._seen = {}
+        self._by_source = {}
+        self._candidate = None
+        # (건너뛴 파일 경로, 남긴 파일명)
+        self.removed = []
+        self.removed_bytes = 0
+
+    def find(self, key, opener, path):
+        """같은 내용을 이미 기록했으면 그 파일명 반환 (건너뛴 것으로 기록), 아니면 None"""
+        self._candidate = None
+        if key is None or key not in self._seen:
+            return None
+        digest = None
+        for payload in self._seen[key]:
+            kept_digest = payload.get_digest()
+            if kept_digest is None:
+                continue
+            if digest is None:
+                digest = _digest(opener)
+                if digest is None:
+                    return None
+            if digest == kept_digest:
+                self.removed.append((path, payload.arcname))
+                self.removed_bytes += key[1]
+                return payload.arcname
+        # 다음 add()에서 다시 읽지 않도록 보관
+        self._candidate = (key, digest)
+        return None
+
+    def add(self, key, arcname, opener, source=None):
+        """key 내용을 arcname으로 기록했음을 알림 (source: 나중에 닫힐 원본)"""
+        if key is None:
+            return
+        digest = None
+        if self._candidate is not None and self._candidate[0] == key:
+            digest = self._candidate[1]
+        self._candidate = None
+        payload = _Payload(arcname, opener, digest)
+        self._seen.setdefault(key, []).append(payload)
+        if source is not None and digest is None:
+            self._by_source.setdefault(id(source), []).append(payload)
+
+    def release(self, source):
+        """source가 닫히기 전에 그 안에서 기록한 내용의 해시를 계산"""
+        for payload in self._by_source.pop(id(source), ()):
+            payload.get_digest()
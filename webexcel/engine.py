@@ -0,0 +1,125 @@
+"""화면 없이 쓰는 작업 엔진
+
+모으기·이름 변경·압축 해제를 파일 객체만으로 실행하는 API입니다.
+Streamlit 화면과 명령줄(python -m webexcel)이 모두 이 함수들을 사용합니다.
+입력은 ZIP 파일이나 폴더 경로(open_input), 출력은 쓰기 가능한 파일 객체이거나
+크기 한도마다 조각으로 나누어 기록하는 parts.PartedOutput입니다.
+세 작업 모두 incremental(manifest.Incremental)을 주면 매니페스트를 만들고,
+이전 매니페스트가 있으면 바뀐 항목만 처리하거나 이전 파일명을 이어 씁니다.
+entry_filter(filters.EntryFilter)를 주면 내용을 풀기 전에 조건에 맞는 파일만 고릅니다.
+여러 입력을 동시에 처리해 하나로 합치거나 입력마다 따로 만들 때는 batch.run_batch를 사용합니다.
+"""
+import os
+import zipfile
+
+from webexcel.collect import collect_zip
+from webexcel.extract import extract_zip
+from webexcel.index import ArchiveIndex
+from webexcel.listing import plan_listing
+from webexcel.metrics import StageStats
+from webexcel.rename import ALL_FILES, NAMING_OPTIONS, SORT_OPTIONS, plan_rename, rename_zip
+from webexcel.zipio import MappedFile, open_output
+
+
+def pack_directory(path, spool=None):
+    """폴더를 압축하지 않은 ZIP 임시 파일(spool)로 묶어 반환 (업로드한 ZIP처럼 사용)"""
+    if spool is None:
+        spool = open_output()
+    with zipfile.ZipFile(spool, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                zf.write(full_path, os.path.relpath(full_path, path).replace(os.sep, '/'))
+    spool.flush()
+    spool.seek(0)
+    return spool
+
+
+def open_input(path):
+    """ZIP 파일 또는 폴더 경로를 읽기용 파일 객체로 열기 (ZIP 파일은 mmap으로 읽음)"""
+    if os.path.isdir(path):
+        return pack_directory(path)
+    return MappedFile(path)
+
+
+def _index(input_file, index, stats):
+    if index is not None:
+        return index
+    with stats.stage('index'):
+        index = ArchiveIndex.from_zip(zipfile.ZipFile(input_file))
+    stats.add('index', entries=len(index))
+    return index
+
+
+def collect(input_file, output_file, policy=None, index=None, progress=None, stats=None, dedup=None,
+            incremental=None, entry_filter=None):
+    """모든 파일을 폴더 없이 한 곳에 모으고 결과 목록(Listing) 반환
+
+    dedup(Deduplicator)을 주면 내용이 같은 파일은 한 번만 기록하고 그 결과를 dedup에 남깁니다.
+    """
+    stats = stats if stats is not None else StageStats()
+    entries = _index(input_file, index, stats).entries
+    if entry_filter is not None:
+        selected = entry_filter.select(entries)
+        if incremental is not None:
+            incremental.skip_unselected(entries, selected)
+        entries = selected
+    return collect_zip(input_file, entries, output_file, policy, progress, stats, dedup, incremental)
+
+
+def rename(input_file, output_file, selected_ext=ALL_FILES, sort_by=SORT_OPTIONS[0],
+           naming_type=NAMING_OPTIONS[0], custom_text=None, find=None, replace='', policy=None, index=None,
+           plan=None, progress=None, stats=None, incremental=None, entry_filter=None):
+    """조건에 맞는 파일의 이름을 바꿔 기록하고 (원본 항목, 원래 이름, 새 이름) 목록 반환
+
+    naming_type이 템플릿이면 custom_text가 템플릿입니다 (예: "{date:%Y%m%d}_{n:05}{ext}").
+    find가 있으면 새 이름에서 정규식 find를 replace로 바꿉니다.
+    plan을 주면 (미리보기에 쓴 계획 등) 다시 계획하지 않고 그대로 실행합니다
+    (incremental을 함께 쓰려면 계획할 때 같은 incremental을 넘겨야 합니다).
+    """
+    stats = stats if stats is not None else StageStats()
+    if plan is None:
+        index = _index(input_file, index, stats)
+        with stats.stage('names'):
+            plan = plan_rename(index, selected_ext, sort_by, naming_type, custom_text, find, replace,
+                               incremental=incremental, entry_filter=entry_filter)
+        stats.add('names', entries=len(plan))
+    rename_zip(input_file, plan, output_file, policy, progress, stats)
+    return plan
+
+
+def extract(input_file, output_file, keep_original=False, nested=True, policy=None, index=None,
+            progress=None, stats=None, dedup=None, incremental=None, entry_filter=None):
+    """안의 압축파일을 풀어 모으고 작업기(Extractor) 반환
+
+    nested가 False면 업로드한 ZIP 바로 안의 압축파일만 해제합니다.
+    dedup(Deduplicator)을 주면 내용이 같은 파일은 한 번만 기록합니다.
+    """
+    stats = stats if stats is not None else StageStats()
+    infos = [entry.info for entry in _index(input_file, index, stats).entries]
+    return extract_zip(input_file, infos, output_file, keep_original=keep_original,
+                       max_depth=None if nested else 1, policy=policy, progress=progress, stats=stats,
+                       dedup=dedup, incremental=incremental, entry_filter=entry_filter)
+
+
+def summarize(operation, result, dedup=None, incremental=None):
+    """작업 결과 요약 (JSON으로 저장할 수 있는 형태, 결과 캐시와 화면 표시에 사용)"""
+    if operation == 'collect':
+        summary = {'listing': result.as_dict()}
+    elif operation == 'rename':
+        summary = {'listing': plan_listing(result).as_dict()}
+    else:
+        summary = {
+            'archives': result.archives,
+            'extracted': result.extracted,
+            'failed': list(result.failed),
+            'listing': result.listing.as_dict(),
+        }
+    if dedup is not None:
+        summary['dedup'] = {'removed': dedup.removed, 'removed_bytes': dedup.removed_bytes}
+    if incremental is not None:
+        summary['manifest'] = incremental.manifest.as_dict()
+        if incremental.previous is not None:
+            summary['incremental'] = incremental.summary()
+    return summary
@@ -0,0 +1,374 @@
+"""압축파일 자동 해제
+
+업로드한 ZIP 안의 압축파일(zip, tar, gz, bz2, xz)을 작업 스택으로
+원하는 깊이까지 풀어서 모든 파일을 출력 ZIP 한 곳에 모읍니다.
+압축파일은 임시 파일에 하나씩 풀어 읽고, 안의 파일은 순서대로 흘려 보냅니다.
+"""
+import bz2
+import gzip
+import lzma
+import os
+import tarfile
+import time
+from typing import Callable, NamedTuple, Optional
+import zipfile
+import zlib
+
+from webexcel.compress import ParallelWriter
+from webexcel.dedup import zip_key
+from webexcel.index import entry_mtime
+from webexcel.limits import ResourceGovernor
+from webexcel.listing import Listing
+from webexcel.names import NameAllocator
+from webexcel.parts import open_result_zip
+from webexcel.zipio import spool_stream
+
+# 이름 끝부분 → 압축파일 형식 (긴 것부터 확인)
+_SUFFIX_KINDS = [
+    ('.tar.gz', 'tar'), ('.tar.bz2', 'tar'), ('.tar.xz', 'tar'),
+    ('.tgz', 'tar'), ('.tbz2', 'tar'), ('.tbz', 'tar'), ('.txz', 'tar'),
+    ('.tar', 'tar'), ('.zip', 'zip'),
+    ('.gz', 'gz'), ('.bz2', 'bz2'), ('.xz', 'xz'),
+]
+
+
+
+class BadArchive(Exception):
+    """압축을 풀다가 손상이 발견됨 (bz2는 해제 오류를 OSError로 알리므로 쓰기 오류와 구분해 다시 알림)"""
+
+
+class _Bz2Reader:
+    """bz2 해제 오류를 BadArchive로 바꿔 알리는 파일 객체"""
+
+    def __init__(self, fileobj, mode='rb'):
+        self._fileobj = bz2.open(fileobj, mode)
+
+    def read(self, size=-1):
+        try:
+            return self._fileobj.read(size)
+        except OSError as e:
+            raise BadArchive(str(e)) from e
+
+    def close(self):
+        self._fileobj.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# 파일 하나만 압축하는 형식의 여는 함수
+_SINGLE_OPENERS = {
+    'gz': gzip.open,
+    'bz2': _Bz2Reader,
+    'xz': lzma.open,
+}
+
+# 손상되었거나 읽을 수 없는 압축파일을 읽다가 나는 오류
+# 디스크가 가득 차는 등 결과를 기록하다 나는 OSError는 작업 전체를 중단하도록 넣지 않음
+ARCHIVE_ERRORS = (zipfile.BadZipFile, tarfile.TarError, gzip.BadGzipFile, lzma.LZMAError, zlib.error, EOFError,
+                  BadArchive)
+
+
+def archive_kind(name):
+    """파일명으로 압축파일 형식 판별 (해제할 수 없으면 None)"""
+    lower = name.lower()
+    for suffix, kind in _SUFFIX_KINDS:
+        if lower.endswith(suffix) and len(lower) > len(suffix):
+            return kind
+    return None
+
+
+def _dos_date_time(timestamp):
+    """유닉스 시각을 ZIP에 기록할 수 있는 날짜로 변환"""
+    date_time = time.localtime(max(timestamp, 0))[:6]
+    if date_time[0] < 1980:
+        return (1980, 1, 1, 0, 0, 0)
+    return date_time
+
+
+def _new_info(arcname, date_time, size):
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.file_size = size or 0
+    return zinfo
+
+
+class Member(NamedTuple):
+    """압축파일 안의 파일 하나"""
+    # 압축파일 안의 경로
+    path: str
+    size: Optional[int]
+    date_time: tuple
+    # copy(새 이름, spool=None, done=None): 출력 ZIP에 기록 (spool이 있으면 그 내용을 사용, 기록한 뒤 done() 호출)
+    copy: Callable
+    # open(): 내용을 읽는 파일 객체
+    open: Callable
+    # 중복 검사용 (CRC32·크기, 내용을 여는 함수, 원본 ZIP) - ZIP 안의 파일만 있음
+    dedup: Optional[tuple] = None
+    # ZIP 안의 파일이면 그 항목 (증분 처리에서 업로드한 ZIP의 항목 비교에 사용)
+    info: Optional[zipfile.ZipInfo] = None
+
+    @property
+    def base(self):
+        """폴더를 뺀 파일명"""
+        return self.path.rsplit('/', 1)[-1]
+
+
+def _zip_members(zf, writer, governor, infos=None):
+    for info in (zf.infolist() if infos is None else infos):
+        if info.is_dir():
+            continue
+
+        def open_member(info=info):
+            return governor.reader(zf.open(info), info.filename, info.file_size, info.compress_size)
+
+        yield Member(
+            info.filename,
+            info.file_size,
+            info.date_time,
+            lambda arcname, spool=None, done=None, info=info, open_member=open_member:
+                writer.copy(zf, info, arcname, open_member, done),
+            open_member,
+            (zip_key(info), lambda info=info: zf.open(info), zf),
+            info,
+        )
+
+
+def _tar_members(tar, writer, governor, compressed_size):
+    # 스트림 모드이므로 각 항목은 다음 항목으로 넘어가기 전에 처리해야 함
+    # 항목별 압축 크기를 알 수 없으므로 압축률은 tar 파일 전체 크기 기준으로 검사
+    for tarinfo in tar:
+        if not tarinfo.isfile():
+            continue
+        date_time = _dos_date_time(tarinfo.mtime)
+
+        def open_member(tarinfo=tarinfo):
+            return governor.reader(tar.extractfile(tarinfo), tarinfo.name, tarinfo.size, compressed_size)
+
+        def copy(arcname, spool=None, done=None, tarinfo=tarinfo, date_time=date_time, open_member=open_member):
+            fileobj = spool if spool is not None else open_member()
+            writer.write_fileobj(_new_info(arcname, date_time, tarinfo.size), fileobj, tarinfo.size, done)
+
+        yield Member(
+            tarinfo.name,
+            tarinfo.size,
+            date_time,
+            copy,
+            open_member,
+        )
+
+
+def _single_members(base, kind, spool, date_time, writer, governor):
+    compressed_size = spool.seek(0, 2)
+
+    def open_stream():
+        spool.seek(0)
+        return governor.reader(_SINGLE_OPENERS[kind](spool, 'rb'), base, None, compressed_size)
+
+    def copy(arcname, spool=None, done=None):
+        if spool is not None:
+            writer.write_fileobj(_new_info(arcname, date_time, 0), spool, done=done)
+            return
+        with open_stream() as fileobj:
+            writer.write_fileobj(_new_info(arcname, date_time, 0), fileobj, done=done)
+
+    yield Member(os.path.splitext(base)[0], None, date_time, copy, open_stream)
+
+
+class Extractor:
+    """압축파일을 재귀적으로 풀어 출력 ZIP에 모으는 작업기
+
+    중첩된 압축파일은 재귀 호출 대신 작업 스택(stack)에 쌓아 처리하며,
+    풀어낸 압축파일은 keep_original일 때만 원본도 함께 저장합니다.
+    풀 수 없는 압축파일(rar, 7z, 손상된 파일, max_depth 초과)은 그대로 저장합니다.
+    max_depth가 없으면 끝까지 풀되, 자원 한도(governor)를 넘으면
+    LimitExceeded로 작업 전체를 중단합니다.
+    dedup(Deduplicator)이 있으면 내용이 같은 파일은 한 번만 기록합니다.
+    기록한 파일은 listing(Listing)에 원래 경로·원본 압축파일과 함께 남깁니다.
+    기록 대기 중인 항목은 언제나 스택 맨 위 압축파일에서 온 것이므로
+    기록하다 나는 손상 오류는 그 압축파일의 실패로 처리합니다.
+    incremental(Incremental)이 있으면 업로드한 ZIP의 항목 단위로 증분 처리하고,
+    풀려 나온 파일은 (업로드한 ZIP의 항목, 그 안의 경로)로 이전 파일명을 찾습니다.
+    entry_filter(EntryFilter)가 있으면 풀기 전에 메타데이터만 보고 조건에 맞는 파일만 기록하고,
+    안을 풀어 볼 압축파일은 쓸모없는 파일·제외 패턴만 확인합니다.
+    압축파일 안의 파일은 업로드한 ZIP부터 이은 경로(a.zip/docs/b.pdf)로 패턴을 확인합니다.
+    """
+
+    def __init__(self, writer, keep_original=False, max_depth=None, governor=None, dedup=None, incremental=None,
+                 entry_filter=None):
+        self.writer = writer
+        self.keep_original = keep_original
+        self.max_depth = max_depth
+        self.governor = governor or ResourceGovernor()
+        self.dedup = dedup
+        self.incremental = incremental
+        self.entry_filter = entry_filter
+        self.names = NameAllocator()
+        if incremental is not None:
+            incremental.reserve(self.names)
+        # 지금 처리 중인 업로드한 ZIP의 항목 경로
+        self._top = None
+        self.listing = Listing()
+        self.archives = 0
+        self.extracted = 0
+        self.failed = []
+
+    def run(self, zf, infos=None):
+        """업로드한 ZIP(zf)의 모든 파일을 처리"""
+        # 스택 항목: (파일 목록, 깊이, 압축파일 경로, 닫아야 할 자원)
+        # 압축파일 경로는 업로드한 ZIP부터 '/'로 이은 것 (예: a.zip/b.tar)
+        stack = [(_zip_members(zf, self.writer, self.governor, infos), 0, None, [])]
+        while stack:
+            members, depth, archive_name, resources = stack[-1]
+            try:
+                member = next(members, None)
+                if member is not None:
+                    self._handle(member, depth, archive_name, stack)
+                    continue
+                # 임시 파일을 닫기 전에 대기 중인 항목 기록
+                self.writer.flush()
+            except ARCHIVE_ERRORS:
+                if depth == 0:
+                    raise
+                # 읽는 도중 손상이 발견된 압축파일은 거기까지만 해제
+                self.failed.append(archive_name)
+                self._drain()
+            self._close(stack.pop()[3])
+
+    def _handle(self, member, depth, archive_name, stack):
+        kind = archive_kind(member.base)
+        if kind is not None and self.max_depth is not None and depth >= self.max_depth:
+            kind = None
+        if self.entry_filter is not None and not self._selected(member, archive_name, kind is not None):
+            if self.incremental is not None:
+                if depth == 0:
+                    self.incremental.skip(member.info)
+                else:
+                    self.incremental.skip_inner(self._top, self._inner(member, archive_name))
+            return
+        if depth == 0:
+            if self.incremental is not None and not self.incremental.include(member.info):
+                return
+            self._top = member.path
+        # 업로드한 ZIP의 파일은 그대로 복사될 수 있으므로 실제로 풀린 양만 셈
+        self.governor.check_entry(member.base, member.size if depth > 0 else None)
+        if kind is None:
+            self._write(member, depth, archive_name)
+            return
+        self.governor.check_depth(member.base, depth + 1)
+        # 안쪽 압축파일로 들어가기 전에 지금 압축파일에서 온 항목을 모두 기록
+        # (여기서 나는 오류는 지금 압축파일의 것)
+        self.writer.flush()
+        path = member.path if archive_name is None else f"{archive_name}/{member.path}"
+
+        # 중첩된 압축파일을 임시 파일에 푸는 시간
+        with self.writer.stats.stage('spool', member.size or 0, 1), member.open() as fileobj:
+            spool = spool_stream(fileobj)
+        if self.keep_original:
+            self._copy_spooled(member, archive_name, spool)
+            spool.seek(0)
+
+        try:
+            members, resources = self._open_archive(member, kind, spool)
+        except ARCHIVE_ERRORS:
+            # 손상된 압축파일은 원본을 그대로 저장
+            self.failed.append(path)
+            if not self.keep_original:
+                spool.seek(0)
+                self._copy_spooled(member, archive_name, spool)
+            spool.close()
+            return
+
+        self.archives += 1
+        stack.append((members, depth + 1, path, resources))
+
+    def _open_archive(self, member, kind, spool):
+        """임시 파일에 담긴 압축파일을 열어 (파일 목록, 닫을 자원) 반환"""
+        if kind == 'zip':
+            zf = zipfile.ZipFile(spool)
+            return _zip_members(zf, self.writer, self.governor), [zf, spool]
+        if kind == 'tar':
+            compressed_size = spool.seek(0, 2)
+            spool.seek(0)
+            tar = tarfile.open(fileobj=spool, mode='r|*')
+            return _tar_members(tar, self.writer, self.governor, compressed_size), [tar, spool]
+        # 헤더를 미리 확인해 손상된 파일을 걸러냄
+        with _SINGLE_OPENERS[kind](spool, 'rb') as probe:
+            probe.read(1)
+        spool.seek(0)
+        return _single_members(member.base, kind, spool, member.date_time, self.writer, self.governor), [spool]
+
+    def _drain(self):
+        """대기 중인 항목 기록 (손상된 압축파일에서 온 항목은 건너뜀)"""
+        while True:
+            try:
+                self.writer.flush()
+                return
+            except ARCHIVE_ERRORS:
+                continue
+
+    def _selected(self, member, archive_name, container):
+        # 경로 패턴은 업로드한 ZIP부터 이은 경로에 맞춤 (예: sub/* → sub/a.zip 안의 파일도 포함)
+        path = member.path if archive_name is None else f"{archive_name}/{member.path}"
+        mtime = None
+        if self.entry_filter.needs_mtime:
+            mtime = entry_mtime(member.info) if member.info is not None else time.mktime(member.date_time + (0, 0, -1))
+        return self.entry_filter.match(path, member.size, mtime, container)
+
+    def _inner(self, member, archive_name):
+        """지금 처리 중인 업로드한 ZIP의 항목 안에서의 경로 (그 항목 자체면 빈 문자열)"""
+        path = member.path if archive_name is None else f"{archive_name}/{member.path}"
+        return path[len(self._top) + 1:]
+
+    def _allocate(self, member, archive_name):
+        if self.incremental is None:
+            return self.names.allocate(member.base)
+        return self.incremental.name(self.names, self._top, self._inner(member, archive_name), member.base)
+
+    def _copy_spooled(self, member, archive_name, spool):
+        """임시 파일에 풀어 둔 압축파일을 그대로 기록 (거르기 조건에 맞을 때만)"""
+        if self.entry_filter is not None and not self._selected(member, archive_name, False):
+            if self.incremental is not None:
+                self.incremental.skip_inner(self._top, self._inner(member, archive_name))
+            return
+        arcname = self._allocate(member, archive_name)
+        member.copy(arcname, spool, lambda: self.listing.add(member.path, arcname, member.size, archive_name))
+
+    def _write(self, member, depth, archive_name):
+        if self.dedup is not None and member.dedup is not None:
+            key, open_content, source = member.dedup
+            with self.writer.stats.stage('dedup', entries=1):
+                if self.dedup.find(key, open_content, member.base) is not None:
+                    return
+        with self.writer.stats.stage('names', entries=1):
+            arcname = self._allocate(member, archive_name)
+        member.copy(arcname, done=lambda: self._written(member, arcname, depth, archive_name))
+        if self.dedup is not None and member.dedup is not None:
+            # 업로드한 ZIP은 끝까지 열려 있으므로 중첩된 압축파일만 닫힐 때 해시 계산
+            self.dedup.add(key, arcname, open_content, source if depth > 0 else None)
+
+    def _written(self, member, arcname, depth, archive_name):
+        """파일 하나를 실제로 기록한 뒤 목록과 개수에 반영"""
+        self.listing.add(member.path, arcname, member.size, archive_name)
+        if depth > 0:
+            self.extracted += 1
+
+    def _close(self, resources):
+        for resource in resources:
+            if self.dedup is not None:
+                self.dedup.release(resource)
+            resource.close()
+
+
+def extract_zip(input_file, infos, output_file, keep_original=False, max_depth=None, policy=None, progress=None,
+                stats=None, dedup=None, incremental=None, entry_filter=None):
+    """input_file 안의 압축파일을 풀어 output_file에 모으고 작업기(Extractor) 반환"""
+    input_zip = zipfile.ZipFile(input_file)
+    with open_result_zip(output_file) as output_zip, \
+            ParallelWriter(output_zip, policy=policy, progress=progress, stats=stats) as writer:
+        extractor = Extractor(writer, keep_original=keep_original, max_depth=max_depth, dedup=dedup,
+                              incremental=incremental, entry_filter=entry_filter)
+        extractor.run(input_zip, infos)
+    return extractor
@@ -0,0 +1,130 @@
+"""파일 거르기
+
+ZIP 중앙 디렉터리 정보(경로, 크기, 수정 시각)만으로 처리할 파일을 고릅니다.
+내용을 풀기 전에 판단하므로 20GB 중 PDF만 필요하면 PDF만 풀어 읽습니다.
+세 기능(모으기, 이름 변경, 압축 해제)이 같은 거르기를 사용합니다.
+"""
+import datetime
+import fnmatch
+import re
+import time
+
+# 운영체제가 만드는 쓸모없는 파일
+JUNK_DIRS = {'__MACOSX'}
+JUNK_NAMES = {'.ds_store', 'thumbs.db', 'desktop.ini'}
+# macOS가 다른 파일 시스템에 남기는 리소스 포크 (._원래이름)
+JUNK_PREFIX = '._'
+
+
+def is_junk(path):
+    """운영체제가 만든 쓸모없는 파일인지 (__MACOSX/, .DS_Store, Thumbs.db 등)"""
+    parts = path.split('/')
+    base = parts[-1]
+    if base.lower() in JUNK_NAMES or base.startswith(JUNK_PREFIX):
+        return True
+    return any(part in JUNK_DIRS for part in parts[:-1])
+
+
+def _compile_globs(patterns):
+    """글롭 목록을 정규식 하나로 (대소문자 무시)
+
+    '/'가 없는 패턴은 파일명에, 있는 패턴은 전체 경로에 맞춥니다.
+    """
+    names = [fnmatch.translate(p) for p in patterns if '/' not in p]
+    paths = [fnmatch.translate(p.lstrip('/')) for p in patterns if '/' in p]
+    return (
+        re.compile('|'.join(names), re.IGNORECASE) if names else None,
+        re.compile('|'.join(paths), re.IGNORECASE) if paths else None,
+    )
+
+
+def _matches(compiled, path, base):
+    names, paths = compiled
+    return bool((names is not None and names.match(base)) or (paths is not None and paths.match(path)))
+
+
+def parse_list(text):
+    """쉼표·공백으로 구분한 입력을 목록으로 ("*.pdf, 보고서/*" → ['*.pdf', '보고서/*'])"""
+    return [item for item in re.split(r'[,\s]+', text or '') if item]
+
+
+def normalize_extensions(extensions):
+    """확장자 목록을 점이 붙은 소문자로 ('PDF', '.jpg' → '.pdf', '.jpg')"""
+    return sorted({'.' + ext.lower().lstrip('.') for ext in extensions if ext.strip('.')})
+
+
+def date_range(start=None, end=None):
+    """날짜 범위(양 끝 포함, datetime.date)를 (시작 시각, 끝 시각) 유닉스 시각으로 (지역 시간 기준)"""
+    since = time.mktime(start.timetuple()) if start is not None else None
+    until = time.mktime((end + datetime.timedelta(days=1)).timetuple()) if end is not None else None
+    return since, until
+
+
+class EntryFilter:
+    """경로·확장자·크기·날짜로 파일을 고르는 거르기
+
+    include가 있으면 하나라도 맞는 파일만, exclude에 맞는 파일은 빼고,
+    extensions가 있으면 그 확장자만, 크기(바이트)와 수정 시각(유닉스 시각)은
+    범위 안의 파일만 남깁니다. skip_junk면 운영체제가 만든 파일을 뺍니다.
+    압축 해제에서 안을 풀어 볼 압축파일(container)은 skip_junk와 exclude만 적용합니다.
+    크기를 미리 알 수 없는 파일(gz 등 안의 파일)은 크기 조건을 통과시킵니다.
+    """
+
+    def __init__(self, include=(), exclude=(), extensions=(), min_size=None, max_size=None,
+                 since=None, until=None, skip_junk=True):
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.extensions = tuple(normalize_extensions(extensions))
+        self.min_size = min_size
+        self.max_size = max_size
+        self.since = since
+        self.until = until
+        self.skip_junk = skip_junk
+        # 패턴은 한 번만 정규식으로 변환
+        self._include = _compile_globs(self.include) if self.include else None
+        self._exclude = _compile_globs(self.exclude) if self.exclude else None
+
+    @property
+    def needs_mtime(self):
+        return self.since is not None or self.until is not None
+
+    def options(self):
+        """결과 캐시 키에 쓸 설정값"""
+        return {
+            'include': list(self.include), 'exclude': list(self.exclude), 'extensions': list(self.extensions),
+            'min_size': self.min_size, 'max_size': self.max_size,
+            'since': self.since, 'until': self.until, 'skip_junk': self.skip_junk,
+        }
+
+    def match(self, path, size=None, mtime=None, container=False):
+        """path(압축파일 안의 경로) 파일을 처리할지 여부"""
+        base = path.rsplit('/', 1)[-1]
+        if self.skip_junk and is_junk(path):
+            return False
+        if self._exclude is not None and _matches(self._exclude, path, base):
+            return False
+        if container:
+            return True
+        if self._include is not None and not _matches(self._include, path, base):
+            return False
+        if self.extensions and not base.lower().endswith(self.extensions):
+            return False
+        if size is not None:
+            if self.min_size is not None and size < self.min_size:
+                return False
+            if self.max_size is not None and size > self.max_size:
+                return False
+        if mtime is not None:
+            if self.since is not None and mtime < self.since:
+                return False
+            if self.until is not None and mtime >= self.until:
+                return False
+        return True
+
+    def select(self, entries, is_container=None):
+        """색인 항목(IndexEntry) 중 조건에 맞는 항목 목록"""
+        return [
+            entry for entry in entries
+            if self.match(entry.info.filename, entry.size, entry.mtime,
+                          is_container is not None and is_container(entry))
+        ]
@@ -0,0 +1,87 @@
+"""ZIP 중앙 디렉터리 색인
+
+정렬과 확장자 필터에 필요한 값(이름, 확장자, 크기, 수정 시각)을
+한 번만 계산해 두고 모든 옵션에서 재사용합니다.
+"""
+import os
+import struct
+import time
+from typing import NamedTuple
+import zipfile
+
+# 확장 타임스탬프 (UT) 추가 필드 ID
+_EXTENDED_TIMESTAMP = 0x5455
+
+# 항목 하나당 ZipInfo, 튜플, 정렬 목록이 차지하는 대략적인 크기
+_ENTRY_OVERHEAD = 600
+
+
+class IndexEntry(NamedTuple):
+    info: zipfile.ZipInfo
+    base: str
+    ext: str
+    size: int
+    mtime: float
+
+
+def entry_mtime(info):
+    """항목의 수정 시각 (확장 타임스탬프가 있으면 우선 사용)"""
+    extra = info.extra
+    pos = 0
+    while pos + 4 <= len(extra):
+        field_id, field_len = struct.unpack_from('<HH', extra, pos)
+        data = extra[pos + 4:pos + 4 + field_len]
+        if field_id == _EXTENDED_TIMESTAMP and len(data) >= 5 and data[0] & 1:
+            return float(struct.unpack_from('<i', data, 1)[0])
+        pos += 4 + field_len
+    # DOS 시각은 지역 시간 기준
+    return time.mktime(info.date_time + (0, 0, -1))
+
+
+def make_entry(info):
+    """ZipInfo 하나를 색인 항목으로 변환"""
+    base = info.filename.rsplit('/', 1)[-1]
+    ext = os.path.splitext(base)[1].lower()
+    return IndexEntry(info, base, ext, info.file_size, entry_mtime(info))
+
+
+class ArchiveIndex:
+    """ZIP 파일 목록 색인 (폴더 제외)"""
+
+    def __init__(self, infos):
+        self.entries = [make_entry(info) for info in infos if not info.is_dir()]
+        self.extensions = sorted({entry.ext for entry in self.entries if entry.ext})
+        self._orders = {}
+
+    @classmethod
+    def from_zip(cls, zf):
+        return cls(zf.infolist())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def approx_size(self):
+        """색인이 차지하는 대략적인 메모리 크기 (바이트)"""
+        return sum(_ENTRY_OVERHEAD + 2 * len(entry.info.filename) for entry in self.entries)
+
+    def order(self, field, reverse=False):
+        """field 기준으로 정렬된 항목 목록 (한 번 계산하면 재사용)"""
+        key = (field, reverse)
+        if key not in self._orders:
+            getter = _FIELD_GETTERS[field]
+            self._orders[key] = sorted(self.entries, key=getter, reverse=reverse)
+        return self._orders[key]
+
+    def select(self, ext=None, field=None, reverse=False):
+        """확장자로 거르고 정렬한 항목 목록"""
+        entries = self.order(field, reverse) if field else self.entries
+        if ext is None:
+            return list(entries)
+        return [entry for entry in entries if entry.ext == ext]
+
+
+_FIELD_GETTERS = {
+    'base': lambda entry: entry.base,
+    'size': lambda entry: entry.size,
+    'mtime': lambda entry: entry.mtime,
+}
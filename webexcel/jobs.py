@@ -0,0 +1,321 @@
+"""백그라운드 작업 실행기
+
+모으기·이름 변경·압축 해제를 화면 스크립트 밖의 작업 스레드에서 실행해
+다시 실행(rerun)이나 연결 끊김에도 작업이 이어지도록 합니다.
+작업은 항목을 기록할 때마다 진행 상황을 갱신하고, 취소 요청을 확인합니다.
+
+여러 사용자가 동시에 큰 작업을 시작해도 서버 메모리가 넘치지 않도록
+작업마다 필요한 메모리를 중앙 디렉터리 정보로 미리 추정하고,
+동시 실행 수(slot)와 메모리 한도 안에서만 도착한 순서대로 실행합니다.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import cProfile
+import heapq
+import io
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from webexcel import config, metrics
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+# 색인·파일명 목록 등 항목 하나를 처리하는 데 드는 대략의 메모리
+ENTRY_MEMORY = 1024
+
+
+class JobCancelled(Exception):
+    """사용자가 작업을 취소했을 때 발생"""
+
+
+def estimate_memory(kind, sizes, parallel=1):
+    """원본 크기 목록(sizes)으로 작업 하나가 쓸 최대 메모리 추정
+
+    여러 입력을 동시에 처리하면 (parallel개) 입력마다 임시 결과와 압축 중인 항목이 따로 있습니다.
+    """
+    sizes = list(sizes)
+    # 결과 ZIP은 SPOOL_MAX_SIZE까지 메모리에 머물고 넘으면 디스크로 옮겨감
+    memory = min(sum(sizes), parallel * config.SPOOL_MAX_SIZE)
+    # 병렬 압축 중인 항목은 원본과 압축본이 함께 메모리에 있음 (출력마다 PARALLEL_MAX_BYTES까지)
+    window = parallel * config.COMPRESS_WORKERS * 2
+    in_flight = sum(heapq.nlargest(window, (min(size, config.PARALLEL_MAX_MEMBER_SIZE) for size in sizes)))
+    in_flight_limit = parallel * max(config.PARALLEL_MAX_BYTES, config.PARALLEL_MAX_MEMBER_SIZE)
+    if kind == 'extract':
+        # 중첩된 압축파일 안의 항목 크기는 미리 알 수 없으므로 한도만큼 잡음
+        in_flight = in_flight_limit
+        # 해제 중인 압축파일의 임시 파일 (단계마다 SPOOL_MAX_SIZE까지 메모리 사용)
+        memory += parallel * 2 * config.SPOOL_MAX_SIZE
+    memory += 2 * min(in_flight, in_flight_limit)
+    memory += len(sizes) * ENTRY_MEMORY
+    return memory
+
+
+class Job:
+    """작업 하나의 상태와 진행 상황
+
+    total_entries, total_bytes는 예상치이며 (중첩 압축파일은 미리 알 수 없음)
+    진행률과 남은 시간 계산에만 사용합니다.
+    profile이 True면 작업 스레드를 cProfile로 측정해 profile_path에 저장합니다
+    (병렬 압축 스레드 안의 시간은 기다린 시간으로만 나타남).
+    """
+
+    def __init__(self, kind, total_entries=0, total_bytes=0, info=None, memory=0, profile=False):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.total_entries = total_entries
+        self.total_bytes = total_bytes
+        # 실행 허가에 사용하는 예상 메모리 사용량
+        self.memory = memory
+        # 화면에 보여줄 작업 정보 (미리보기 등)
+        self.info = info or {}
+        self.status = QUEUED
+        self.entries_done = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.stats = metrics.StageStats()
+        self.profile = profile
+        self.profile_path = None
+        self.queued_at = time.monotonic()
+        self._task = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    def advance(self, bytes_in=0, bytes_out=0):
+        """항목 하나를 기록했을 때 호출"""
+        with self._lock:
+            self.entries_done += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def check(self):
+        """취소 요청이 있으면 JobCancelled 발생"""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def close(self):
+        """보관하던 결과 파일 닫기 (결과를 더 이상 내려받지 않을 때)
+
+        내려받는 중인 파일은 zipio.open_reader()로 연 사본이므로 그대로 읽힙니다.
+        조각이나 입력별 결과를 담은 임시 폴더는 작업 정보와 함께 사라질 때 지워집니다.
+        """
+        output_file = self.info.get('output_file')
+        if isinstance(output_file, (io.IOBase, tempfile.SpooledTemporaryFile)):
+            output_file.close()
+        for part in list(self.info.get('parts') or ()):
+            if part.file is not None:
+                part.file.close()
+
+    @property
+    def cancelling(self):
+        return self._cancel.is_set() and not self.finished
+
+    def fraction(self):
+        """진행률 (0.0 ~ 1.0)"""
+        if self.status == DONE:
+            return 1.0
+        if self.total_bytes:
+            return min(self.bytes_in / self.total_bytes, 1.0)
+        if self.total_entries:
+            return min(self.entries_done / self.total_entries, 1.0)
+        return 0.0
+
+    def eta(self):
+        """남은 예상 시간 (초, 알 수 없으면 None)"""
+        if self.status != RUNNING:
+            return None
+        done = self.fraction()
+        if done <= 0 or done >= 1:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed * (1 - done) / done
+
+    def run(self, fn, args, kwargs):
+        self.status = RUNNING
+        self.started_at = time.monotonic()
+        profiler = cProfile.Profile() if self.profile else None
+        try:
+            self.check()
+            if profiler is not None:
+                profiler.enable()
+            self.result = fn(*args, progress=self, stats=self.stats, **kwargs)
+            self.status = DONE
+        except JobCancelled:
+            self.status = CANCELLED
+        except Exception as e:
+            self.error = e
+            self.status = FAILED
+        finally:
+            self.finished_at = time.monotonic()
+            if profiler is not None:
+                profiler.disable()
+                self._save_profile(profiler)
+            self._record()
+
+    def _save_profile(self, profiler):
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        self.profile_path = os.path.join(config.PROFILE_DIR, f"{self.kind}_{self.id}.prof")
+        profiler.dump_stats(self.profile_path)
+
+    def _record(self):
+        metrics.record_job(
+            self.kind, self.status,
+            duration=self.finished_at - self.started_at,
+            queue_wait=self.started_at - self.queued_at,
+            stats=self.stats,
+            job_id=self.id,
+            entries=self.entries_done,
+            bytes_in=self.bytes_in,
+            bytes_out=self.bytes_out,
+            error=str(self.error) if self.error else None,
+            profile=self.profile_path,
+        )
+
+
+class JobRunner:
+    """작업 대기열과 실행기 (서버 전체에서 공유)
+
+    실행 중인 작업 수가 slots보다 적고 예상 메모리 합이 memory_budget 안일 때만
+    대기열 맨 앞 작업을 실행합니다 (앞 작업을 건너뛰지 않는 선입선출).
+    혼자서도 한도를 넘는 작업은 다른 작업이 모두 끝난 뒤 단독으로 실행합니다.
+    """
+
+    def __init__(self, slots=None, memory_budget=None, result_ttl=None):
+        self.slots = slots or config.JOB_WORKERS
+        self.memory_budget = memory_budget or config.JOB_MEMORY_BUDGET
+        self.result_ttl = config.JOB_RESULT_TTL if result_ttl is None else result_ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.slots,
+            thread_name_prefix='webexcel-job'
+        )
+        self._jobs = {}
+        self._queue = deque()
+        self._running = set()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        # 지표 서버가 설정되어 있으면 함께 시작
+        metrics.get_registry()
+
+    def submit(self, job, fn, *args, **kwargs):
+        """fn(*args, progress=job, **kwargs)를 대기열에 넣고 job 반환"""
+        job._task = (fn, args, kwargs)
+        with self._lock:
+            self._expire()
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._admit()
+        return job
+
+    def add_done(self, job, result):
+        """실행할 필요 없이 이미 결과가 있는 작업 등록 (결과 캐시 등)"""
+        job.result = result
+        job.started_at = job.finished_at = time.monotonic()
+        job.status = DONE
+        with self._lock:
+            self._expire()
+            self._jobs[job.id] = job
+        metrics.record_cache_hit(job.kind, job_id=job.id)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def position(self, job):
+        """대기 순서 (1부터, 대기 중이 아니면 0)"""
+        with self._lock:
+            try:
+                return self._queue.index(job) + 1
+            except ValueError:
+                return 0
+
+    def cancel(self, job):
+        """작업 취소 (대기 중이면 바로 대기열에서 뺌)"""
+        job.cancel()
+        with self._lock:
+            if job in self._queue:
+                self._queue.remove(job)
+                job.finished_at = time.monotonic()
+                job.status = CANCELLED
+
+    def forget(self, job_id):
+        """결과를 더 이상 보관하지 않고 닫음 (실행 중이면 취소하고 끝날 때 닫음)"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            running = job in self._running
+        if job is not None:
+            self.cancel(job)
+            if not running:
+                job.close()
+
+    def _admit(self):
+        # 잠금을 잡은 상태에서 호출
+        while self._queue:
+            job = self._queue[0]
+            if self._running and (
+                len(self._running) >= self.slots
+                or self._memory_used + job.memory > self.memory_budget
+            ):
+                return
+            self._queue.popleft()
+            self._running.add(job)
+            self._memory_used += job.memory
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        fn, args, kwargs = job._task
+        try:
+            job.run(fn, args, kwargs)
+        finally:
+            with self._lock:
+                job._task = None
+                self._running.discard(job)
+                self._memory_used -= job.memory
+                self._admit()
+                forgotten = job.id not in self._jobs
+            # 실행 중에 forget()한 작업의 결과 정리
+            if forgotten:
+                job.close()
+
+    def _expire(self):
+        # 오래전에 끝났는데 아무도 가져가지 않은 결과 정리
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.result_ttl
+        ]
+        for job_id in expired:
+            self._jobs.pop(job_id).close()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """서버 전체에서 공유하는 작업 실행기"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -0,0 +1,113 @@
+"""압축 해제 자원 한도
+
+압축 폭탄이나 실수로 올린 거대한 파일이 서버 전체를 멈추지 않도록
+해제하는 동안 항목 수, 선언된 크기와 실제로 풀린 크기, 항목별 압축률,
+중첩 깊이를 추적하고 한도를 넘으면 즉시 중단합니다.
+"""
+import threading
+
+from webexcel import config
+
+# 이보다 작게 풀린 항목은 압축률을 검사하지 않음 (작은 텍스트 파일 오탐 방지)
+RATIO_MIN_SIZE = 1024 * 1024
+
+
+class LimitExceeded(Exception):
+    """처리 한도를 넘어 작업을 중단할 때 발생"""
+
+
+def _format_size(size):
+    return f"{size / (1024 * 1024):,.0f}MB"
+
+
+class ResourceGovernor:
+    """압축 해제 작업 하나의 자원 사용량 추적기 (여러 스레드에서 함께 사용)"""
+
+    def __init__(self, max_total_size=None, max_entries=None, max_depth=None, max_ratio=None):
+        self.max_total_size = max_total_size or config.EXTRACT_MAX_TOTAL_SIZE
+        self.max_entries = max_entries or config.EXTRACT_MAX_ENTRIES
+        self.max_depth = max_depth or config.EXTRACT_MAX_DEPTH
+        self.max_ratio = max_ratio or config.EXTRACT_MAX_RATIO
+        self.entries = 0
+        self.declared_size = 0
+        self.inflated_size = 0
+        self.deepest = 0
+        self._error = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        """다른 스레드에서 한도를 넘었으면 바로 중단"""
+        if self._error is not None:
+            raise LimitExceeded(self._error)
+
+    def _fail(self, message):
+        self._error = message
+        raise LimitExceeded(message)
+
+    def check_entry(self, name, declared_size=None):
+        """항목 하나를 처리하기 전에 항목 수와 선언된 크기 확인"""
+        with self._lock:
+            self.check()
+            self.entries += 1
+            if self.entries > self.max_entries:
+                self._fail(f"파일 수가 한도({self.max_entries:,}개)를 넘었습니다")
+            if declared_size:
+                self.declared_size += declared_size
+                if self.declared_size > self.max_total_size:
+                    self._fail(f"압축을 푼 전체 크기가 한도({_format_size(self.max_total_size)})를 넘습니다: {name}")
+
+    def check_depth(self, name, depth):
+        """중첩된 압축파일을 열기 전에 깊이 확인"""
+        with self._lock:
+            self.check()
+            self.deepest = max(self.deepest, depth)
+            if depth > self.max_depth:
+                self._fail(f"압축파일 중첩 깊이가 한도({self.max_depth}단계)를 넘었습니다: {name}")
+
+    def add_inflated(self, name, size):
+        """실제로 풀린 바이트 수 기록"""
+        with self._lock:
+            self.check()
+            self.inflated_size += size
+            if self.inflated_size > self.max_total_size:
+                self._fail(f"압축을 푼 전체 크기가 한도({_format_size(self.max_total_size)})를 넘었습니다: {name}")
+
+    def reader(self, fileobj, name, declared_size=None, compressed_size=None):
+        """읽는 만큼 풀린 크기를 기록하는 파일 객체로 감싸기"""
+        return GovernedReader(self, fileobj, name, declared_size, compressed_size)
+
+
+class GovernedReader:
+    """읽은 양을 자원 한도 추적기에 알리는 파일 객체"""
+
+    def __init__(self, governor, fileobj, name, declared_size=None, compressed_size=None):
+        self._governor = governor
+        self._fileobj = fileobj
+        self._name = name
+        self._declared_size = declared_size
+        self._compressed_size = compressed_size
+        self._read = 0
+
+    def read(self, size=-1):
+        data = self._fileobj.read(size)
+        if data:
+            self._read += len(data)
+            self._governor.add_inflated(self._name, len(data))
+            self._check_entry()
+        return data
+
+    def _check_entry(self):
+        if self._declared_size is not None and self._read > self._declared_size:
+            self._governor._fail(f"선언된 크기보다 많이 풀렸습니다: {self._name}")
+        if self._compressed_size and self._read > RATIO_MIN_SIZE:
+            if self._read > self._compressed_size * self._governor.max_ratio:
+                self._governor._fail(f"압축률이 비정상적으로 높습니다 (1:{self._governor.max_ratio} 초과): {self._name}")
+
+    def close(self):
+        self._fileobj.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,48 @@
+"""결과 목록
+
+작업이 기록한 파일마다 (원래 경로, 새 이름, 크기, 원본 압축파일)을 모읍니다.
+항목이 수십만 개여도 가볍도록 행마다 객체를 만들지 않고 열마다 리스트 하나에 담습니다.
+"""
+
+
+class Listing:
+    """열별 리스트로 보관하는 결과 목록"""
+
+    def __init__(self):
+        self.original = []
+        self.name = []
+        self.size = []
+        self.source = []
+
+    def add(self, original, name, size, source=''):
+        """기록한 파일 하나 추가 (크기를 모르면 None, 업로드한 ZIP 바로 안의 파일은 source 없음)"""
+        self.original.append(original)
+        self.name.append(name)
+        self.size.append(size)
+        self.source.append(source or '')
+
+    def __len__(self):
+        return len(self.name)
+
+    def as_dict(self):
+        """JSON으로 저장할 수 있는 열 이름 → 값 목록"""
+        return {'original': self.original, 'name': self.name, 'size': self.size, 'source': self.source}
+
+
+def plan_listing(plan):
+    """이름 변경 계획 (원본 항목, 원래 이름, 새 이름)의 결과 목록"""
+    listing = Listing()
+    for info, _, new_name in plan:
+        listing.add(info.filename, new_name, info.file_size)
+    return listing
+
+
+def batch_plan_listing(rows, names):
+    """여러 입력의 이름 변경 계획 (입력 위치, 원본 항목, 원래 이름, 새 이름)의 결과 목록
+
+    원본 압축파일 열에는 입력 이름(names[입력 위치])을 넣습니다.
+    """
+    listing = Listing()
+    for position, info, _, new_name in rows:
+        listing.add(info.filename, new_name, info.file_size, names[position])
+    return listing
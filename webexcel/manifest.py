@@ -0,0 +1,197 @@
+"""작업 매니페스트와 증분 처리
+
+매니페스트는 업로드한 ZIP의 항목마다 (원본 경로, CRC32, 크기, 수정 시각)과
+그 항목에서 나온 결과 파일명을 기록합니다. 다음 작업에 이전 매니페스트를 주면
+중앙 디렉터리 정보만 비교해 바뀌지 않은 항목을 건너뛰고(delta),
+전체 결과를 만들 때도 이전과 같은 파일명을 그대로 씁니다.
+"""
+import calendar
+import json
+
+MANIFEST_VERSION = 1
+
+# 결과 ZIP 옆에 저장하는 매니페스트 파일 이름 끝부분
+MANIFEST_SUFFIX = '.manifest.json'
+
+
+def signature(info):
+    """바뀌었는지 판단하는 값 (CRC32, 크기, 수정 시각)
+
+    수정 시각은 ZIP에 적힌 DOS 시각을 그대로 숫자로 바꾼 값이라
+    서버의 시간대가 바뀌어도 이전 매니페스트와 비교할 수 있습니다.
+    """
+    return (info.CRC, info.file_size, calendar.timegm(info.date_time))
+
+
+class Manifest:
+    """원본 경로 → (CRC32, 크기, 수정 시각, {안쪽 경로: 결과 파일명})
+
+    안쪽 경로는 압축파일 해제에서 원본 압축파일 안의 경로이며,
+    파일 하나가 결과 하나가 되는 모으기·이름 변경에서는 빈 문자열입니다.
+    """
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.sources = {}
+
+    def add_source(self, info):
+        self.sources[info.filename] = (*signature(info), {})
+
+    def add_name(self, path, inner, name):
+        self.sources[path][3][inner] = name
+
+    def names(self):
+        """기록된 모든 결과 파일명"""
+        for source in self.sources.values():
+            yield from source[3].values()
+
+    def as_dict(self):
+        """JSON으로 저장할 수 있는 열별 형태"""
+        paths = list(self.sources)
+        columns = list(zip(*self.sources.values())) or [(), (), (), ()]
+        return {
+            'version': MANIFEST_VERSION,
+            'operation': self.operation,
+            'path': paths,
+            'crc': list(columns[0]),
+            'size': list(columns[1]),
+            'mtime': list(columns[2]),
+            'outputs': list(columns[3]),
+        }
+
+    def dumps(self):
+        return json.dumps(self.as_dict(), ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def from_dict(cls, data):
+        """as_dict()로 만든 값에서 복원 (형식이 맞지 않으면 ValueError)"""
+        try:
+            if data['version'] != MANIFEST_VERSION:
+                raise ValueError(f"지원하지 않는 매니페스트 버전입니다: {data['version']}")
+            manifest = cls(data['operation'])
+            for path, crc, size, mtime, outputs in zip(
+                    data['path'], data['crc'], data['size'], data['mtime'], data['outputs'], strict=True):
+                manifest.sources[path] = (crc, size, mtime, dict(outputs))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"매니페스트 형식이 올바르지 않습니다: {str(e)}") from None
+        return manifest
+
+    @classmethod
+    def loads(cls, text):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            raise ValueError("매니페스트 형식이 올바르지 않습니다: JSON이 아닙니다") from None
+        return cls.from_dict(data)
+
+
+class Incremental:
+    """이번 작업의 매니페스트를 만들고, 이전 매니페스트(previous)가 있으면 증분 처리
+
+    delta가 True면 바뀌지 않은 항목은 결과에 넣지 않고 이전 기록만 이어받습니다.
+    이전 결과 파일명은 모두 예약해 두어 새 파일이 예전 이름을 차지하지 않게 하고,
+    이전에 있던 항목(안쪽 경로까지 같은 결과)은 이전 이름을 그대로 씁니다.
+    """
+
+    def __init__(self, operation, previous=None, delta=False):
+        if previous is not None and previous.operation != operation:
+            raise ValueError(f"다른 작업({previous.operation})의 매니페스트입니다")
+        self.previous = previous
+        self.delta = delta and previous is not None
+        self.manifest = Manifest(operation)
+        self.unchanged = 0
+        self.changed = 0
+        self.added = 0
+        self._seen = set()
+        self._used = set()
+
+    def is_unchanged(self, info):
+        if self.previous is None:
+            return False
+        prior = self.previous.sources.get(info.filename)
+        return prior is not None and tuple(prior[:3]) == signature(info)
+
+    def pending(self, entries):
+        """색인 항목(IndexEntry) 중 실제로 처리할 항목 (delta면 바뀐 항목만, 진행률 기준으로 사용)"""
+        if not self.delta:
+            return list(entries)
+        return [entry for entry in entries if not self.is_unchanged(entry.info)]
+
+    def reserve(self, allocator):
+        """이전 결과 파일명을 이름 할당기(NameAllocator)에 미리 예약"""
+        if self.previous is not None:
+            for name in self.previous.names():
+                allocator.reserve(name)
+
+    def include(self, info):
+        """업로드한 ZIP의 항목 하나를 처리할지 결정 (delta에서 바뀌지 않았으면 False)"""
+        path = info.filename
+        self._seen.add(path)
+        if self.is_unchanged(info):
+            self.unchanged += 1
+            if self.delta:
+                self.manifest.sources[path] = self.previous.sources[path]
+                self._used.update(self.previous.sources[path][3].values())
+                return False
+        elif self.previous is not None and path in self.previous.sources:
+            self.changed += 1
+        else:
+            self.added += 1
+        self.manifest.add_source(info)
+        return True
+
+    def skip(self, info):
+        """거르기 조건에 맞지 않아 처리하지 않은 항목 (이전 기록을 그대로 이어받음)
+
+        입력에는 그대로 있으므로 없어진 파일로 보지 않고, 이전 결과 파일명도 다음번을 위해 남깁니다.
+        """
+        path = info.filename
+        self._seen.add(path)
+        if self.previous is not None and path in self.previous.sources:
+            self.manifest.sources[path] = self.previous.sources[path]
+            self._used.update(self.previous.sources[path][3].values())
+
+    def skip_unselected(self, entries, selected):
+        """색인 항목(entries) 중 고른 항목(selected)에 없는 항목을 모두 skip"""
+        chosen = {entry.info.filename for entry in selected}
+        for entry in entries:
+            if entry.info.filename not in chosen:
+                self.skip(entry.info)
+
+    def skip_inner(self, path, inner):
+        """처리한 압축파일(path) 안에서 거르기 조건에 맞지 않은 파일(inner)의 이전 결과 파일명을 이어받음"""
+        if self.previous is None or path not in self.previous.sources or path not in self.manifest.sources:
+            return
+        prior = self.previous.sources[path][3].get(inner)
+        if prior is not None and prior not in self._used:
+            self._used.add(prior)
+            self.manifest.add_name(path, inner, prior)
+
+    def name(self, allocator, path, inner, name):
+        """결과 파일명 결정 (이전 결과가 있으면 그 이름, 없으면 name으로 새로 할당)"""
+        prior = None
+        if self.previous is not None and path in self.previous.sources:
+            prior = self.previous.sources[path][3].get(inner)
+        if prior is not None and prior not in self._used:
+            final_name = prior
+        else:
+            final_name = allocator.allocate(name)
+        self._used.add(final_name)
+        self.manifest.add_name(path, inner, final_name)
+        return final_name
+
+    def removed(self):
+        """이전에는 있었지만 이번 입력에 없는 원본 경로"""
+        if self.previous is None:
+            return []
+        return sorted(set(self.previous.sources) - self._seen)
+
+    def summary(self):
+        """화면·명령줄 표시용 요약"""
+        return {
+            'unchanged': self.unchanged,
+            'changed': self.changed,
+            'added': self.added,
+            'removed': self.removed(),
+            'delta': self.delta,
+        }
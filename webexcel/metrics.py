@@ -0,0 +1,215 @@
+"""단계별 계측과 지표 내보내기
+
+작업 하나의 단계(색인 읽기, 원본 읽기·압축 풀기, 압축, 출력 기록, 파일명 처리,
+다운로드)마다 걸린 시간과 바이트·항목 수를 StageStats에 모으고,
+작업이 끝나면 구조화된 로그 한 줄(JSON)을 남기고 서버 전체 지표에 더합니다.
+
+서버 전체 지표는 Prometheus 텍스트 형식으로 내보냅니다.
+WEBEXCEL_METRICS_PORT를 지정하면 http://localhost:포트/metrics 로,
+WEBEXCEL_METRICS_FILE을 지정하면 작업이 끝날 때마다 그 파일로 기록합니다.
+"""
+from collections import defaultdict
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import os
+import threading
+import time
+
+from webexcel import config
+
+logger = logging.getLogger('webexcel.metrics')
+
+# 작업 시간 분포 구간 (초)
+DURATION_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+class StageStats:
+    """작업 하나의 단계별 시간·바이트·항목 수 (여러 스레드에서 함께 기록)"""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.bytes = defaultdict(int)
+        self.entries = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds=0.0, nbytes=0, entries=0):
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.bytes[stage] += nbytes
+            self.entries[stage] += entries
+
+    @contextlib.contextmanager
+    def stage(self, stage, nbytes=0, entries=0):
+        """with 블록에서 걸린 시간을 stage에 더함"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started, nbytes, entries)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                stage: {
+                    'seconds': round(self.seconds[stage], 6),
+                    'bytes': self.bytes[stage],
+                    'entries': self.entries[stage],
+                }
+                for stage in sorted(set(self.seconds) | set(self.bytes) | set(self.entries))
+            }
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{value}"' for key, value in sorted(labels.items())) + '}'
+
+
+class MetricsRegistry:
+    """서버 전체 지표 (작업 수, 작업 시간 분포, 단계별 누적값)"""
+
+    def __init__(self):
+        self._jobs = defaultdict(int)
+        self._durations = defaultdict(lambda: [0] * (len(DURATION_BUCKETS) + 1))
+        self._duration_sums = defaultdict(float)
+        self._queue_waits = defaultdict(float)
+        self._cache_hits = defaultdict(int)
+        self._stages = defaultdict(lambda: [0.0, 0, 0])
+        self._lock = threading.Lock()
+
+    def observe_stage(self, operation, stage, seconds=0.0, nbytes=0, entries=0):
+        with self._lock:
+            totals = self._stages[(operation, stage)]
+            totals[0] += seconds
+            totals[1] += nbytes
+            totals[2] += entries
+
+    def observe_job(self, operation, status, duration, queue_wait, stats):
+        with self._lock:
+            self._jobs[(operation, status)] += 1
+            counts = self._durations[operation]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._duration_sums[operation] += duration
+            self._queue_waits[operation] += queue_wait
+        for stage, values in stats.as_dict().items():
+            self.observe_stage(operation, stage, values['seconds'], values['bytes'], values['entries'])
+
+    def observe_cache_hit(self, operation):
+        """실행하지 않고 결과 캐시에서 가져온 작업 (작업 수·작업 시간 분포에는 넣지 않음)"""
+        with self._lock:
+            self._cache_hits[operation] += 1
+
+    def render(self):
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            lines.append('# HELP webexcel_jobs_total Finished jobs by operation and status.')
+            lines.append('# TYPE webexcel_jobs_total counter')
+            for (operation, status), count in sorted(self._jobs.items()):
+                lines.append(f'webexcel_jobs_total{_labels(operation=operation, status=status)} {count}')
+
+            lines.append('# HELP webexcel_job_duration_seconds Job run time.')
+            lines.append('# TYPE webexcel_job_duration_seconds histogram')
+            for operation, counts in sorted(self._durations.items()):
+                for bound, count in zip(DURATION_BUCKETS, counts):
+                    lines.append(f'webexcel_job_duration_seconds_bucket{_labels(operation=operation, le=bound)} {count}')
+                lines.append(f'webexcel_job_duration_seconds_bucket{_labels(operation=operation, le="+Inf")} {counts[-1]}')
+                lines.append(f'webexcel_job_duration_seconds_sum{_labels(operation=operation)} {self._duration_sums[operation]:.6f}')
+                lines.append(f'webexcel_job_duration_seconds_count{_labels(operation=operation)} {counts[-1]}')
+
+            lines.append('# HELP webexcel_cache_hits_total Jobs answered from the result cache without running.')
+            lines.append('# TYPE webexcel_cache_hits_total counter')
+            for operation, count in sorted(self._cache_hits.items()):
+                lines.append(f'webexcel_cache_hits_total{_labels(operation=operation)} {count}')
+
+            lines.append('# HELP webexcel_job_queue_wait_seconds_total Time jobs spent waiting for admission.')
+            lines.append('# TYPE webexcel_job_queue_wait_seconds_total counter')
+            for operation, seconds in sorted(self._queue_waits.items()):
+                lines.append(f'webexcel_job_queue_wait_seconds_total{_labels(operation=operation)} {seconds:.6f}')
+
+            for index, (name, help_text) in enumerate((
+                ('webexcel_stage_seconds_total', 'Time spent per stage.'),
+                ('webexcel_stage_bytes_total', 'Bytes processed per stage.'),
+                ('webexcel_stage_entries_total', 'Entries processed per stage.'),
+            )):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for (operation, stage), totals in sorted(self._stages.items()):
+                    value = f'{totals[index]:.6f}' if index == 0 else totals[index]
+                    lines.append(f'{name}{_labels(operation=operation, stage=stage)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_file(self, path):
+        """지표 파일 기록 (node_exporter textfile 수집기가 반쯤 쓴 파일을 읽지 않도록 교체)"""
+        partial_path = path + '.part'
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(partial_path, path)
+
+
+def record_job(operation, status, duration, queue_wait, stats, **fields):
+    """끝난 작업을 서버 지표에 더하고 구조화된 로그 한 줄 기록"""
+    registry = get_registry()
+    registry.observe_job(operation, status, duration, queue_wait, stats)
+    logger.info(json.dumps({
+        'event': 'job_finished',
+        'operation': operation,
+        'status': status,
+        'duration_s': round(duration, 6),
+        'queue_wait_s': round(queue_wait, 6),
+        'stages': stats.as_dict(),
+        **fields,
+    }, ensure_ascii=False))
+    _write_metrics_file(registry)
+
+
+def record_cache_hit(operation, **fields):
+    """결과 캐시에서 바로 가져온 작업을 서버 지표에 더하고 구조화된 로그 한 줄 기록"""
+    registry = get_registry()
+    registry.observe_cache_hit(operation)
+    logger.info(json.dumps({'event': 'cache_hit', 'operation': operation, **fields}, ensure_ascii=False))
+    _write_metrics_file(registry)
+
+
+def _write_metrics_file(registry):
+    if config.METRICS_FILE:
+        try:
+            registry.write_file(config.METRICS_FILE)
+        except OSError:
+            logger.exception("지표 파일을 기록하지 못했습니다: %s", config.METRICS_FILE)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = get_registry().render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 수집기가 주기적으로 요청하므로 접근 기록은 남기지 않음
+        pass
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """서버 전체 지표 (처음 사용할 때 설정된 지표 서버도 시작)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+            if config.METRICS_PORT:
+                server = ThreadingHTTPServer(('127.0.0.1', config.METRICS_PORT), _MetricsHandler)
+                threading.Thread(target=server.serve_forever, name='webexcel-metrics', daemon=True).start()
+        return _registry
@@ -0,0 +1,45 @@
+"""중복 없는 파일명 할당
+
+같은 이름이 여러 번 나오면 `이름_1.확장자`, `이름_2.확장자` 순으로 붙입니다.
+이름마다 다음에 붙일 번호를 기억하므로 같은 이름이 수만 개여도
+매번 1부터 다시 확인하지 않습니다.
+"""
+import os
+
+
+class NameAllocator:
+    """중복되지 않는 파일명 할당기"""
+
+    def __init__(self):
+        self.taken = set()
+        self._next_suffix = {}
+
+    def allocate(self, name):
+        """name을 그대로 쓰거나, 이미 있으면 번호를 붙인 새 이름을 할당"""
+        if name not in self.taken:
+            self.taken.add(name)
+            return name
+
+        stem, ext = os.path.splitext(name)
+        counter = self._next_suffix.get(name, 1)
+        new_name = f"{stem}_{counter}{ext}"
+        # 원래부터 있던 `이름_N` 파일과 겹치는 번호만 건너뜀
+        while new_name in self.taken:
+            counter += 1
+            new_name = f"{stem}_{counter}{ext}"
+        self._next_suffix[name] = counter + 1
+        self.taken.add(new_name)
+        return new_name
+
+    def reserve(self, name):
+        """name을 다른 파일에 할당하지 않도록 예약 (이전 작업의 결과 파일명 등)"""
+        self.taken.add(name)
+
+    def __contains__(self, name):
+        return name in self.taken
+
+    def __iter__(self):
+        return iter(self.taken)
+
+    def __len__(self):
+        return len(self.taken)
@@ -0,0 +1,138 @@
+"""나누어 기록하는 결과 ZIP
+
+결과 ZIP 하나를 끝까지 만들어야 다운로드할 수 있으면, 결과가 클수록 오래 기다리고
+한 번에 보내는 양도 커집니다. 정해진 크기(max_size)마다 따로 열 수 있는 ZIP 조각으로
+나누어 기록하고, 다 채운 조각은 바로 닫아(봉인) parts에 추가하므로
+뒤 조각을 만드는 동안에도 앞 조각을 내려받을 수 있습니다.
+"""
+import os
+import tempfile
+import zipfile
+
+from webexcel.zipio import open_reader
+
+# 화면에 표시할 이름 → 조각 최대 크기 (None이면 나누지 않음)
+PART_SIZE_LABELS = {
+    "나누지 않음": None,
+    "100MB씩": 100 * 1024 * 1024,
+    "500MB씩": 500 * 1024 * 1024,
+    "1GB씩": 1024 * 1024 * 1024,
+    "2GB씩": 2048 * 1024 * 1024,
+}
+
+PART_SIZE_OPTIONS = list(PART_SIZE_LABELS)
+
+# 항목 하나의 로컬 헤더·중앙 디렉터리 고정 크기 (+ ZIP64 추가 필드 여유)
+_LOCAL_HEADER_SIZE = zipfile.sizeFileHeader + 32
+_CENTRAL_HEADER_SIZE = zipfile.sizeCentralDir + 32
+# 중앙 디렉터리 끝 레코드 (ZIP64 레코드 포함)
+_END_SIZE = zipfile.sizeEndCentDir + zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator
+
+
+def part_size_from_label(label):
+    """화면 선택값에 해당하는 조각 최대 크기"""
+    return PART_SIZE_LABELS[label]
+
+
+def part_path(path, number):
+    """결과 ZIP 경로의 number번째 조각 경로 (결과.zip → 결과_001.zip)"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{number:03d}{ext or '.zip'}"
+
+
+class Part:
+    """봉인된 조각 하나 (번호는 1부터)
+
+    file이 있으면 그 파일 객체를 (닫혀도 읽을 수 있는 사본으로), 없으면 path를 열어 내려받게 합니다.
+    입력마다 따로 만든 결과(batch.SeparateOutputs)는 name에 입력 이름이 있습니다.
+    """
+
+    def __init__(self, number, path, size, entries, file=None, name=None):
+        self.number = number
+        self.path = path
+        self.size = size
+        self.entries = entries
+        self.file = file
+        self.name = name
+
+    def open(self):
+        """조각을 처음부터 읽는 파일 객체 (내용을 메모리에 읽어 두지 않음)"""
+        if self.file is None:
+            return open(self.path, 'rb')
+        return open_reader(self.file)
+
+    def as_dict(self):
+        if self.name is None:
+            return {'size': self.size, 'entries': self.entries}
+        return {'size': self.size, 'entries': self.entries, 'name': self.name}
+
+
+class PartedOutput:
+    """크기 한도(max_size)마다 새 ZIP 조각에 기록하는 출력
+
+    ParallelWriter에 ZipFile 대신 넘기면 항목을 기록하기 직전에 zip_for()로
+    들어갈 조각을 고릅니다. 항목을 나누면 조각마다 따로 열 수 없으므로
+    한도보다 큰 항목은 그 항목만 담은 조각이 한도를 넘고, 크기를 미리 알 수 없는
+    항목(스트리밍으로 압축하는 큰 항목)은 원본 크기로 어림합니다.
+    조각은 path_for(번호)가 돌려주는 경로에 기록하며, 없으면 임시 폴더에 기록합니다
+    (봉인한 조각이 메모리에 쌓이지 않도록 처음부터 디스크에 기록).
+    """
+
+    def __init__(self, max_size, path_for=None):
+        self.max_size = max_size
+        self.parts = []
+        if path_for is None:
+            # 이 객체가 사라지면 임시 폴더도 함께 지워짐
+            self._directory = tempfile.TemporaryDirectory(prefix='webexcel-parts-')
+            path_for = lambda number: os.path.join(self._directory.name, f'{number:03d}.zip')
+        self.path_for = path_for
+        self._zip = None
+        self._file = None
+        self._central_size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def zip_for(self, size, arcname):
+        """압축 크기가 size인 항목 arcname을 기록할 조각 (현재 조각에 들어가지 않으면 새 조각)"""
+        name_size = len(arcname.encode('utf-8'))
+        local_size = _LOCAL_HEADER_SIZE + name_size + size
+        central_size = _CENTRAL_HEADER_SIZE + name_size
+        if self._zip is not None and self._zip.filelist:
+            projected = self._zip.start_dir + self._central_size + local_size + central_size + _END_SIZE
+            if projected > self.max_size:
+                self._seal()
+        if self._zip is None:
+            self._open()
+        self._central_size += central_size
+        return self._zip
+
+    def close(self):
+        """마지막 조각 봉인 (기록한 항목이 없어도 빈 조각 하나는 만듦)"""
+        if self._zip is None and not self.parts:
+            self._open()
+        if self._zip is not None:
+            self._seal()
+
+    def _open(self):
+        self._file = open(self.path_for(len(self.parts) + 1), 'w+b')
+        self._zip = zipfile.ZipFile(self._file, 'w', zipfile.ZIP_DEFLATED)
+        self._central_size = 0
+
+    def _seal(self):
+        self._zip.close()
+        size = self._file.tell()
+        self._file.close()
+        self.parts.append(Part(len(self.parts) + 1, self._file.name, size, len(self._zip.filelist)))
+        self._zip = None
+        self._file = None
+
+
+def open_result_zip(output_file):
+    """결과를 기록할 출력 ZIP (PartedOutput은 그대로, 파일 객체는 ZipFile로 열어서)"""
+    if isinstance(output_file, PartedOutput):
+        return output_file
+    return zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED)
@@ -0,0 +1,84 @@
+"""압축 정책
+
+항목마다 확장자와 앞부분 표본의 압축률을 보고 그대로 저장(STORED)할지
+압축(DEFLATED)할지, 압축한다면 어느 수준으로 할지 정합니다.
+"""
+from typing import NamedTuple
+import zipfile
+import zlib
+
+# 이미 압축된 형식 (다시 압축해도 거의 줄지 않음)
+COMPRESSED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif',
+    '.mp3', '.m4a', '.aac', '.ogg', '.flac', '.opus',
+    '.mp4', '.mov', '.avi', '.mkv', '.wmv', '.webm', '.m4v',
+    '.zip', '.7z', '.rar', '.gz', '.tgz', '.bz2', '.xz', '.zst',
+    '.docx', '.xlsx', '.pptx', '.hwpx', '.odt', '.ods', '.odp',
+    '.pdf', '.epub', '.jar', '.apk',
+}
+
+# 압축률을 확인할 표본 크기
+SAMPLE_SIZE = 64 * 1024
+
+# 표본이 이 비율보다 덜 줄어들면 압축하지 않음
+INCOMPRESSIBLE_RATIO = 0.95
+
+# ZIP 일반 목적 비트 1~2: deflate 압축 수준 (0 보통, 1 최대, 2 빠름, 3 매우 빠름)
+_DEFLATE_OPTION_MASK = 0b110
+_DEFLATE_FAST_OPTIONS = {0b100, 0b110}
+
+
+def is_compressible(sample):
+    """표본을 빠르게 압축해 보고 줄어드는지 확인"""
+    sample = sample[:SAMPLE_SIZE]
+    if not sample:
+        return False
+    return len(zlib.compress(sample, 1)) < len(sample) * INCOMPRESSIBLE_RATIO
+
+
+class CompressionPolicy(NamedTuple):
+    name: str
+    level: int
+    store_known: bool
+    probe: bool
+    recompress_fast: bool
+
+    def choose(self, ext, sample=None):
+        """(압축 방식, 압축 수준) 결정"""
+        if self.store_known and ext in COMPRESSED_EXTENSIONS:
+            return zipfile.ZIP_STORED, None
+        if self.probe and sample is not None and not is_compressible(sample):
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, self.level
+
+    def keeps_deflated(self, info):
+        """이미 deflate로 압축된 항목을 그대로 둘지 여부"""
+        if not self.recompress_fast:
+            return True
+        return (info.flag_bits & _DEFLATE_OPTION_MASK) not in _DEFLATE_FAST_OPTIONS
+
+
+POLICIES = {
+    # 이미 압축된 형식은 그대로, 나머지는 가장 빠른 수준으로 압축
+    'fast': CompressionPolicy('fast', 1, store_known=True, probe=False, recompress_fast=False),
+    # 이미 압축된 형식과 표본이 줄지 않는 파일은 그대로, 나머지는 기본 수준
+    'balanced': CompressionPolicy('balanced', 6, store_known=True, probe=True, recompress_fast=False),
+    # 모든 파일을 표본으로 확인하고 최대 수준으로 압축
+    'smallest': CompressionPolicy('smallest', 9, store_known=False, probe=True, recompress_fast=True),
+}
+
+DEFAULT_POLICY = POLICIES['balanced']
+
+# 화면에 표시할 이름 → 정책 이름
+POLICY_LABELS = {
+    "균형": 'balanced',
+    "빠르게": 'fast',
+    "최소 용량": 'smallest',
+}
+
+POLICY_OPTIONS = list(POLICY_LABELS)
+
+
+def policy_from_label(label):
+    """화면 선택값에 해당하는 압축 정책"""
+    return POLICIES[POLICY_LABELS[label]]
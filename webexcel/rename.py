@@ -0,0 +1,121 @@
+"""파일명 일괄 수정
+
+ZIP 중앙 디렉터리 색인만으로 새 파일명을 정하는 계획 단계와,
+계획대로 멤버를 하나씩 옮겨 담는 실행 단계로 나뉩니다.
+"""
+import heapq
+import operator
+import zipfile
+
+from webexcel.compress import ParallelWriter
+from webexcel.names import NameAllocator
+from webexcel.parts import open_result_zip
+from webexcel.template import compile_template, literal_template
+
+ALL_FILES = '모든 파일'
+
+# 정렬 기준 → (색인 필드, 역순 여부)
+SORT_KEYS = {
+    "이름순": ('base', False),
+    "날짜순 (오래된 순)": ('mtime', False),
+    "날짜순 (최신 순)": ('mtime', True),
+    "크기순 (작은 순)": ('size', False),
+    "크기순 (큰 순)": ('size', True),
+}
+
+SORT_OPTIONS = list(SORT_KEYS)
+
+NAMING_OPTIONS = ["숫자 추가", "특정 문자 추가", "템플릿"]
+
+# 템플릿 형식의 기본값 (촬영 날짜_순번.확장자)
+DEFAULT_TEMPLATE = "{date:%Y%m%d}_{n:04}{ext}"
+
+
+def naming_template(naming_type, custom_text=None):
+    """파일명 형식을 템플릿으로 변환 (템플릿 형식이면 custom_text가 템플릿)"""
+    if naming_type == "숫자 추가":
+        return "{n:04}_{name}"
+    if naming_type == "특정 문자 추가":
+        return literal_template(custom_text or '') + "_{name}"
+    return custom_text or DEFAULT_TEMPLATE
+
+
+def plan_rename(index, selected_ext, sort_by, naming_type, custom_text=None, find=None, replace='', limit=None,
+                incremental=None, entry_filter=None):
+    """파일 내용을 읽지 않고 (원본 항목, 원래 이름, 새 이름) 목록 생성
+
+    find가 있으면 만든 이름에서 정규식 find를 replace로 바꿉니다.
+    limit을 주면 앞에서부터 그만큼만 계획합니다 (미리보기용, 앞쪽 결과는 전체 계획과 같음).
+    incremental(Incremental)이 있으면 매니페스트를 기록하고, 이전 이름을 이어 쓰며
+    delta일 때는 바뀐 파일만 계획에 넣습니다.
+    entry_filter(EntryFilter)가 있으면 조건에 맞는 파일만 계획합니다.
+    템플릿이나 정규식이 잘못되었으면 ValueError가 납니다.
+    """
+    field, reverse = SORT_KEYS[sort_by]
+    ext = None if selected_ext == ALL_FILES else selected_ext
+    entries = index.select(ext, field, reverse)
+    if entry_filter is not None:
+        entries = entry_filter.select(entries)
+    if limit is not None:
+        entries = entries[:limit]
+
+    # 새 파일명을 한꺼번에 만든 뒤 다른 폴더의 같은 이름은 번호를 붙여 구분
+    template = compile_template(naming_template(naming_type, custom_text), find or None, replace or '')
+    new_names = template.apply(entries)
+    names = NameAllocator()
+    if incremental is None:
+        return [(entry.info, entry.base, names.allocate(new_name)) for entry, new_name in zip(entries, new_names)]
+
+    incremental.reserve(names)
+    # 확장자·거르기 조건으로 빠진 파일은 이전 기록을 이어받음
+    incremental.skip_unselected(index.entries, entries)
+    return [
+        (entry.info, entry.base, incremental.name(names, entry.info.filename, '', new_name))
+        for entry, new_name in zip(entries, new_names)
+        if incremental.include(entry.info)
+    ]
+
+
+def plan_rename_batch(indexes, selected_ext=ALL_FILES, sort_by=SORT_OPTIONS[0], naming_type=NAMING_OPTIONS[0],
+                      custom_text=None, find=None, replace='', limit=None, entry_filter=None):
+    """여러 입력을 하나로 합칠 때의 이름 변경 계획 (입력 위치, 원본 항목, 원래 이름, 새 이름) 목록
+
+    모든 입력의 항목을 한 줄로 정렬해 번호와 이름 중복 처리를 전체에서 이어 갑니다
+    (정렬 값이 같으면 앞 입력의 항목이 먼저). 나머지 인자는 plan_rename과 같습니다.
+    """
+    field, reverse = SORT_KEYS[sort_by]
+    ext = None if selected_ext == ALL_FILES else selected_ext
+    selected = []
+    for position, index in enumerate(indexes):
+        entries = index.select(ext, field, reverse)
+        if entry_filter is not None:
+            entries = entry_filter.select(entries)
+        selected.append([(position, entry) for entry in entries])
+    # 입력마다 이미 정렬되어 있으므로 병합만 함
+    getter = operator.attrgetter(field)
+    tagged = list(heapq.merge(*selected, key=lambda item: getter(item[1]), reverse=reverse))
+    if limit is not None:
+        tagged = tagged[:limit]
+
+    entries = [entry for _, entry in tagged]
+    template = compile_template(naming_template(naming_type, custom_text), find or None, replace or '')
+    new_names = template.apply(entries)
+    names = NameAllocator()
+    return [
+        (position, entry.info, entry.base, names.allocate(new_name))
+        for (position, entry), new_name in zip(tagged, new_names)
+    ]
+
+
+def execute_rename(src, plan, writer):
+    """계획대로 멤버를 하나씩 새 이름으로 복사"""
+    for info, _, new_name in plan:
+        writer.copy(src, info, new_name)
+
+
+def rename_zip(input_file, plan, output_file, policy=None, progress=None, stats=None):
+    """계획대로 input_file의 멤버를 새 이름으로 output_file에 기록"""
+    input_zip = zipfile.ZipFile(input_file)
+    with open_result_zip(output_file) as output_zip, \
+            ParallelWriter(output_zip, policy=policy, progress=progress, stats=stats) as writer:
+        execute_rename(input_zip, plan, writer)
@@ -0,0 +1,175 @@
+"""서버 폴더 입력
+
+업로드 대신 서버에 이미 있는 ZIP 파일이나 폴더를 바로 처리합니다.
+설정(WEBEXCEL_SOURCE_DIRS)에 등록된 폴더 안의 경로만 허용하며,
+ZIP 파일은 mmap으로 열어 필요한 부분만 읽습니다.
+폴더는 작업 스레드에서 압축하지 않은 임시 ZIP으로 한 번 묶어 두고,
+안의 파일 경로·크기·수정 시각이 그대로인 동안 모든 세션이 함께 사용합니다.
+"""
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import zipfile
+
+from webexcel import config
+from webexcel.metrics import StageStats
+from webexcel.zipio import CHUNK_SIZE, MappedFile
+
+# 폴더 경로 → (폴더 서명, 묶어 둔 임시 ZIP) (서버 전체에서 공유)
+_packs = {}
+_packs_lock = threading.Lock()
+
+
+def _within(path, root):
+    return os.path.commonpath([path, root]) == root
+
+
+def resolve_source(path, roots=None):
+    """허용된 폴더 안의 실제 경로로 변환 (밖이면 PermissionError)"""
+    roots = config.SOURCE_ROOTS if roots is None else roots
+    real_path = os.path.realpath(path)
+    # 심볼릭 링크로 허용된 폴더 밖을 가리키는 경우도 막음
+    if not any(_within(real_path, root) for root in roots):
+        raise PermissionError(f"허용된 서버 폴더 밖의 경로입니다: {path}")
+    if not os.path.exists(real_path):
+        raise FileNotFoundError(f"경로가 없습니다: {path}")
+    return real_path
+
+
+def list_sources(roots=None, limit=None):
+    """허용된 폴더 안의 ZIP 파일과 폴더 경로 목록 (최대 limit개)"""
+    roots = config.SOURCE_ROOTS if roots is None else roots
+    limit = limit or config.SOURCE_LIST_LIMIT
+    found = []
+    for root in roots:
+        for current, dirs, files in os.walk(root):
+            dirs[:] = sorted(name for name in dirs if not name.startswith('.'))
+            if current != root:
+                found.append(current)
+            found.extend(
+                os.path.join(current, name) for name in sorted(files)
+                if name.lower().endswith('.zip')
+            )
+            if len(found) >= limit:
+                return found[:limit]
+    return found
+
+
+def display_name(path, roots=None):
+    """허용된 폴더 기준의 상대 경로 (화면 표시용)"""
+    roots = config.SOURCE_ROOTS if roots is None else roots
+    for root in roots:
+        if _within(path, root):
+            return os.path.join(os.path.basename(root), os.path.relpath(path, root))
+    return path
+
+
+def folder_files(path):
+    """폴더 안의 일반 파일 (전체 경로, ZIP 안 경로, 크기, 수정 시각) 목록 (내용은 읽지 않음)
+
+    심볼릭 링크는 허용된 폴더 밖을 가리킬 수 있으므로 따라가지 않습니다.
+    """
+    files = []
+    for current, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in sorted(names):
+            full_path = os.path.join(current, name)
+            info = os.lstat(full_path)
+            if not stat.S_ISREG(info.st_mode):
+                continue
+            arcname = os.path.relpath(full_path, path).replace(os.sep, '/')
+            files.append((full_path, arcname, info.st_size, info.st_mtime_ns))
+    return files
+
+
+def folder_signature(files):
+    """folder_files() 목록의 서명 (파일 경로·크기·수정 시각 중 하나라도 바뀌면 달라짐)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for _, arcname, size, mtime_ns in files:
+        digest.update(f"{arcname}\0{size}\0{mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def pack_files(files, progress=None):
+    """folder_files() 목록을 압축하지 않은 임시 ZIP으로 묶어 반환
+
+    목록을 만든 뒤 심볼릭 링크로 바뀐 파일은 열지 않습니다 (O_NOFOLLOW를 지원하는 OS).
+    progress가 있으면 파일마다 취소 여부를 확인하고 progress.advance()를 호출합니다.
+    """
+    spool = tempfile.NamedTemporaryFile(prefix='webexcel-', suffix='.zip')
+    flags = os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0) | getattr(os, 'O_BINARY', 0)
+    with zipfile.ZipFile(spool, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for full_path, arcname, _, _ in files:
+            if progress is not None:
+                progress.check()
+            with open(os.open(full_path, flags), 'rb') as src:
+                zinfo = zipfile.ZipInfo.from_file(full_path, arcname, strict_timestamps=False)
+                with zf.open(zinfo, 'w') as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            if progress is not None:
+                progress.advance(zinfo.file_size, zinfo.compress_size)
+    spool.flush()
+    return spool
+
+
+class ServerSource:
+    """서버에 있는 ZIP 파일 또는 폴더 하나
+
+    폴더는 만들 때 파일 목록만 훑어 서명(signature)을 구하고, 내용은 작업 스레드에서
+    pack()으로 묶습니다. 지금 서명대로 묶어 둔 임시 ZIP이 있을 때만 ready()가 True이며,
+    그 전에는 열 수 없습니다.
+    """
+
+    def __init__(self, path):
+        self.path = resolve_source(path)
+        self.name = os.path.basename(self.path)
+        self.is_dir = os.path.isdir(self.path)
+        self.files = folder_files(self.path) if self.is_dir else None
+        self.signature = folder_signature(self.files) if self.is_dir else None
+        # 이 객체가 쓰는 동안 다른 세션이 다시 묶어도 지워지지 않도록 붙잡아 둠
+        self._packed = None
+
+    def ready(self):
+        """바로 읽을 수 있는지 (폴더면 지금 내용대로 묶어 둔 임시 ZIP이 있는지)"""
+        if not self.is_dir:
+            return True
+        if self._packed is None:
+            with _packs_lock:
+                signature, packed = _packs.get(self.path, (None, None))
+            if signature == self.signature:
+                self._packed = packed
+        return self._packed is not None
+
+    def pack(self, progress=None, stats=None):
+        """폴더를 임시 ZIP으로 묶어 모든 세션이 함께 쓰도록 등록 (작업 스레드에서 실행)"""
+        if self.ready():
+            return
+        stats = stats if stats is not None else StageStats()
+        with stats.stage('pack', sum(size for _, _, size, _ in self.files), len(self.files)):
+            packed = pack_files(self.files, progress)
+        with _packs_lock:
+            _packs[self.path] = (self.signature, packed)
+        self._packed = packed
+
+    @property
+    def zip_path(self):
+        """읽을 ZIP 파일 경로 (폴더면 묶어 둔 임시 ZIP, 아직 묶지 않았으면 FileNotFoundError)"""
+        if not self.is_dir:
+            return self.path
+        if not self.ready():
+            raise FileNotFoundError(f"폴더를 아직 묶지 않았습니다: {self.path}")
+        return self._packed.name
+
+    def cache_key(self):
+        """색인·결과 캐시 키 (파일이 바뀌면 달라지고, 내용이 같으면 모든 세션에서 같음)"""
+        if self.is_dir:
+            return f"folder:{self.path}:{self.signature}"
+        info = os.stat(self.path)
+        return f"server:{self.path}:{info.st_mtime_ns}:{info.st_size}"
+
+    def open(self):
+        """읽기용 파일 객체 (작업마다 따로 열어 읽는 위치가 섞이지 않음)"""
+        return MappedFile(self.zip_path)
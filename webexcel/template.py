@@ -0,0 +1,157 @@
+"""파일명 템플릿
+
+`{date:%Y%m%d}_{n:05}{ext}` 같은 템플릿과 정규식 찾아 바꾸기로 새 파일명을 만듭니다.
+템플릿은 한 번만 해석해 두고, 항목마다 템플릿을 다시 읽는 대신
+필드별로 열(column)을 한꺼번에 만든 뒤 이어 붙여 수만 개도 바로 계산합니다.
+"""
+from functools import lru_cache
+import re
+import string
+import time
+
+# 템플릿에서 쓸 수 있는 필드 → 설명 (화면 도움말에도 사용)
+TEMPLATE_FIELDS = {
+    'n': "순번 (1부터, 예: {n:05} → 00001)",
+    'name': "원래 파일명",
+    'stem': "확장자를 뺀 원래 파일명",
+    'ext': "확장자 (점 포함, 예: .jpg)",
+    'parent': "원래 들어 있던 폴더 이름",
+    'size': "파일 크기 (바이트)",
+    'date': "수정(촬영) 날짜 (예: {date:%Y%m%d})",
+}
+
+DEFAULT_DATE_FORMAT = '%Y%m%d'
+
+
+def _stem_ext(base):
+    # os.path.splitext와 같은 결과 (점으로 시작하는 이름은 확장자 없음)
+    stem, dot, ext = base.rpartition('.')
+    if not dot or not stem.strip('.'):
+        return base, ''
+    return stem, dot + ext
+
+
+def _parent(entry):
+    parts = entry.info.filename.rsplit('/', 2)
+    return parts[-2] if len(parts) > 1 else ''
+
+
+def _dates(entries, spec):
+    # 같은 시각은 한 번만 변환 (같은 날 찍은 사진이 많음)
+    spec = spec or DEFAULT_DATE_FORMAT
+    cache = {}
+    column = []
+    for entry in entries:
+        mtime = int(entry.mtime)
+        if mtime not in cache:
+            cache[mtime] = time.strftime(spec, time.localtime(max(mtime, 0)))
+        column.append(cache[mtime])
+    return column
+
+
+def _formatted(values, spec, conversion):
+    if conversion == 'r':
+        values = map(repr, values)
+    elif conversion == 'a':
+        values = map(ascii, values)
+    elif conversion == 's':
+        values = map(str, values)
+    if spec:
+        return [format(value, spec) for value in values]
+    return list(map(str, values))
+
+
+class NameTemplate:
+    """해석해 둔 파일명 템플릿 (+ 정규식 찾아 바꾸기)
+
+    잘못된 템플릿이나 정규식이면 만들 때 ValueError가 납니다.
+    """
+
+    def __init__(self, template, find=None, replace=''):
+        self.template = template
+        self._pieces = []
+        try:
+            for literal, field, spec, conversion in string.Formatter().parse(template):
+                if field is not None and field not in TEMPLATE_FIELDS:
+                    raise ValueError(f"알 수 없는 항목입니다: {{{field}}}")
+                self._pieces.append((literal, field, spec, conversion))
+        except ValueError as e:
+            raise ValueError(f"템플릿 오류: {str(e)}") from None
+        self.fields = {field for _, field, _, _ in self._pieces if field is not None}
+
+        self._pattern = None
+        self._replace = replace or ''
+        if find:
+            try:
+                self._pattern = re.compile(find)
+                # 바꿀 문자열의 \1, \g<이름> 참조도 미리 확인
+                self._pattern.sub(self._replace, '')
+            except (re.error, IndexError) as e:
+                raise ValueError(f"정규식 오류: {str(e)}") from None
+
+    def apply(self, entries, start=1):
+        """색인 항목 목록의 새 파일명 목록 (중복 처리 전)"""
+        count = len(entries)
+        columns = self._columns(entries)
+        parts = []
+        try:
+            for literal, field, spec, conversion in self._pieces:
+                if literal:
+                    parts.append([literal] * count)
+                if field is None:
+                    continue
+                if field == 'date':
+                    parts.append(_dates(entries, spec))
+                elif field == 'n':
+                    parts.append(_formatted(range(start, start + count), spec, conversion))
+                else:
+                    parts.append(_formatted(columns[field], spec, conversion))
+        except (ValueError, TypeError) as e:
+            # 예: 문자 항목에 숫자 형식 지정 ({stem:05d})
+            raise ValueError(f"템플릿 오류: {str(e)}") from None
+
+        if not parts:
+            names = [''] * count
+        elif len(parts) == 1:
+            names = parts[0]
+        else:
+            names = list(map(''.join, zip(*parts)))
+
+        if self._pattern is not None:
+            try:
+                names = [self._pattern.sub(self._replace, name) for name in names]
+            except (re.error, IndexError) as e:
+                raise ValueError(f"정규식 오류: {str(e)}") from None
+        if '' in names:
+            raise ValueError("새 파일명이 비어 있는 파일이 있습니다. 템플릿을 확인해주세요")
+        # 결과 ZIP을 풀 때 다른 폴더에 쓰이지 않도록 경로가 되는 이름은 막음
+        for name in names:
+            if '/' in name or '\\' in name or name in ('.', '..'):
+                raise ValueError(f"새 파일명에 폴더 경로를 쓸 수 없습니다: {name}")
+        return names
+
+    def _columns(self, entries):
+        """템플릿에 쓰인 필드의 열만 만듦"""
+        columns = {}
+        if 'name' in self.fields:
+            columns['name'] = [entry.base for entry in entries]
+        if 'stem' in self.fields or 'ext' in self.fields:
+            stems, exts = zip(*[_stem_ext(entry.base) for entry in entries]) if entries else ((), ())
+            columns['stem'] = stems
+            columns['ext'] = exts
+        if 'parent' in self.fields:
+            columns['parent'] = list(map(_parent, entries))
+        if 'size' in self.fields:
+            columns['size'] = [entry.size for entry in entries]
+        return columns
+
+
+@lru_cache(maxsize=64)
+def compile_template(template, find=None, replace=''):
+    """템플릿 해석 (같은 템플릿은 다시 해석하지 않음)"""
+    return NameTemplate(template, find, replace)
+
+
+def literal_template(text):
+    """문자를 그대로 쓰는 템플릿 조각 ({, }가 있어도 필드로 읽지 않음)"""
+    return text.replace('{', '{{').replace('}', '}}')
@@ -0,0 +1,242 @@
+"""ZIP 멤버 복사 도구
+
+압축된 데이터를 풀지 않고 그대로 옮겨 담아 이름만 바꾸는 기능을 제공합니다.
+"""
+import io
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+
+from webexcel import config
+
+# 한 번에 복사할 바이트 수
+CHUNK_SIZE = 1 << 20
+
+# 원본 그대로 옮길 수 있는 압축 방식
+PASSTHROUGH_TYPES = {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED}
+
+_MASK_ENCRYPTED = 1 << 0
+_MASK_USE_DATA_DESCRIPTOR = 1 << 3
+_MASK_UTF_FILENAME = 1 << 11
+
+# ZIP64 추가 필드 (기록할 때 크기에 맞게 zipfile이 다시 만듦)
+_EXTRA_ZIP64 = 0x0001
+
+
+def can_passthrough(info):
+    """압축 데이터를 그대로 복사할 수 있는 항목인지 확인"""
+    if info.flag_bits & _MASK_ENCRYPTED:
+        return False
+    return info.compress_type in PASSTHROUGH_TYPES
+
+
+def _data_offset(src, info):
+    """로컬 헤더를 건너뛴 실제 압축 데이터 위치 계산"""
+    with src._lock:
+        src.fp.seek(info.header_offset)
+        header = src.fp.read(zipfile.sizeFileHeader)
+    if len(header) != zipfile.sizeFileHeader:
+        raise zipfile.BadZipFile(f"로컬 헤더를 읽을 수 없습니다: {info.filename}")
+    fields = struct.unpack(zipfile.structFileHeader, header)
+    if fields[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"잘못된 로컬 헤더입니다: {info.filename}")
+    name_len, extra_len = fields[10], fields[11]
+    return info.header_offset + zipfile.sizeFileHeader + name_len + extra_len
+
+
+def iter_raw(src, info, chunk_size=CHUNK_SIZE):
+    """멤버의 압축 데이터를 풀지 않고 조각 단위로 읽기"""
+    offset = _data_offset(src, info)
+    remaining = info.compress_size
+    while remaining > 0:
+        with src._lock:
+            src.fp.seek(offset)
+            chunk = src.fp.read(min(chunk_size, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"압축 데이터가 잘렸습니다: {info.filename}")
+        offset += len(chunk)
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _strip_zip64(extra):
+    """추가 필드에서 ZIP64 필드만 뺀 나머지 (확장 타임스탬프 등은 그대로 유지)"""
+    kept = []
+    pos = 0
+    while pos + 4 <= len(extra):
+        field_id, field_len = struct.unpack_from('<HH', extra, pos)
+        end = pos + 4 + field_len
+        if field_id != _EXTRA_ZIP64:
+            kept.append(extra[pos:end])
+        pos = end
+    return b''.join(kept)
+
+
+def clone_info(info, arcname):
+    """원본 항목 정보를 새 이름으로 복제"""
+    zinfo = zipfile.ZipInfo(arcname, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.external_attr = info.external_attr
+    zinfo.create_system = info.create_system
+    zinfo.file_size = info.file_size
+    zinfo.extra = _strip_zip64(info.extra)
+    return zinfo
+
+
+def write_raw(dst, zinfo, chunks):
+    """CRC와 크기가 정해진 압축 데이터를 헤더와 함께 그대로 기록"""
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    if zip64 and not dst._allowZip64:
+        raise zipfile.LargeZipFile("Filesize would require ZIP64 extensions")
+    if dst._writing:
+        raise ValueError("다른 항목을 기록하는 중에는 복사할 수 없습니다")
+
+    with dst._lock:
+        if dst._seekable:
+            dst.fp.seek(dst.start_dir)
+        zinfo.header_offset = dst.fp.tell()
+        dst._writecheck(zinfo)
+        dst._didModify = True
+
+        dst.fp.write(zinfo.FileHeader(zip64))
+        written = 0
+        for chunk in chunks:
+            dst.fp.write(chunk)
+            written += len(chunk)
+        if written != zinfo.compress_size:
+            raise zipfile.BadZipFile(f"압축 데이터 크기가 맞지 않습니다: {zinfo.filename}")
+
+        dst.start_dir = dst.fp.tell()
+        dst.filelist.append(zinfo)
+        dst.NameToInfo[zinfo.filename] = zinfo
+
+
+def copy_passthrough(src, info, dst, arcname):
+    """압축을 풀지 않고 이름만 바꿔 복사"""
+    zinfo = clone_info(info, arcname)
+    # 크기를 미리 알고 있으므로 데이터 디스크립터는 쓰지 않음
+    zinfo.flag_bits = info.flag_bits & ~(_MASK_USE_DATA_DESCRIPTOR | _MASK_UTF_FILENAME)
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    write_raw(dst, zinfo, iter_raw(src, info))
+    return zinfo
+
+
+def copy_recompress(src, info, dst, arcname):
+    """압축을 풀어 출력 ZIP의 방식으로 다시 압축해 복사"""
+    zinfo = clone_info(info, arcname)
+    zinfo.compress_type = dst.compression
+    zinfo._compresslevel = dst.compresslevel
+    with src.open(info) as fsrc, dst.open(zinfo, 'w') as fdst:
+        shutil.copyfileobj(fsrc, fdst, CHUNK_SIZE)
+
+
+def copy_member(src, info, dst, arcname):
+    """항목을 새 이름으로 복사 (가능하면 압축 데이터 그대로)
+
+    암호화되었거나 지원하지 않는 압축 방식이면 다시 압축합니다.
+    그대로 복사했으면 True를 반환합니다.
+    """
+    if can_passthrough(info):
+        copy_passthrough(src, info, dst, arcname)
+        return True
+    copy_recompress(src, info, dst, arcname)
+    return False
+
+
+class MappedFile(io.RawIOBase):
+    """디스크의 파일을 mmap으로 읽는 파일 객체
+
+    운영체제가 필요한 부분만 페이지 단위로 읽어 오므로, 큰 ZIP도 전체를
+    메모리에 올리지 않고 중앙 디렉터리와 멤버를 바로 읽을 수 있습니다.
+    같은 파일이라도 MappedFile마다 읽는 위치가 따로 있습니다.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            # 빈 파일은 mmap할 수 없음
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._view = memoryview(self._map)
+        self._size = size
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return offset
+
+    def read(self, size=-1):
+        start = min(self._pos, self._size)
+        end = self._size if size is None or size < 0 else min(start + size, self._size)
+        self._pos = end
+        return bytes(self._view[start:end])
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+        super().close()
+
+
+def open_output(max_size=None):
+    """결과를 담을 임시 파일 생성
+
+    max_size를 넘으면 메모리 대신 디스크에 기록합니다.
+    """
+    if max_size is None:
+        max_size = config.SPOOL_MAX_SIZE
+    return tempfile.SpooledTemporaryFile(max_size=max_size)
+
+
+def spool_stream(fileobj):
+    """파일 객체 내용을 임시 파일에 담기 (중첩 압축파일 열기용)"""
+    spool = open_output()
+    shutil.copyfileobj(fileobj, spool, CHUNK_SIZE)
+    spool.seek(0)
+    return spool
+
+
+def spool_member(src, info):
+    """멤버 하나를 풀어서 임시 파일에 담기"""
+    with src.open(info) as fsrc:
+        return spool_stream(fsrc)
+
+
+def open_reader(spool):
+    """결과 임시 파일(또는 일반 파일)을 처음부터 읽는 새 파일 객체 반환 (내용을 복사하지 않음)
+
+    spool을 닫아도 계속 읽을 수 있으므로 다 읽은 쪽에서 닫습니다.
+    """
+    if isinstance(spool, tempfile.SpooledTemporaryFile) and not spool._rolled:
+        # BytesIO는 내용이 바뀌기 전까지 getvalue()의 bytes를 복사하지 않고 공유
+        reader = io.BytesIO(spool._file.getvalue())
+    else:
+        # 디스크로 옮겨 간 임시 파일이나 캐시에 보관된 결과처럼 일반 파일인 경우
+        reader = io.open(os.dup(spool.fileno()), 'rb')
+    reader.seek(0)
+    return reader